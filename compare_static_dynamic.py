@@ -1,44 +1,96 @@
 """
-Este script utilitário executa comparações lado a lado entre os modos de escopo 
-estático e dinâmico do interpretador. Executa o mesmo programa fonte com ambos 
-os modos de escopo e exibe os resultados em colunas paralelas usando formatação 
-rica de terminal, facilitando a visualização das diferenças no comportamento 
-de resolução de escopo entre as duas abordagens.
+Este script utilitário executa comparações lado a lado entre os modos de escopo
+estático e dinâmico do interpretador. O programa é analisado uma única vez e os
+dois modos são interpretados em paralelo, em um pool de processos, sobre o
+mesmo resultado do frontend (ver src/comparison.py). Por padrão exibe a saída
+de cada modo em colunas paralelas usando formatação rica de terminal, seguida
+do resumo das divergências; com --json imprime o resultado estruturado das duas
+execuções e o resumo em JSON, e com --traces inclui também o estado de cada
+etapa.
 """
 
-import subprocess
+import json
+import os
+import sys
 from rich.console import Console
 from rich.columns import Columns
 from rich.panel import Panel
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from comparison import compare
+from engines import ENGINES
+
 EXAMPLE = "src/exemples/exemple5_stack_escopos.pseudo"
-INTERPRETER = "src/main.py"
 
-STATIC_CMD = ["python3", INTERPRETER, EXAMPLE, "--static"]
-DYNAMIC_CMD = ["python3", INTERPRETER, EXAMPLE, "--dynamic"]
+
+def format_result(result):
+    lines = [f"OUTPUT: {value}" for value in result['output']]
+    if result['error'] is not None:
+        lines.append(f"An error occurred: {result['error']}")
+    lines.append(f"[dim]{result['steps']} etapas em {result['elapsed']:.3f}s[/]")
+    return "\n".join(lines)
 
 
-def run_and_capture(cmd):
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    return result.stdout + ("\n" + result.stderr if result.stderr else "")
+def format_divergence(divergence):
+    if not divergence['diverged']:
+        return "[bold green]Nenhuma divergência entre os modos.[/]"
+    lines = [f"Etapas pareadas: {divergence['matched']}, somente no estático: "
+             f"{divergence['only_static']}, somente no dinâmico: {divergence['only_dynamic']}"]
+    first = divergence['first_divergence']
+    if first is not None:
+        lines.append(f"Primeira divergência no trace: {first['static_action']!r} (estático) x "
+                     f"{first['dynamic_action']!r} (dinâmico)")
+    output = divergence['first_output_difference']
+    if output is not None:
+        lines.append(f"Primeira saída diferente (#{output['index'] + 1}): "
+                     f"{output['static']!r} x {output['dynamic']!r}")
+    if not divergence['same_error']:
+        lines.append("Os modos terminaram com erros diferentes.")
+    return "\n".join(lines)
 
 
 def main():
-    console = Console()
-    console.print("[bold]Executando em modo static...", style="cyan")
-    static_output = run_and_capture(STATIC_CMD)
-    console.print("[bold]Executando em modo dynamic...", style="magenta")
-    dynamic_output = run_and_capture(DYNAMIC_CMD)
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Compara a execução de um programa com escopo estático e dinâmico.")
+    parser.add_argument('file_path', nargs='?', default=EXAMPLE,
+                        help=f'Arquivo de código fonte (.pseudo) (padrão: {EXAMPLE})')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='tree',
+                        help='Motor de execução usado nos dois modos')
+    parser.add_argument('--binding', choices=['deep', 'shallow'], default='deep',
+                        help='Implementação do escopo dinâmico')
+    parser.add_argument('-O', dest='opt_level', type=int, choices=[0, 1, 2], default=1,
+                        help='Nível de otimização')
+    parser.add_argument('--no-fold', dest='fold', action='store_false',
+                        help='Desativa a propagação de constantes nas expressões')
+    parser.add_argument('--json', action='store_true',
+                        help='Imprime o resultado e o resumo das divergências em JSON')
+    parser.add_argument('--traces', action='store_true',
+                        help='Inclui no JSON as ações e o estado de cada etapa dos dois modos')
+    args = parser.parse_args()
 
+    result = compare(args.file_path, engine=args.engine, binding=args.binding,
+                     opt_level=args.opt_level, fold=args.fold, record_states=args.traces)
+
+    if args.json:
+        if not args.traces:
+            for scope_mode in ('static', 'dynamic'):
+                del result[scope_mode]['actions']
+                del result[scope_mode]['trace']
+        print(json.dumps(result, indent=2, default=repr))
+        return
+
+    console = Console()
     panels = [
-        Panel(static_output, title="[bold blue]Static Scope",
+        Panel(format_result(result['static']), title="[bold blue]Static Scope",
               border_style="blue", padding=(1, 2)),
-        Panel(dynamic_output, title="[bold magenta]Dynamic Scope",
+        Panel(format_result(result['dynamic']), title="[bold magenta]Dynamic Scope",
               border_style="magenta", padding=(1, 2)),
     ]
     console.rule("[bold yellow]Comparação lado a lado: Static x Dynamic")
     console.print(Columns(panels))
     console.rule()
+    console.print(format_divergence(result['divergence']))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,236 @@
+"""
+Este módulo implementa a análise fundida do frontend: em um único percurso da
+AST realiza a verificação semântica (mesmas regras do SemanticChecker) e, no
+modo estático, a resolução de escopo léxico (mesmas anotações do
+StaticScopeResolver). As duas classes originais ficam como implementação de
+referência, comparada a esta por tests/test_analyzer.py. O despacho é feito por uma tabela pré-computada que
+associa cada classe de nó ao seu método de visita, e os nós sem tratamento
+específico são percorridos por acessores de filhos pré-computados por classe,
+evitando a montagem de nomes de métodos e a inspeção dos atributos a cada nó.
+Os erros de resolução são adiados até o fim do percurso para que, como na
+execução das duas fases em sequência, os erros semânticos tenham prioridade.
+Assim como o resolvedor, atribui slots às variáveis e anota cada identificador
+com seu endereço léxico (profundidade, slot), e registra nas operações binárias
+os tipos inferidos, como o verificador. Por fim, marca como chamada de cauda
+(CallNode.tail) a chamada que é a última instrução do corpo de uma função
+(exceto main), para que os motores possam reaproveitar o registro de ativação.
+"""
+
+from operator import attrgetter
+import ast_nodes
+from ast_nodes import *
+from symbol_table import SymbolTable
+
+
+def _child_accessor(node_class):
+    fields = node_class._fields
+    if not fields:
+        return lambda node: ()
+    getter = attrgetter(*fields)
+    if len(fields) == 1:
+        return lambda node: (getter(node),)
+    return getter
+
+
+CHILD_ACCESSORS = {
+    node_class: _child_accessor(node_class)
+    for node_class in vars(ast_nodes).values()
+    if isinstance(node_class, type) and issubclass(node_class, ASTNode)
+}
+
+
+def mark_tail_call(func_node):
+    # Como as funções não têm desvios nem valores de retorno, a única posição de
+    # cauda do corpo é a última instrução. Em main ela não é marcada: o registro
+    # de main é desempilhado pelo próprio interpret().
+    statements = func_node.body.statements
+    if func_node.name == 'main' or not statements:
+        return
+    last = statements[-1]
+    if isinstance(last, CallNode) and last.function_name.name != 'print':
+        last.tail = True
+
+
+class ProgramAnalyzer:
+    def __init__(self, resolve=True):
+        self.resolve = resolve
+        self.symbol_table = SymbolTable()
+        self.current_scope = None
+        self.scope_level = 0
+        self.next_slot = 0
+        self.resolution_error = None
+
+    def visit(self, node):
+        return self.VISITORS.get(type(node), ProgramAnalyzer.generic_visit)(self, node)
+
+    def generic_visit(self, node):
+        for child in CHILD_ACCESSORS[type(node)](node):
+            if isinstance(child, list):
+                for item in child:
+                    if isinstance(item, ASTNode):
+                        self.visit(item)
+            elif isinstance(child, ASTNode):
+                self.visit(child)
+
+    def _resolve(self, node):
+        if not self.resolve:
+            return
+        symbol_info = self.current_scope.lookup(node.name)
+        if not symbol_info:
+            if self.resolution_error is None:
+                self.resolution_error = f"Static Scope Error: Identifier '{node.name}' not defined."
+            return
+        node.scope_info = symbol_info
+        if 'type' in symbol_info:
+            node.var_type = symbol_info['type']
+        if 'slot' in symbol_info:
+            node.address = (self.scope_level -
+                            symbol_info['level'], symbol_info['slot'])
+
+    def _declare(self, node, symbol_type=None):
+        if self.resolve:
+            self.current_scope.insert(node.var_name, {
+                'type': symbol_type or node.var_type, 'node': node,
+                'level': self.scope_level, 'slot': self.next_slot})
+            node.slot = self.next_slot
+            self.next_slot += 1
+
+    def visit_ProgramNode(self, node):
+        for declaration in node.declarations:
+            if isinstance(declaration, VarDeclNode):
+                self.symbol_table.insert(declaration.var_name, {
+                                         'type': declaration.var_type})
+            elif isinstance(declaration, FunctionDefNode):
+                self.symbol_table.insert(
+                    declaration.name, {'type': 'function', 'node': declaration})
+
+        self.current_scope = SymbolTable(name="global")
+        for declaration in node.declarations:
+            if isinstance(declaration, VarDeclNode):
+                self._declare(declaration)
+            elif isinstance(declaration, FunctionDefNode):
+                self.visit(declaration)
+
+        if self.resolution_error:
+            raise Exception(self.resolution_error)
+
+    def visit_FunctionDefNode(self, node):
+        if self.resolve:
+            self.current_scope.insert(
+                node.name, {'type': 'function', 'node': node, 'closure_scope': self.current_scope})
+
+        parent_table = self.symbol_table
+        parent_scope = self.current_scope
+        parent_slot = self.next_slot
+        self.symbol_table = SymbolTable(parent=parent_table)
+        if self.resolve:
+            self.current_scope = SymbolTable(
+                parent=parent_scope, name=f"func_{node.name}_scope")
+        self.scope_level += 1
+        self.next_slot = 0
+
+        for param in node.params:
+            self.symbol_table.insert(param.var_name, {'type': param.var_type})
+            self._declare(param, 'param')
+
+        self.visit(node.body)
+        mark_tail_call(node)
+
+        if self.resolve:
+            node.frame_size = self.next_slot
+        self.symbol_table = parent_table
+        self.current_scope = parent_scope
+        self.scope_level -= 1
+        self.next_slot = parent_slot
+
+    def visit_BlockNode(self, node):
+        for statement in node.statements:
+            if isinstance(statement, VarDeclNode):
+                self.symbol_table.insert(statement.var_name, {
+                                         'type': statement.var_type})
+
+        for statement in node.statements:
+            if isinstance(statement, VarDeclNode):
+                self._declare(statement)
+            else:
+                self.visit(statement)
+
+    def visit_VarDeclNode(self, node):
+        self._declare(node)
+
+    def visit_AssignNode(self, node):
+        var_name = node.identifier.name
+        var_info = self.symbol_table.lookup(var_name)
+        if not var_info:
+            raise Exception(
+                f"Semantic Error: Variable '{var_name}' not declared.")
+        self._resolve(node.identifier)
+
+        expr_type = self.visit(node.expression)
+        var_type = var_info['type']
+
+        if var_type != expr_type:
+            if var_type == 'float' and expr_type == 'int':
+                pass
+            else:
+                raise Exception(
+                    f"Semantic Error: Cannot assign type '{expr_type}' to variable '{var_name}' of type '{var_type}'.")
+
+    def visit_IdentifierNode(self, node):
+        var_info = self.symbol_table.lookup(node.name)
+        if not var_info:
+            raise Exception(
+                f"Semantic Error: Variable '{node.name}' not declared.")
+        self._resolve(node)
+        return var_info['type']
+
+    def visit_IntegerNode(self, node):
+        return 'int'
+
+    def visit_FloatNode(self, node):
+        return 'float'
+
+    def visit_CharNode(self, node):
+        return 'char'
+
+    def visit_PrintNode(self, node):
+        self.visit(node.expression)
+
+    def visit_BinaryOpNode(self, node):
+        left_type = self.visit(node.left)
+        right_type = self.visit(node.right)
+        node.operand_types = (left_type, right_type)
+        if left_type == 'float' or right_type == 'float':
+            node.expr_type = 'float'
+        else:
+            node.expr_type = 'int'
+        return node.expr_type
+
+    def visit_CallNode(self, node):
+        func_name = node.function_name.name
+        func_info = self.symbol_table.lookup(func_name)
+        if func_name == 'print':
+            for arg in node.args:
+                self.visit(arg)
+            return None
+        if not func_info or func_info['type'] != 'function':
+            raise Exception(
+                f"Semantic Error: Function '{func_name}' not declared.")
+        self._resolve(node.function_name)
+        func_node = func_info['node']
+        if len(node.args) != len(func_node.params):
+            raise Exception(
+                f"Semantic Error: Function '{func_name}' expects {len(func_node.params)} arguments, got {len(node.args)}.")
+        for arg_node, param in zip(node.args, func_node.params):
+            arg_type = self.visit(arg_node)
+            if arg_type != param.var_type and not (param.var_type == 'float' and arg_type == 'int'):
+                raise Exception(
+                    f"Semantic Error: Cannot pass type '{arg_type}' to parameter '{param.var_name}' of type '{param.var_type}' in call to '{func_name}'.")
+        return None
+
+
+ProgramAnalyzer.VISITORS = {
+    node_class: getattr(ProgramAnalyzer, f'visit_{node_class.__name__}')
+    for node_class in CHILD_ACCESSORS
+    if hasattr(ProgramAnalyzer, f'visit_{node_class.__name__}')
+}
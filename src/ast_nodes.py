@@ -1,81 +1,124 @@
 """
-Este módulo contém as definições de todos os nós da Árvore Sintática Abstrata (AST) 
-do interpretador. Define classes para representar diferentes construções da linguagem 
-como declarações de variáveis, definições de funções, blocos de código, atribuições, 
-chamadas de função, identificadores, literais numéricos e de caracteres, comandos de 
-impressão e operações binárias. Cada nó herda de ASTNode e armazena informações 
-específicas sobre sua estrutura sintática.
+Este módulo contém as definições de todos os nós da Árvore Sintática Abstrata (AST)
+do interpretador. Define classes para representar diferentes construções da linguagem
+como declarações de variáveis, definições de funções, blocos de código, atribuições,
+chamadas de função, identificadores, literais numéricos e de caracteres, comandos de
+impressão e operações binárias. Cada nó herda de ASTNode e declara em _fields sua
+estrutura sintática; os demais atributos são anotações da análise do frontend.
 """
 
 
 class ASTNode:
-    pass
+    __slots__ = ()
+    _fields = ()
 
 
 class ProgramNode(ASTNode):
+    __slots__ = ('declarations',)
+    _fields = ('declarations',)
+
     def __init__(self, declarations):
         self.declarations = declarations
 
 
 class VarDeclNode(ASTNode):
+    __slots__ = ('var_type', 'var_name', 'slot')
+    _fields = ('var_type', 'var_name')
+
     def __init__(self, var_type, var_name):
         self.var_type = var_type
         self.var_name = var_name
+        self.slot = None
 
 
 class FunctionDefNode(ASTNode):
+    __slots__ = ('name', 'params', 'body', 'frame_size')
+    _fields = ('name', 'params', 'body')
+
     def __init__(self, name, params, body):
         self.name = name
         self.params = params
         self.body = body
+        self.frame_size = None
 
 
 class BlockNode(ASTNode):
+    __slots__ = ('statements',)
+    _fields = ('statements',)
+
     def __init__(self, statements):
         self.statements = statements
 
 
 class AssignNode(ASTNode):
+    __slots__ = ('identifier', 'expression')
+    _fields = ('identifier', 'expression')
+
     def __init__(self, identifier, expression):
         self.identifier = identifier
         self.expression = expression
 
 
 class CallNode(ASTNode):
+    __slots__ = ('function_name', 'args', 'tail')
+    _fields = ('function_name', 'args')
+
     def __init__(self, function_name, args):
         self.function_name = function_name
         self.args = args
+        self.tail = False
 
 
 class IdentifierNode(ASTNode):
+    __slots__ = ('name', 'var_type', 'scope_info', 'address')
+    _fields = ('name', 'var_type')
+
     def __init__(self, name, var_type=None):
         self.name = name
         self.var_type = var_type
         self.scope_info = None
+        self.address = None
 
 
 class IntegerNode(ASTNode):
+    __slots__ = ('value',)
+    _fields = ('value',)
+
     def __init__(self, value):
         self.value = value
 
 
 class PrintNode(ASTNode):
+    __slots__ = ('expression',)
+    _fields = ('expression',)
+
     def __init__(self, expression):
         self.expression = expression
 
 
 class FloatNode(ASTNode):
+    __slots__ = ('value',)
+    _fields = ('value',)
+
     def __init__(self, value):
         self.value = value
 
 
 class CharNode(ASTNode):
+    __slots__ = ('value',)
+    _fields = ('value',)
+
     def __init__(self, value):
         self.value = value
 
 
 class BinaryOpNode(ASTNode):
+    __slots__ = ('left', 'op', 'right', 'operand_types', 'expr_type')
+    _fields = ('left', 'op', 'right')
+
     def __init__(self, left, op, right):
         self.left = left
         self.op = op
         self.right = right
+        self.operand_types = None
+        self.expr_type = None
@@ -0,0 +1,195 @@
+"""
+Este módulo executa lotes de programas .pseudo em paralelo. Recebe diretórios
+(percorridos recursivamente em busca de arquivos .pseudo), padrões glob ou
+arquivos, e distribui cada par (arquivo, modo de escopo) por um pool de
+processos. Cada processo do pool carrega o interpretador uma única vez e
+executa muitas tarefas, e cada tarefa tem um tempo limite próprio, imposto por
+um temporizador dentro do processo, de modo que um programa que não termina
+não bloqueia o processo nem o lote. As tarefas são distribuídas dos maiores
+arquivos para os menores, para que os mais demorados não fiquem para o fim.
+O resultado de cada tarefa (situação, saída, erro, número de etapas e tempos
+do frontend e da execução) é agregado em um único relatório JSON ou CSV.
+"""
+
+import csv
+import glob
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from comparison import SCOPE_MODES, run_mode
+from engines import ENGINES
+from frontend import analyze, parse_source
+
+DEFAULT_TIMEOUT = 10.0
+CSV_FIELDS = ('file', 'scope_mode', 'status', 'error', 'steps', 'outputs',
+              'frontend_time', 'run_time', 'output')
+
+
+class TaskTimeout(BaseException):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise TaskTimeout()
+
+
+def _init_worker():
+    if hasattr(signal, 'SIGALRM'):
+        signal.signal(signal.SIGALRM, _on_alarm)
+
+
+def _set_alarm(seconds):
+    if seconds and hasattr(signal, 'SIGALRM'):
+        signal.setitimer(signal.ITIMER_REAL, seconds)
+
+
+def collect_files(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, name)
+                             for name in names if name.endswith('.pseudo'))
+        elif os.path.exists(path):
+            files.append(path)
+        else:
+            files.extend(glob.glob(path, recursive=True))
+    return sorted(set(files))
+
+
+def _record(file_path, scope_mode, status='ok', error=None):
+    return {'file': file_path, 'scope_mode': scope_mode, 'status': status, 'error': error,
+            'steps': 0, 'output': [], 'frontend_time': 0.0, 'run_time': 0.0}
+
+
+def run_task(file_path, scope_mode, timeout=DEFAULT_TIMEOUT, options=None):
+    start = time.perf_counter()
+    try:
+        _set_alarm(timeout)
+        try:
+            ast = analyze(parse_source(file_path), scope_mode)
+            frontend_time = time.perf_counter() - start
+            result = run_mode(ast, scope_mode, record_actions=False, **(options or {}))
+        finally:
+            _set_alarm(0)
+    except TaskTimeout:
+        record = _record(file_path, scope_mode, 'timeout', f"Timed out after {timeout:g}s.")
+        record['run_time'] = time.perf_counter() - start
+        return record
+    except Exception as e:
+        record = _record(file_path, scope_mode, 'error', str(e))
+        record['run_time'] = time.perf_counter() - start
+        return record
+    record = _record(file_path, scope_mode, 'ok' if result['error'] is None else 'error',
+                     result['error'])
+    record.update(steps=result['steps'], output=result['output'],
+                  frontend_time=frontend_time, run_time=result['elapsed'])
+    return record
+
+
+def run_batch(files, scope_modes=SCOPE_MODES, workers=None, timeout=DEFAULT_TIMEOUT,
+              options=None, progress=None):
+    tasks = [(file_path, scope_mode)
+             for file_path in sorted(files, key=os.path.getsize, reverse=True)
+             for scope_mode in scope_modes]
+    records = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = {executor.submit(run_task, file_path, scope_mode, timeout, options):
+                   (file_path, scope_mode) for file_path, scope_mode in tasks}
+        for future in as_completed(futures):
+            try:
+                record = future.result()
+            except BrokenProcessPool:
+                record = _record(*futures[future], 'error', "Worker process terminated.")
+            records.append(record)
+            if progress is not None:
+                progress(len(records), len(tasks), record)
+    wall_time = time.perf_counter() - start
+    records.sort(key=lambda record: (record['file'], record['scope_mode']))
+    statuses = [record['status'] for record in records]
+    summary = {
+        'files': len(files),
+        'tasks': len(tasks),
+        'ok': statuses.count('ok'),
+        'errors': statuses.count('error'),
+        'timeouts': statuses.count('timeout'),
+        'workers': workers or os.cpu_count(),
+        'wall_time': wall_time,
+        'task_time': sum(record['frontend_time'] + record['run_time'] for record in records),
+        'steps': sum(record['steps'] for record in records),
+    }
+    return {'summary': summary, 'results': records}
+
+
+def write_json_report(report, stream):
+    json.dump(report, stream, indent=2, default=repr)
+    stream.write("\n")
+
+
+def write_csv_report(report, stream):
+    writer = csv.DictWriter(stream, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for record in report['results']:
+        writer.writerow(dict(record, outputs=len(record['output']),
+                             output="\n".join(str(value) for value in record['output'])))
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Executa em paralelo um lote de programas .pseudo e gera um relatório.")
+    parser.add_argument('paths', nargs='+',
+                        help='Diretórios, padrões glob ou arquivos .pseudo')
+    parser.add_argument('--modes', nargs='+', choices=SCOPE_MODES, default=list(SCOPE_MODES),
+                        help='Modos de escopo executados para cada arquivo (padrão: ambos)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Número de processos (padrão: número de CPUs)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f'Tempo limite de cada tarefa em segundos (padrão: {DEFAULT_TIMEOUT:g})')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='tree',
+                        help='Motor de execução')
+    parser.add_argument('--binding', choices=['deep', 'shallow'], default='deep',
+                        help='Implementação do escopo dinâmico')
+    parser.add_argument('-O', dest='opt_level', type=int, choices=[0, 1, 2], default=1,
+                        help='Nível de otimização')
+    parser.add_argument('--report', default=None,
+                        help='Arquivo do relatório (padrão: saída padrão)')
+    parser.add_argument('--format', choices=['json', 'csv'], default=None,
+                        help='Formato do relatório (padrão: pela extensão de --report, ou json)')
+    args = parser.parse_args()
+
+    files = collect_files(args.paths)
+    if not files:
+        parser.error("no .pseudo files found.")
+    report_format = args.format or (
+        'csv' if args.report and args.report.endswith('.csv') else 'json')
+
+    def progress(done, total, record):
+        print(f"\r[{done}/{total}] {record['status']:7} {record['scope_mode']:7} "
+              f"{record['file']}", end='', file=sys.stderr, flush=True)
+
+    report = run_batch(files, scope_modes=args.modes, workers=args.workers,
+                       timeout=args.timeout,
+                       options={'engine': args.engine, 'binding': args.binding,
+                                'opt_level': args.opt_level},
+                       progress=progress)
+    print(file=sys.stderr)
+    write = write_csv_report if report_format == 'csv' else write_json_report
+    if args.report:
+        with open(args.report, 'w', newline='') as f:
+            write(report, f)
+    else:
+        write(report, sys.stdout)
+    summary = report['summary']
+    print(f"{summary['tasks']} tarefas em {summary['wall_time']:.2f}s: {summary['ok']} ok, "
+          f"{summary['errors']} com erro, {summary['timeouts']} excederam o tempo limite",
+          file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+"""
+Este módulo mede separadamente o tempo de cada fase do interpretador (Lexer,
+Parser, SemanticChecker, StaticScopeResolver, a análise fundida usada pelo
+frontend, o pipeline de otimizações e a interpretação nos dois modos de
+escopo) sobre programas gerados por program_generator.py em tamanhos
+crescentes. Cada fase é executada várias vezes sobre a mesma entrada, sem
+observadores, e são registrados o menor tempo e a mediana. As fases que
+alteram a AST (análise e otimização) recebem uma AST nova a cada execução,
+preparada fora da medição, e a interpretação usa a AST produzida pelo mesmo
+caminho que main.py (análise e otimização no nível escolhido). Os resultados,
+acompanhados do commit, da versão do Python e dos parâmetros usados, são
+gravados em JSON; com --baseline, as medianas são comparadas às de uma execução
+anterior e as fases que ficaram mais lentas que o limite dado são apontadas,
+terminando com código de saída 1.
+"""
+
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from engines import ENGINES
+from frontend import analyze
+from lexer import Lexer
+from optimizer import OptimizationPipeline
+from parser import Parser
+from program_generator import generate_program
+from scope_resolver import StaticScopeResolver
+from semantic_checker import SemanticChecker
+
+DEFAULT_SIZES = (10, 50, 200)
+DEFAULT_REPEAT = 5
+PHASES = ('lexer', 'parser', 'semantic_checker', 'static_scope_resolver', 'analyzer',
+          'optimization', 'interpreter_static', 'interpreter_dynamic')
+
+
+def _measure(function, repeat, setup=None):
+    times = []
+    result = None
+    for _ in range(repeat):
+        argument = setup() if setup is not None else None
+        start = time.perf_counter()
+        result = function(argument) if setup is not None else function()
+        times.append(time.perf_counter() - start)
+    return result, {'min': min(times), 'median': statistics.median(times)}
+
+
+def _optimize(ast, scope_mode, opt_level):
+    return OptimizationPipeline.for_level(opt_level).run(ast, scope_mode)
+
+
+def benchmark_source(source, repeat=DEFAULT_REPEAT, engine='tree', opt_level=1):
+    phases = {}
+    lexer, phases['lexer'] = _measure(lambda: Lexer(source), repeat)
+    tokens = lexer.get_tokens()
+
+    def parse():
+        return Parser(tokens, lexer.lines).parse_program()
+
+    ast, phases['parser'] = _measure(parse, repeat)
+    _, phases['semantic_checker'] = _measure(lambda: SemanticChecker().visit(ast), repeat)
+    _, phases['static_scope_resolver'] = _measure(
+        lambda: StaticScopeResolver().visit(ast), repeat)
+    _, phases['analyzer'] = _measure(lambda tree: analyze(tree, 'static'), repeat, setup=parse)
+    _, phases['optimization'] = _measure(
+        lambda tree: _optimize(tree, 'static', opt_level), repeat,
+        setup=lambda: analyze(parse(), 'static'))
+    for scope_mode in ('static', 'dynamic'):
+        scope_ast = analyze(parse(), scope_mode)
+        _optimize(scope_ast, scope_mode, opt_level)
+        _, phases[f'interpreter_{scope_mode}'] = _measure(
+            lambda: ENGINES[engine](scope_ast, scope_mode).interpret(), repeat)
+    return {'source_bytes': len(source), 'tokens': len(tokens), 'phases': phases}
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(sizes=DEFAULT_SIZES, seed=0, repeat=DEFAULT_REPEAT, engine='tree', opt_level=1,
+                  **knobs):
+    results = []
+    for size in sizes:
+        source = generate_program(seed, functions=size, **knobs)
+        results.append(dict(benchmark_source(source, repeat, engine, opt_level), size=size))
+    return {
+        'metadata': {
+            'commit': _commit(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'repeat': repeat,
+            'engine': engine,
+            'opt_level': opt_level,
+            'knobs': knobs,
+        },
+        'results': results,
+    }
+
+
+def compare_to_baseline(report, baseline, threshold=0.1):
+    baseline_results = {result['size']: result for result in baseline['results']}
+    rows = []
+    for result in report['results']:
+        previous = baseline_results.get(result['size'])
+        if previous is None:
+            continue
+        for phase in PHASES:
+            if phase not in result['phases'] or phase not in previous['phases']:
+                continue
+            before = previous['phases'][phase]['median']
+            after = result['phases'][phase]['median']
+            ratio = after / before if before else float('inf')
+            rows.append({'size': result['size'], 'phase': phase, 'baseline': before,
+                         'current': after, 'ratio': ratio,
+                         'regression': ratio > 1 + threshold})
+    return rows
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Mede o tempo de cada fase do interpretador em programas gerados.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help='Números de funções dos programas gerados')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help=f'Execuções de cada fase (padrão: {DEFAULT_REPEAT})')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='tree',
+                        help='Motor usado na fase de interpretação')
+    parser.add_argument('-O', dest='opt_level', type=int, choices=[0, 1, 2], default=1,
+                        help='Nível de otimização das fases optimization e de interpretação '
+                             '(padrão: 1)')
+    parser.add_argument('--globals', dest='globals_count', type=int, default=8)
+    parser.add_argument('--call-depth', type=int, default=4)
+    parser.add_argument('--expression-length', type=int, default=4)
+    parser.add_argument('--locals', dest='locals_per_frame', type=int, default=3)
+    parser.add_argument('--shadowing', type=float, default=0.5)
+    parser.add_argument('--statements', type=int, default=6)
+    parser.add_argument('--fanout', type=int, default=1,
+                        help='Chamadas de cada função à seguinte da cadeia; valores maiores '
+                             'que 1 tornam as expressões quentes (padrão: 1)')
+    parser.add_argument('-o', '--output', default=None,
+                        help='Arquivo JSON onde os resultados são gravados')
+    parser.add_argument('--baseline', default=None,
+                        help='Resultados JSON anteriores com os quais comparar')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='Aumento relativo da mediana considerado regressão (padrão: 0.1)')
+    args = parser.parse_args()
+
+    report = run_benchmark(args.sizes, seed=args.seed, repeat=args.repeat, engine=args.engine,
+                           opt_level=args.opt_level,
+                           globals_count=args.globals_count, call_depth=args.call_depth,
+                           expression_length=args.expression_length,
+                           locals_per_frame=args.locals_per_frame,
+                           shadowing=args.shadowing, statements=args.statements,
+                           fanout=args.fanout)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    print(f"{'size':>6} {'phase':<24} {'min (ms)':>10} {'median (ms)':>12}")
+    for result in report['results']:
+        for phase, timing in result['phases'].items():
+            print(f"{result['size']:>6} {phase:<24} {timing['min'] * 1000:>10.3f} "
+                  f"{timing['median'] * 1000:>12.3f}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            rows = compare_to_baseline(report, json.load(f), args.threshold)
+        print()
+        for row in rows:
+            mark = "  REGRESSION" if row['regression'] else ""
+            print(f"{row['size']:>6} {row['phase']:<24} {row['ratio']:>8.2f}x{mark}")
+        if any(row['regression'] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,354 @@
+"""
+Este módulo implementa o formato binário de trace: um contêiner com registros
+empacotados com struct e prefixados pelo tamanho, agrupados em blocos
+comprimidos de forma independente (zlib ou lzma). Cada registro é uma entrada
+completa do trace (mesma estrutura das linhas do log JSONL), codificada com
+marcadores de tipo (None, bool, int, float, str, lista e dicionário). Ao fechar
+o arquivo é gravado um índice no rodapé que associa a primeira etapa de cada
+bloco ao seu deslocamento no arquivo, de modo que o leitor encontra qualquer
+etapa descomprimindo um único bloco. Para anexar novas etapas, o índice antigo
+é removido e regravado ao final, sem reescrever os blocos existentes; se o
+rodapé estiver ausente (gravação interrompida), o índice é reconstruído
+percorrendo os cabeçalhos dos blocos. read_trace lê sob demanda qualquer dos
+formatos de trace (JSONL completo, JSONL com deltas ou binário) a partir de uma
+etapa. Executado diretamente, converte traces JSONL (completos ou com deltas)
+para o formato binário e vice-versa.
+"""
+
+import json
+import lzma
+import os
+import struct
+import zlib
+from bisect import bisect_right
+from itertools import chain, islice
+from trace_format import decode_records, is_delta_header
+
+MAGIC = b'PSTB'
+INDEX_MAGIC = b'PSTX'
+FORMAT_VERSION = 1
+DEFAULT_CHUNK_SIZE = 1024
+
+FILE_HEADER = struct.Struct('<4sHB')
+CHUNK_HEADER = struct.Struct('<IIQ')
+INDEX_ENTRY = struct.Struct('<QQI')
+TRAILER = struct.Struct('<QI4s')
+LENGTH = struct.Struct('<I')
+INT64 = struct.Struct('<q')
+FLOAT64 = struct.Struct('<d')
+
+CODECS = {
+    'zlib': (1, zlib.compress, zlib.decompress),
+    'lzma': (2, lzma.compress, lzma.decompress),
+}
+CODEC_NAMES = {codec_id: name for name, (codec_id, _, _) in CODECS.items()}
+
+
+def _encode_value(value, parts):
+    if value is None:
+        parts.append(b'N')
+    elif value is True:
+        parts.append(b'T')
+    elif value is False:
+        parts.append(b'F')
+    elif isinstance(value, int):
+        if -2**63 <= value < 2**63:
+            parts.append(b'i' + INT64.pack(value))
+        else:
+            encoded = str(value).encode('ascii')
+            parts.append(b'I' + LENGTH.pack(len(encoded)) + encoded)
+    elif isinstance(value, float):
+        parts.append(b'f' + FLOAT64.pack(value))
+    elif isinstance(value, str):
+        encoded = value.encode('utf-8')
+        parts.append(b's' + LENGTH.pack(len(encoded)) + encoded)
+    elif isinstance(value, (list, tuple)):
+        parts.append(b'l' + LENGTH.pack(len(value)))
+        for item in value:
+            _encode_value(item, parts)
+    elif isinstance(value, dict):
+        parts.append(b'd' + LENGTH.pack(len(value)))
+        for key, item in value.items():
+            _encode_value(str(key), parts)
+            _encode_value(item, parts)
+    else:
+        raise TypeError(
+            f"Cannot store value of type {type(value).__name__} in a binary trace.")
+
+
+def encode_record(record):
+    parts = []
+    _encode_value(record, parts)
+    body = b''.join(parts)
+    return LENGTH.pack(len(body)) + body
+
+
+def _decode_value(data, pos):
+    tag = data[pos:pos + 1]
+    pos += 1
+    if tag == b'N':
+        return None, pos
+    if tag == b'T':
+        return True, pos
+    if tag == b'F':
+        return False, pos
+    if tag == b'i':
+        return INT64.unpack_from(data, pos)[0], pos + INT64.size
+    if tag == b'f':
+        return FLOAT64.unpack_from(data, pos)[0], pos + FLOAT64.size
+    if tag in (b's', b'I'):
+        length = LENGTH.unpack_from(data, pos)[0]
+        pos += LENGTH.size
+        text = data[pos:pos + length].decode('utf-8')
+        return (text if tag == b's' else int(text)), pos + length
+    if tag == b'l':
+        count = LENGTH.unpack_from(data, pos)[0]
+        pos += LENGTH.size
+        items = []
+        for _ in range(count):
+            item, pos = _decode_value(data, pos)
+            items.append(item)
+        return items, pos
+    if tag == b'd':
+        count = LENGTH.unpack_from(data, pos)[0]
+        pos += LENGTH.size
+        items = {}
+        for _ in range(count):
+            key, pos = _decode_value(data, pos)
+            items[key], pos = _decode_value(data, pos)
+        return items, pos
+    raise ValueError(f"Corrupted binary trace: unknown type tag {tag!r}.")
+
+
+def decode_chunk(payload):
+    records = []
+    pos = 0
+    while pos < len(payload):
+        length = LENGTH.unpack_from(payload, pos)[0]
+        pos += LENGTH.size
+        record, end = _decode_value(payload, pos)
+        if end != pos + length:
+            raise ValueError("Corrupted binary trace: record length mismatch.")
+        records.append(record)
+        pos = end
+    return records
+
+
+def is_binary_trace(path):
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _read_header(f):
+    header = f.read(FILE_HEADER.size)
+    if len(header) != FILE_HEADER.size:
+        raise ValueError("Not a binary trace: file is too short.")
+    magic, version, codec_id = FILE_HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("Not a binary trace: bad magic number.")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported binary trace version {version}.")
+    if codec_id not in CODEC_NAMES:
+        raise ValueError(f"Unknown binary trace codec {codec_id}.")
+    return CODEC_NAMES[codec_id]
+
+
+def _read_index(f):
+    file_size = f.seek(0, os.SEEK_END)
+    if file_size >= FILE_HEADER.size + TRAILER.size:
+        f.seek(file_size - TRAILER.size)
+        index_offset, entry_count, magic = TRAILER.unpack(f.read(TRAILER.size))
+        if magic == INDEX_MAGIC and index_offset + entry_count * INDEX_ENTRY.size + TRAILER.size == file_size:
+            f.seek(index_offset)
+            data = f.read(entry_count * INDEX_ENTRY.size)
+            return [INDEX_ENTRY.unpack_from(data, i * INDEX_ENTRY.size)
+                    for i in range(entry_count)], index_offset
+    return _scan_chunks(f, file_size)
+
+
+def _scan_chunks(f, file_size):
+    index = []
+    offset = FILE_HEADER.size
+    while offset + CHUNK_HEADER.size <= file_size:
+        f.seek(offset)
+        size, count, first_step = CHUNK_HEADER.unpack(f.read(CHUNK_HEADER.size))
+        end = offset + CHUNK_HEADER.size + size
+        if end > file_size or (index and first_step != index[-1][0] + index[-1][2]):
+            break
+        index.append((first_step, offset, count))
+        offset = end
+    return index, offset
+
+
+class BinaryTraceWriter:
+    def __init__(self, path, codec='zlib', chunk_size=DEFAULT_CHUNK_SIZE, append=False):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.pending = []
+        self.closed = False
+        if append and os.path.exists(path) and os.path.getsize(path) > 0:
+            self.file = open(path, 'r+b')
+            self.codec = _read_header(self.file)
+            self.index, end = _read_index(self.file)
+            self.file.seek(end)
+            self.file.truncate()
+        else:
+            if codec not in CODECS:
+                raise ValueError(f"Unknown binary trace codec '{codec}'.")
+            self.codec = codec
+            self.file = open(path, 'wb')
+            self.file.write(FILE_HEADER.pack(MAGIC, FORMAT_VERSION, CODECS[codec][0]))
+            self.index = []
+        self.next_step = self.index[-1][0] + self.index[-1][2] if self.index else 0
+        self.compress = CODECS[self.codec][1]
+
+    def write(self, record):
+        self.pending.append(encode_record(record))
+        if len(self.pending) >= self.chunk_size:
+            self._flush_chunk()
+
+    def write_batch(self, records):
+        for record in records:
+            self.write(record)
+
+    def _flush_chunk(self):
+        if not self.pending:
+            return
+        payload = self.compress(b''.join(self.pending))
+        offset = self.file.tell()
+        self.file.write(CHUNK_HEADER.pack(len(payload), len(self.pending), self.next_step))
+        self.file.write(payload)
+        self.index.append((self.next_step, offset, len(self.pending)))
+        self.next_step += len(self.pending)
+        self.pending = []
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self._flush_chunk()
+        index_offset = self.file.tell()
+        self.file.write(b''.join(INDEX_ENTRY.pack(*entry) for entry in self.index))
+        self.file.write(TRAILER.pack(index_offset, len(self.index), INDEX_MAGIC))
+        self.file.close()
+
+
+class BinaryTraceReader:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, 'rb')
+        self.codec = _read_header(self.file)
+        self.decompress = CODECS[self.codec][2]
+        self.index, _ = _read_index(self.file)
+        self.first_steps = [first_step for first_step, _, _ in self.index]
+        self.cached_chunk = None
+        self.cached_records = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.file.close()
+
+    def __len__(self):
+        if not self.index:
+            return 0
+        first_step, _, count = self.index[-1]
+        return first_step + count
+
+    def _chunk(self, chunk_number):
+        if self.cached_chunk != chunk_number:
+            _, offset, _ = self.index[chunk_number]
+            self.file.seek(offset)
+            size, _, _ = CHUNK_HEADER.unpack(self.file.read(CHUNK_HEADER.size))
+            self.cached_records = decode_chunk(self.decompress(self.file.read(size)))
+            self.cached_chunk = chunk_number
+        return self.cached_records
+
+    def read_step(self, step):
+        if not 0 <= step < len(self):
+            raise IndexError(f"Step {step} is out of range (0-{len(self) - 1}).")
+        chunk_number = bisect_right(self.first_steps, step) - 1
+        return self._chunk(chunk_number)[step - self.first_steps[chunk_number]]
+
+    def entries(self, start=0):
+        if start >= len(self):
+            return
+        chunk_number = bisect_right(self.first_steps, start) - 1
+        skip = start - self.first_steps[chunk_number]
+        for number in range(chunk_number, len(self.index)):
+            yield from self._chunk(number)[skip:]
+            skip = 0
+
+    def __iter__(self):
+        return self.entries()
+
+
+def read_trace(path, start=0):
+    if is_binary_trace(path):
+        with BinaryTraceReader(path) as reader:
+            yield from reader.entries(start)
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = (line for line in f if line.strip())
+        first = next(lines, None)
+        if first is None:
+            return
+        first_record = json.loads(first)
+        if is_delta_header(first_record):
+            yield from decode_records(chain([first_record], map(json.loads, lines)), start=start)
+            return
+        if start == 0:
+            yield first_record
+        for line in islice(lines, max(start - 1, 0), None):
+            yield json.loads(line)
+
+
+def jsonl_to_binary(source, destination, codec='zlib', chunk_size=DEFAULT_CHUNK_SIZE):
+    writer = BinaryTraceWriter(destination, codec=codec, chunk_size=chunk_size)
+    try:
+        for entry in read_trace(source):
+            writer.write(entry)
+    finally:
+        writer.close()
+    return writer.next_step
+
+
+def binary_to_jsonl(source, destination):
+    count = 0
+    with BinaryTraceReader(source) as reader, open(destination, 'w', encoding='utf-8') as f:
+        for entry in reader:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            count += 1
+    return count
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Converte traces entre JSONL e o formato binário indexado.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    to_binary = subparsers.add_parser('to-binary', help='JSONL (completo ou delta) para binário')
+    to_binary.add_argument('source')
+    to_binary.add_argument('destination')
+    to_binary.add_argument('--codec', choices=sorted(CODECS), default='zlib')
+    to_binary.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                           help=f'Registros por bloco comprimido (padrão: {DEFAULT_CHUNK_SIZE})')
+    to_jsonl = subparsers.add_parser('to-jsonl', help='Binário para JSONL completo')
+    to_jsonl.add_argument('source')
+    to_jsonl.add_argument('destination')
+    args = parser.parse_args()
+
+    if args.command == 'to-binary':
+        count = jsonl_to_binary(args.source, args.destination,
+                                codec=args.codec, chunk_size=args.chunk_size)
+    else:
+        count = binary_to_jsonl(args.source, args.destination)
+    print(f"{count} step(s) written to '{args.destination}'.")
+
+
+if __name__ == '__main__':
+    main()
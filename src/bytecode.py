@@ -0,0 +1,223 @@
+"""
+Este módulo implementa o compilador da AST para bytecode e o respectivo
+desassemblador. Cada função é compilada em um CodeObject com um vetor plano de
+instruções (pares opcode/argumento em um array de inteiros) e tabelas de
+constantes, nomes, declarações e chamadas. Variáveis com endereço léxico (escopo
+estático) são acessadas por slot (LOAD_LOCAL/STORE_LOCAL, LOAD_GLOBAL/
+STORE_GLOBAL); as demais são acessadas por nome (LOAD_NAME/STORE_NAME) e
+resolvidas pela máquina virtual conforme o modo de escopo. As chamadas marcadas
+como de cauda pelo frontend são emitidas como TAIL_CALL. O resultado é
+composto apenas por dados simples, podendo ser serializado e guardado em disco.
+"""
+
+from array import array
+from ast_nodes import *
+from interpreter import Interpreter
+
+LOAD_CONST = 1
+LOAD_LOCAL = 2
+LOAD_GLOBAL = 3
+LOAD_NAME = 4
+STORE_LOCAL = 5
+STORE_GLOBAL = 6
+STORE_NAME = 7
+DECLARE = 8
+BINARY_ADD = 9
+BINARY_SUB = 10
+CALL = 11
+PRINT = 12
+PRINT_BUILTIN = 13
+RETURN = 14
+FAIL = 15
+TAIL_CALL = 16
+
+OPCODE_NAMES = {
+    value: name for name, value in globals().items()
+    if name.isupper() and isinstance(value, int)
+}
+
+
+class CodeObject:
+    def __init__(self, name, params, frame_size):
+        self.name = name
+        self.params = params
+        self.frame_size = frame_size
+        self.instructions = array('i')
+        self.constants = []
+        self.constant_indexes = {}
+        self.names = []
+        self.name_indexes = {}
+        self.declarations = []
+        self.calls = []
+        self.local_names = {}
+
+    def emit(self, opcode, argument=0):
+        self.instructions.append(opcode)
+        self.instructions.append(argument)
+
+    def constant(self, value):
+        key = (type(value), value)
+        index = self.constant_indexes.get(key)
+        if index is None:
+            index = self.constant_indexes[key] = len(self.constants)
+            self.constants.append(value)
+        return index
+
+    def name_index(self, name):
+        index = self.name_indexes.get(name)
+        if index is None:
+            index = self.name_indexes[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+
+class Program:
+    def __init__(self, functions, global_names):
+        self.functions = functions
+        self.global_names = global_names
+
+
+class BytecodeCompiler:
+    DEFAULT_VALUES = Interpreter.DEFAULT_VALUES
+
+    def __init__(self, scope_mode):
+        self.scope_mode = scope_mode
+        self.code = None
+
+    def compile_program(self, ast):
+        global_names = [declaration.var_name for declaration in ast.declarations
+                        if isinstance(declaration, VarDeclNode)]
+        functions = {}
+        for declaration in ast.declarations:
+            if isinstance(declaration, FunctionDefNode) and declaration.name not in functions:
+                functions[declaration.name] = self.compile_function(declaration)
+        return Program(functions, global_names)
+
+    def compile_function(self, func_node):
+        self.code = CodeObject(
+            func_node.name,
+            [(param.var_name, param.slot) for param in func_node.params],
+            func_node.frame_size or 0)
+        for param in func_node.params:
+            if param.slot is not None:
+                self.code.local_names[param.slot] = param.var_name
+        self.visit(func_node.body)
+        self.code.emit(RETURN)
+        return self.code
+
+    def visit(self, node):
+        method_name = f'visit_{type(node).__name__}'
+        visitor = getattr(self, method_name, self.generic_visit)
+        return visitor(node)
+
+    def generic_visit(self, node):
+        self.code.emit(FAIL, self.code.constant(
+            f"No visit method for {type(node).__name__}"))
+
+    def visit_BlockNode(self, node):
+        for statement in node.statements:
+            self.visit(statement)
+
+    def visit_VarDeclNode(self, node):
+        slot = node.slot if self.scope_mode == 'static' else None
+        if slot is not None:
+            self.code.local_names[slot] = node.var_name
+        self.code.declarations.append(
+            (node.var_name, self.DEFAULT_VALUES.get(node.var_type), slot))
+        self.code.emit(DECLARE, len(self.code.declarations) - 1)
+
+    def visit_AssignNode(self, node):
+        self.visit(node.expression)
+        address = node.identifier.address if self.scope_mode == 'static' else None
+        if address is None:
+            self.code.emit(STORE_NAME, self.code.name_index(node.identifier.name))
+        elif address[0] == 0:
+            self.code.emit(STORE_LOCAL, address[1])
+        else:
+            self.code.emit(STORE_GLOBAL, address[1])
+
+    def visit_IdentifierNode(self, node):
+        address = node.address if self.scope_mode == 'static' else None
+        if address is None:
+            self.code.emit(LOAD_NAME, self.code.name_index(node.name))
+        elif address[0] == 0:
+            self.code.emit(LOAD_LOCAL, address[1])
+        else:
+            self.code.emit(LOAD_GLOBAL, address[1])
+
+    def visit_IntegerNode(self, node):
+        self.code.emit(LOAD_CONST, self.code.constant(node.value))
+
+    visit_FloatNode = visit_IntegerNode
+    visit_CharNode = visit_IntegerNode
+
+    def visit_BinaryOpNode(self, node):
+        self.visit(node.left)
+        self.visit(node.right)
+        if node.op == '+':
+            self.code.emit(BINARY_ADD)
+        elif node.op == '-':
+            self.code.emit(BINARY_SUB)
+        else:
+            self.code.emit(FAIL, self.code.constant(
+                f"Unsupported binary operator: {node.op}"))
+
+    def visit_PrintNode(self, node):
+        self.visit(node.expression)
+        self.code.emit(PRINT)
+
+    def visit_CallNode(self, node):
+        func_name = node.function_name.name
+        if func_name == 'print':
+            if node.args:
+                self.visit(node.args[0])
+            self.code.emit(PRINT_BUILTIN, len(node.args[:1]))
+            return
+        for arg in node.args:
+            self.visit(arg)
+        self.code.calls.append((func_name, len(node.args)))
+        self.code.emit(TAIL_CALL if node.tail else CALL, len(self.code.calls) - 1)
+
+
+def disassemble(code):
+    lines = [f"Disassembly of {code.name} (params={[name for name, _ in code.params]}, "
+             f"frame_size={code.frame_size}):"]
+    instructions = code.instructions
+    pc = 0
+    while pc < len(instructions):
+        opcode, argument = instructions[pc], instructions[pc + 1]
+        offset = pc
+        pc += 2
+        name = OPCODE_NAMES.get(opcode, f'<{opcode}>')
+        detail = ''
+        if opcode == LOAD_CONST or opcode == FAIL:
+            detail = f'({code.constants[argument]!r})'
+        elif opcode in (LOAD_NAME, STORE_NAME):
+            detail = f'({code.names[argument]})'
+        elif opcode in (LOAD_LOCAL, STORE_LOCAL):
+            detail = f'({code.local_names.get(argument, "?")})'
+        elif opcode == DECLARE:
+            var_name, default_value, slot = code.declarations[argument]
+            detail = f'({var_name} = {default_value!r}, slot={slot})'
+        elif opcode == CALL or opcode == TAIL_CALL:
+            func_name, argc = code.calls[argument]
+            detail = f'({func_name}, argc={argc})'
+        elif opcode in (BINARY_ADD, BINARY_SUB, PRINT, RETURN):
+            argument = ''
+        lines.append(f"{offset:6d} {name:<14} {argument!s:>4} {detail}".rstrip())
+    return '\n'.join(lines)
+
+
+def disassemble_program(program):
+    return '\n\n'.join(disassemble(code) for code in program.functions.values())
+
+
+if __name__ == '__main__':
+    import sys
+    from frontend import parse_source, analyze
+    if len(sys.argv) < 2:
+        print("Usage: python bytecode.py <program_file.pseudo> [--static | --dynamic]")
+        sys.exit(1)
+    scope_mode = 'dynamic' if '--dynamic' in sys.argv else 'static'
+    ast = analyze(parse_source(sys.argv[1]), scope_mode)
+    print(disassemble_program(BytecodeCompiler(scope_mode).compile_program(ast)))
@@ -4,15 +4,17 @@ chamadas do interpretador. Define a classe ActivationRecord que representa um
 registro de ativação para cada chamada de função, armazenando variáveis locais, 
 referências para frames pai (escopo dinâmico) e frames léxicos (escopo estático). 
 A classe CallStack gerencia a pilha destes registros, permitindo operações de 
-push, pop e peek para controlar o fluxo de execução das funções.
+push, pop e peek para controlar o fluxo de execução das funções. A classe
+ShallowBindingTable implementa a vinculação rasa do escopo dinâmico.
 """
 
 
 class ActivationRecord:
-    def __init__(self, name, scope_type, parent_frame=None, lex_parent_frame=None):
+    def __init__(self, name, scope_type, parent_frame=None, lex_parent_frame=None, frame_size=0):
         self.name = name
         self.scope_type = scope_type
         self.locals = {}
+        self.slots = [None] * frame_size
         self.parent_frame = parent_frame
         self.lex_parent_frame = lex_parent_frame
 
@@ -22,6 +24,10 @@ class ActivationRecord:
     def set_local(self, name, value):
         self.locals[name] = value
 
+    def set_slot(self, slot, name, value):
+        self.slots[slot] = value
+        self.locals[name] = value
+
     def __repr__(self):
         return f"AR(name='{self.name}', locals={self.locals}, type='{self.scope_type}')"
 
@@ -45,3 +51,39 @@ class CallStack:
 
     def __repr__(self):
         return "\n".join(str(ar) for ar in reversed(self.stack))
+
+
+class ShallowBindingTable:
+    # Associa cada nome à pilha de registros que o vinculam, atualizada ao
+    # empilhar e desempilhar registros: a busca dinâmica tem custo constante.
+    def __init__(self):
+        self.bindings = {}
+
+    def bind(self, frame, name, value):
+        if name not in frame.locals:
+            self.bindings.setdefault(name, []).append(frame)
+        frame.set_local(name, value)
+
+    def lookup(self, name):
+        frames = self.bindings.get(name)
+        if frames:
+            return frames[-1]
+        return None
+
+    def release(self, frame):
+        for name in frame.locals:
+            self.bindings[name].pop()
+
+
+def format_call_chain(names, limit=12):
+    runs = []
+    for name in names:
+        if runs and runs[-1][0] == name:
+            runs[-1][1] += 1
+        else:
+            runs.append([name, 1])
+    parts = [name if count == 1 else f"{name} (x{count})" for name, count in runs]
+    if len(parts) > limit:
+        omitted = len(parts) - limit
+        parts = parts[:limit // 2] + [f"... {omitted} more ..."] + parts[-(limit // 2):]
+    return " -> ".join(parts)
@@ -0,0 +1,344 @@
+"""
+Este módulo implementa um motor de execução que compila o corpo de cada função
+em uma árvore de closures Python especializadas para o modo de escopo: cada nó
+vira uma função que já conhece seus filhos compilados e o endereço léxico ou a
+estratégia de busca dinâmica (profunda ou rasa) de suas variáveis, sem getattr
+nem testes do modo de escopo na execução. A compilação é feita na segunda
+chamada da função; a primeira percorre a AST como o Interpreter, já que sem
+laços um corpo executado uma única vez não recupera o custo de compilá-lo.
+"""
+
+from call_stack import ActivationRecord
+from interpreter import DEFAULT_MAX_DEPTH, Interpreter, operand_error
+
+
+class ClosureInterpreter(Interpreter):
+    def __init__(self, ast, scope_mode, json_log_file=None, binding='deep', observer=None,
+                 max_depth=DEFAULT_MAX_DEPTH):
+        super().__init__(ast, scope_mode, json_log_file=json_log_file, binding=binding,
+                         observer=observer, max_depth=max_depth)
+        self.function_bodies = {}
+
+    def _execute_body(self, func_node):
+        key = id(func_node)
+        body = self.function_bodies.get(key)
+        if body is None:
+            self.function_bodies[key] = False
+            self.visit(func_node.body)
+            return
+        if body is False:
+            body = self.function_bodies[key] = self._compile(func_node.body)
+        body()
+
+    def _compile(self, node):
+        compiler = getattr(self, f'_compile_{type(node).__name__}', None)
+        if compiler is None:
+            return lambda: self.visit(node)
+        return compiler(node)
+
+    def _compile_BlockNode(self, node):
+        statements = [self._compile(statement)
+                      for statement in node.statements]
+
+        def run_block():
+            for statement in statements:
+                statement()
+        return run_block
+
+    def _compile_IntegerNode(self, node):
+        value = node.value
+        return lambda: value
+
+    _compile_FloatNode = _compile_IntegerNode
+    _compile_CharNode = _compile_IntegerNode
+
+    def _compile_BinaryOpNode(self, node):
+        left = self._compile(node.left)
+        right = self._compile(node.right)
+        op = node.op
+        if op == '+':
+            def add():
+                left_value = left()
+                right_value = right()
+                try:
+                    return left_value + right_value
+                except TypeError:
+                    raise operand_error(op, left_value, right_value) from None
+            return add
+        if op == '-':
+            def subtract():
+                left_value = left()
+                right_value = right()
+                try:
+                    return left_value - right_value
+                except TypeError:
+                    raise operand_error(op, left_value, right_value) from None
+            return subtract
+
+        def unsupported():
+            left()
+            right()
+            raise Exception(f"Unsupported binary operator: {op}")
+        return unsupported
+
+    def _compile_IdentifierNode(self, node):
+        name = node.name
+        stack = self.call_stack.stack
+
+        if self.scope_mode == 'static':
+            if node.address is None:
+                return lambda: self.visit_IdentifierNode(node)
+            depth, slot = node.address
+            if depth == 0:
+                return lambda: stack[-1].slots[slot]
+            global_var_info = self.global_slots[slot]
+            return lambda: global_var_info['value']
+
+        global_symbols = self.global_scope.symbols
+
+        def read_global():
+            global_var_info = global_symbols.get(name)
+            if global_var_info and global_var_info['type'] != 'function':
+                return global_var_info['value']
+            raise Exception(
+                f"Dynamic Scope Error: Undefined variable '{name}'.")
+
+        if self.shallow_bindings:
+            bindings = self.shallow_bindings.bindings
+
+            def read_shallow():
+                frames = bindings.get(name)
+                if frames:
+                    return frames[-1].locals[name]
+                return read_global()
+            return read_shallow
+
+        def read_deep():
+            frame = stack[-1] if stack else None
+            while frame is not None:
+                local_values = frame.locals
+                if name in local_values:
+                    return local_values[name]
+                frame = frame.parent_frame
+            return read_global()
+        return read_deep
+
+    def _compile_VarDeclNode(self, node):
+        name = node.var_name
+        slot = node.slot
+        default_value = self.DEFAULT_VALUES.get(node.var_type)
+        stack = self.call_stack.stack
+
+        if self.scope_mode == 'static' and slot is not None:
+            def declare_slot():
+                if stack:
+                    stack[-1].set_slot(slot, name, default_value)
+            return declare_slot
+
+        if self.shallow_bindings:
+            bind = self.shallow_bindings.bind
+
+            def declare_shallow():
+                if stack:
+                    bind(stack[-1], name, default_value)
+            return declare_shallow
+
+        def declare_local():
+            if stack:
+                stack[-1].set_local(name, default_value)
+        return declare_local
+
+    def _compile_AssignNode(self, node):
+        identifier = node.identifier
+        name = identifier.name
+        expression = self._compile(node.expression)
+        stack = self.call_stack.stack
+        notify = self._notify
+        observes_state = self.observes_state
+
+        if self.scope_mode == 'static':
+            if identifier.address is None:
+                return lambda: self._assign(identifier, expression())
+            depth, slot = identifier.address
+            if depth == 0:
+                def assign_local():
+                    value = expression()
+                    stack[-1].set_slot(slot, name, value)
+                    if observes_state:
+                        notify(f"Assignment: {name} = {value}")
+                return assign_local
+            global_var_info = self.global_slots[slot]
+
+            def assign_global():
+                value = expression()
+                global_var_info['value'] = value
+                if observes_state:
+                    notify(f"Assignment: {name} = {value}")
+            return assign_global
+
+        global_symbols = self.global_scope.symbols
+
+        def assign_global_or_fail(value):
+            global_var_info = global_symbols.get(name)
+            if global_var_info and global_var_info['type'] != 'function':
+                global_var_info['value'] = value
+            else:
+                raise Exception(
+                    f"Assignment error: Variable '{name}' not found or cannot be assigned.")
+
+        if self.shallow_bindings:
+            bindings = self.shallow_bindings.bindings
+
+            def assign_shallow():
+                value = expression()
+                frames = bindings.get(name)
+                if frames:
+                    frames[-1].locals[name] = value
+                else:
+                    assign_global_or_fail(value)
+                if observes_state:
+                    notify(f"Assignment: {name} = {value}")
+            return assign_shallow
+
+        def assign_deep():
+            value = expression()
+            frame = stack[-1] if stack else None
+            while frame is not None:
+                local_values = frame.locals
+                if name in local_values:
+                    local_values[name] = value
+                    break
+                frame = frame.parent_frame
+            else:
+                assign_global_or_fail(value)
+            if observes_state:
+                notify(f"Assignment: {name} = {value}")
+        return assign_deep
+
+    def _compile_PrintNode(self, node):
+        expression = self._compile(node.expression)
+        output = self._output
+        return lambda: output(expression())
+
+    def _compile_CallNode(self, node):
+        func_name = node.function_name.name
+        func_info = self.global_scope.lookup(func_name)
+
+        if not func_info:
+            def undefined_call():
+                raise Exception(
+                    f"Call error: Function '{func_name}' not defined.")
+            return undefined_call
+
+        if func_info['type'] == 'builtin_function' and func_name == 'print':
+            return lambda: self._handle_print(node.args)
+
+        func_node = func_info['node']
+        args = [self._compile(arg) for arg in node.args]
+        params = func_node.params
+        param_count = len(params)
+        key = id(func_node)
+        function_bodies = self.function_bodies
+        execute_body = self._execute_body
+        stack = self.call_stack.stack
+        notify = self._notify
+        observes_state = self.observes_state
+        observes_calls = self.observes_calls
+        observer = self.observer
+        call_action = f"Function Call: {func_name}"
+        return_action = f"Function Return: {func_name}"
+
+        max_depth = self.max_depth
+
+        def check_call(evaluated_args):
+            if len(stack) >= max_depth:
+                self._check_depth(func_name)
+            if len(evaluated_args) != param_count:
+                raise Exception(
+                    f"Function call error: '{func_name}' expects {param_count} arguments, but got {len(evaluated_args)}.")
+
+        if self.scope_mode == 'static':
+            if any(param.slot is None for param in params):
+                return lambda: self.visit_CallNode(node)
+            lex_parent = func_info['closure_scope']
+            frame_size = func_node.frame_size or 0
+            param_slots = [(param.slot, param.var_name) for param in params]
+
+            def call_static():
+                evaluated_args = [arg() for arg in args]
+                frame = ActivationRecord(
+                    func_name, 'static', None, lex_parent, frame_size)
+                check_call(evaluated_args)
+                for (slot, name), value in zip(param_slots, evaluated_args):
+                    frame.set_slot(slot, name, value)
+                stack.append(frame)
+                if observes_state:
+                    notify(call_action)
+                if observes_calls:
+                    observer.on_call(self, func_name)
+                body = function_bodies.get(key)
+                if body:
+                    body()
+                else:
+                    execute_body(func_node)
+                stack.pop()
+                if observes_state:
+                    notify(return_action)
+                if observes_calls:
+                    observer.on_return(self, func_name)
+            return call_static
+
+        param_names = [param.var_name for param in params]
+
+        if self.shallow_bindings:
+            bind = self.shallow_bindings.bind
+            release = self.shallow_bindings.release
+
+            def call_shallow():
+                evaluated_args = [arg() for arg in args]
+                frame = ActivationRecord(
+                    func_name, 'dynamic', stack[-1] if stack else None, None)
+                check_call(evaluated_args)
+                for name, value in zip(param_names, evaluated_args):
+                    bind(frame, name, value)
+                stack.append(frame)
+                if observes_state:
+                    notify(call_action)
+                if observes_calls:
+                    observer.on_call(self, func_name)
+                body = function_bodies.get(key)
+                if body:
+                    body()
+                else:
+                    execute_body(func_node)
+                stack.pop()
+                release(frame)
+                if observes_state:
+                    notify(return_action)
+                if observes_calls:
+                    observer.on_return(self, func_name)
+            return call_shallow
+
+        def call_deep():
+            evaluated_args = [arg() for arg in args]
+            frame = ActivationRecord(
+                func_name, 'dynamic', stack[-1] if stack else None, None)
+            check_call(evaluated_args)
+            for name, value in zip(param_names, evaluated_args):
+                frame.set_local(name, value)
+            stack.append(frame)
+            if observes_state:
+                notify(call_action)
+            if observes_calls:
+                observer.on_call(self, func_name)
+            body = function_bodies.get(key)
+            if body:
+                body()
+            else:
+                execute_body(func_node)
+            stack.pop()
+            if observes_state:
+                notify(return_action)
+            if observes_calls:
+                observer.on_return(self, func_name)
+        return call_deep
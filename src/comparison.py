@@ -0,0 +1,116 @@
+"""
+Este módulo compara a execução de um programa nos modos de escopo estático e
+dinâmico dentro de um único processo coordenador. O fonte é lido, analisado e
+verificado uma única vez (ver frontend.analyze_shared), e a AST resultante é
+enviada a um pool de processos em que os dois modos são interpretados em
+paralelo, cada um com sua própria cópia da AST, sobre a qual roda o pipeline de
+otimizações do modo. Cada execução devolve a saída do programa, o erro (se
+houver), o número de etapas, o tempo gasto, as ações registradas e,
+opcionalmente, o estado completo de cada etapa. O resumo das divergências,
+serializável em JSON, combina a primeira diferença na saída com o alinhamento
+das ações dos dois traces (ver trace_alignment.py).
+"""
+
+import time
+from itertools import zip_longest
+from concurrent.futures import ProcessPoolExecutor
+from engines import ENGINES
+from frontend import analyze_shared, parse_source
+from observers import RecordingObserver
+from optimizer import OptimizationPipeline
+from trace_alignment import action_signatures, align, summarize
+
+SCOPE_MODES = ('static', 'dynamic')
+_MISSING = object()
+
+
+def _result(scope_mode, error=None, observer=None, elapsed=0.0):
+    return {
+        'scope_mode': scope_mode,
+        'output': observer.outputs if observer else [],
+        'error': error,
+        'steps': observer.steps if observer else 0,
+        'elapsed': elapsed,
+        'actions': observer.actions if observer else None,
+        'trace': observer.trace if observer else None,
+    }
+
+
+def run_mode(ast, scope_mode, engine='tree', binding='deep', opt_level=1, fold=True,
+             record_actions=True, record_states=False):
+    observer = RecordingObserver(record_actions=record_actions, record_states=record_states)
+    error = None
+    start = time.perf_counter()
+    try:
+        OptimizationPipeline.for_level(opt_level, fold=fold).run(ast, scope_mode)
+        ENGINES[engine](ast, scope_mode, binding=binding, observer=observer).interpret()
+    except Exception as e:
+        error = str(e)
+    return _result(scope_mode, error, observer, time.perf_counter() - start)
+
+
+def _first_output_difference(static_output, dynamic_output):
+    for index, (static_value, dynamic_value) in enumerate(
+            zip_longest(static_output, dynamic_output, fillvalue=_MISSING)):
+        if (static_value is _MISSING or dynamic_value is _MISSING
+                or str(static_value) != str(dynamic_value)):
+            return {'index': index,
+                    'static': None if static_value is _MISSING else static_value,
+                    'dynamic': None if dynamic_value is _MISSING else dynamic_value}
+    return None
+
+
+def _actions(result):
+    return result['actions'] or []
+
+
+def _action_at(result, step):
+    return _actions(result)[step] if step is not None else None
+
+
+def divergence_summary(static, dynamic):
+    summary = summarize(align(action_signatures(_actions(static)),
+                              action_signatures(_actions(dynamic))))
+    first = summary['first_divergence']
+    if first is not None:
+        first['static_action'] = _action_at(static, first['static_step'])
+        first['dynamic_action'] = _action_at(dynamic, first['dynamic_step'])
+    first_output = _first_output_difference(static['output'], dynamic['output'])
+    summary.update({
+        'same_output': first_output is None,
+        'first_output_difference': first_output,
+        'same_error': static['error'] == dynamic['error'],
+        'diverged': (first is not None or first_output is not None
+                     or static['error'] != dynamic['error']),
+    })
+    return summary
+
+
+def compare(file_path, engine='tree', binding='deep', opt_level=1, fold=True,
+            record_states=False, executor=None):
+    try:
+        ast, static_error = analyze_shared(parse_source(file_path))
+    except Exception as e:
+        static, dynamic = _result('static', str(e)), _result('dynamic', str(e))
+    else:
+        options = dict(engine=engine, binding=binding, opt_level=opt_level, fold=fold,
+                       record_states=record_states)
+        own_executor = executor is None
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=len(SCOPE_MODES))
+        try:
+            dynamic_future = executor.submit(run_mode, ast, 'dynamic', **options)
+            if static_error is None:
+                static = executor.submit(run_mode, ast, 'static', **options).result()
+            else:
+                static = _result('static', static_error)
+            dynamic = dynamic_future.result()
+        finally:
+            if own_executor:
+                executor.shutdown()
+    return {
+        'file': file_path,
+        'static': static,
+        'dynamic': dynamic,
+        'divergence': divergence_summary(static, dynamic),
+    }
@@ -0,0 +1,29 @@
+"""
+Este módulo reúne o registro dos motores de execução, indexados pelo nome
+usado em --engine: percurso da AST (tree), percurso com especialização por tipo
+(quickening), percurso com pilha de chamadas explícita (stack), closures
+compiladas (closure) e máquina virtual de bytecode (vm). Todos recebem os
+mesmos argumentos que o Interpreter. TAIL_CALL_ENGINES lista os motores que
+aceitam tail_calls, e EXPLICIT_STACK_ENGINES os que não usam a pilha do Python
+nas chamadas e por isso alcançam o max_depth padrão. O ponto de entrada e as
+ferramentas auxiliares (comparação, execução em lote e benchmark) importam o
+registro daqui.
+"""
+
+from closure_compiler import ClosureInterpreter
+from interpreter import Interpreter
+from quickening import QuickeningInterpreter
+from stack_interpreter import StackInterpreter
+from vm import VirtualMachine
+
+ENGINES = {
+    'tree': Interpreter,
+    'closure': ClosureInterpreter,
+    'quickening': QuickeningInterpreter,
+    'stack': StackInterpreter,
+    'vm': VirtualMachine,
+}
+
+TAIL_CALL_ENGINES = ('tree', 'quickening', 'stack', 'vm')
+
+EXPLICIT_STACK_ENGINES = ('stack', 'vm')
@@ -0,0 +1,76 @@
+"""
+Este módulo agrupa as fases do frontend do interpretador: leitura do código
+fonte, análise léxica e sintática e a análise semântica e de escopo estático,
+feitas em um único percurso. Expõe funções reutilizáveis pelo ponto de entrada
+principal e pelas ferramentas auxiliares, e consulta o cache de artefatos
+(.pseudoc) para que execuções repetidas do mesmo programa não refaçam todo o
+frontend.
+"""
+
+from analyzer import ProgramAnalyzer
+from lexer import Lexer, StreamingLexer, decode_source
+from parser import Parser
+from stats import NULL_TIMER
+
+
+def parse_source(file_path, stream=False, timer=NULL_TIMER, digest=None):
+    if stream:
+        with timer.phase('lexing_parsing'), StreamingLexer(file_path, digest=digest) as lexer:
+            parser = Parser(lexer.tokens(), lexer.lines)
+            return parser.parse_program()
+
+    with timer.phase('reading'):
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        if digest is not None:
+            digest.update(data)
+        code = decode_source(data)
+
+    with timer.phase('lexing'):
+        lexer = Lexer(code)
+        tokens = lexer.get_tokens()
+
+    with timer.phase('parsing'):
+        parser = Parser(tokens, lexer.lines)
+        return parser.parse_program()
+
+
+def analyze(ast, scope_mode, timer=NULL_TIMER):
+    with timer.phase('analysis'):
+        analyzer = ProgramAnalyzer(resolve=scope_mode == 'static')
+        analyzer.visit(ast)
+    return ast
+
+
+def analyze_shared(ast):
+    # Uma única análise serve aos dois modos de escopo: as anotações do escopo
+    # estático são ignoradas no modo dinâmico, e um erro de resolução só
+    # impede a execução estática.
+    analyzer = ProgramAnalyzer(resolve=True)
+    try:
+        analyzer.visit(ast)
+    except Exception as e:
+        if analyzer.resolution_error is None or str(e) != analyzer.resolution_error:
+            raise
+        return ast, str(e)
+    return ast, None
+
+
+def load_program(file_path, scope_mode, stream=False, cache=None, timer=NULL_TIMER):
+    digest = None
+    if cache is not None:
+        with timer.phase('cache_load'):
+            ast = cache.load(cache.key_for(file_path, scope_mode))
+        if ast is not None:
+            return ast
+        digest = cache.new_digest(scope_mode)
+
+    ast = analyze(parse_source(file_path, stream=stream, timer=timer, digest=digest),
+                  scope_mode, timer=timer)
+
+    if cache is not None:
+        # A AST é gravada sob o hash dos bytes efetivamente analisados, que
+        # pode diferir do consultado acima se o fonte mudou nesse intervalo.
+        with timer.phase('cache_store'):
+            cache.store(digest.digest(), ast)
+    return ast
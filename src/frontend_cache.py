@@ -0,0 +1,141 @@
+"""
+Este módulo implementa o cache em disco dos artefatos do frontend (arquivos
+.pseudoc), de forma análoga ao __pycache__ do Python. A AST já verificada e
+resolvida é serializada em formato binário compacto (pickle comprimido com zlib)
+e indexada pelo hash do código fonte, pela versão do interpretador e pelo modo
+de escopo. As escritas são atômicas (arquivo temporário seguido de os.replace),
+cada artefato é validado ao ser carregado (cabeçalho, chave, tamanho e CRC) e o
+diretório de cache tem seu tamanho limitado, removendo os artefatos menos
+usados recentemente. A chave é calculada sobre os mesmos bytes entregues ao
+lexer (ver new_digest), de modo que uma edição do fonte durante a análise não
+associa a AST a uma chave errada. Como pickle pode executar código ao carregar
+um artefato, e o CRC não autentica nada, o cache confia em quem pode escrever
+no seu diretório: o padrão é um diretório por usuário ($XDG_CACHE_HOME ou
+~/.cache), criado apenas com permissão do dono, e um diretório passado com
+--cache-dir não deve ser gravável por outros usuários.
+"""
+
+import hashlib
+import os
+import pickle
+import struct
+import sys
+import tempfile
+import zlib
+
+FRONTEND_VERSION = 6
+CACHE_DIR_NAME = 'pseudo-interpreter'
+CACHE_SUFFIX = '.pseudoc'
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+MAGIC = b'PSDC'
+HEADER = struct.Struct('<4sH32sQI')
+
+
+def default_cache_dir():
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, CACHE_DIR_NAME)
+
+
+class FrontendCache:
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def new_digest(self, scope_mode):
+        digest = hashlib.sha256()
+        digest.update(
+            f"{FRONTEND_VERSION}:{sys.version_info[0]}.{sys.version_info[1]}:{scope_mode}:".encode())
+        return digest
+
+    def key_for(self, file_path, scope_mode):
+        digest = self.new_digest(scope_mode)
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.digest()
+
+    def path_for(self, key):
+        return os.path.join(self.directory, key.hex() + CACHE_SUFFIX)
+
+    def load(self, key):
+        path = self.path_for(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        ast = self._decode(data, key)
+        if ast is None:
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return ast
+
+    def store(self, key, ast):
+        directory = self.directory
+        try:
+            payload = zlib.compress(pickle.dumps(
+                ast, protocol=pickle.HIGHEST_PROTOCOL))
+        except (RecursionError, pickle.PicklingError):
+            return False
+        header = HEADER.pack(MAGIC, FRONTEND_VERSION, key,
+                             len(payload), zlib.crc32(payload))
+        try:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=directory, prefix='.tmp-', suffix=CACHE_SUFFIX)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(header)
+                    f.write(payload)
+                os.replace(tmp_path, self.path_for(key))
+            except BaseException:
+                self._remove(tmp_path)
+                raise
+        except OSError:
+            return False
+        self.evict(directory)
+        return True
+
+    def evict(self, directory):
+        entries = []
+        total = 0
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.name.endswith(CACHE_SUFFIX) and not entry.name.startswith('.'):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                        total += stat.st_size
+        except OSError:
+            return
+        entries.sort()
+        for _, size, path in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def _decode(self, data, key):
+        if len(data) < HEADER.size:
+            return None
+        magic, version, stored_key, length, crc = HEADER.unpack_from(data)
+        payload = data[HEADER.size:]
+        if magic != MAGIC or version != FRONTEND_VERSION or stored_key != key:
+            return None
+        if len(payload) != length or zlib.crc32(payload) != crc:
+            return None
+        try:
+            return pickle.loads(zlib.decompress(payload))
+        except Exception:
+            return None
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
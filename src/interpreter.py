@@ -1,69 +1,70 @@
 """
-Este módulo implementa o interpretador principal que executa a AST do programa. 
-Suporta dois modos de escopo: estático (léxico) e dinâmico. Gerencia uma pilha 
-de chamadas de funções, resolve referências de variáveis segundo as regras do 
-modo de escopo escolhido, e executa operações como atribuições, chamadas de 
-função e expressões aritméticas. Inclui visualização rica da pilha de execução 
-e logging em JSON para análise posterior do comportamento do programa.
+Este módulo implementa o interpretador principal que executa a AST do programa.
+Suporta dois modos de escopo: estático (léxico) e dinâmico. Gerencia uma pilha
+de chamadas de funções, resolve referências de variáveis segundo as regras do
+modo de escopo escolhido (por endereço léxico no estático; por busca na cadeia
+de registros ou vinculação rasa no dinâmico) e executa atribuições, chamadas de
+função e expressões aritméticas. Cada etapa é notificada a um observador (ver
+observers.py). Os demais motores de execução herdam deste interpretador.
 """
 
 from ast_nodes import *
-from call_stack import CallStack, ActivationRecord
+from call_stack import CallStack, ActivationRecord, ShallowBindingTable, format_call_chain
 from symbol_table import SymbolTable
-from rich.console import Console, Group
-from rich.table import Table
-from rich.panel import Panel
-from rich import box
-from rich.live import Live
-from rich.align import Align
-from time import sleep
-import json
+from observers import ExecutionObserver, JsonLogObserver
+
+
+DEFAULT_MAX_DEPTH = 10000
+
+OPERAND_TYPE_NAMES = {int: 'int', float: 'float', str: 'char', type(None): 'no value'}
+
+
+class PseudoRuntimeError(Exception):
+    pass
+
+
+def operand_error(op, left, right):
+    # Os tipos dos operandos são verificados estaticamente, mas um nome pode
+    # se referir a outra variável no escopo dinâmico, ou a uma global ainda
+    # sem valor; a falha é então um erro do programa, e não do interpretador.
+    left_type = OPERAND_TYPE_NAMES.get(type(left), type(left).__name__)
+    right_type = OPERAND_TYPE_NAMES.get(type(right), type(right).__name__)
+    return PseudoRuntimeError(
+        f"Runtime error: unsupported operand types for '{op}': {left_type} and {right_type}")
 
 
 class Interpreter:
-    def __init__(self, ast, scope_mode, json_log_file=None):
+    DEFAULT_VALUES = {'int': 0, 'float': 0.0, 'char': '\0'}
+
+    def __init__(self, ast, scope_mode, json_log_file=None, binding='deep', observer=None,
+                 max_depth=DEFAULT_MAX_DEPTH, tail_calls=False):
         self.ast = ast
         self.scope_mode = scope_mode
+        self.max_depth = max_depth
+        self.tail_calls = tail_calls
+        self.pending_tail_call = None
         self.call_stack = CallStack()
+        self.shallow_bindings = ShallowBindingTable() if (
+            scope_mode == 'dynamic' and binding == 'shallow') else None
         self.global_scope = SymbolTable(name="global")
-        self.json_log_file = json_log_file
-        if json_log_file:
-            with open(json_log_file, 'w') as f:
-                f.write('')
+        self.global_slots = []
+        if observer is None:
+            observer = JsonLogObserver(
+                json_log_file) if json_log_file else ExecutionObserver()
+        self.observer = observer
+        self.observes_state = observer.observes_state
+        self.observes_calls = observer.observes_calls
         self._setup_global_scope()
 
-    def _log_json_state(self, action, output=None):
-        if not self.json_log_file:
-            return
-        stack = []
-        for ar in self.call_stack.stack:
-            stack.append({
-                'name': ar.name,
-                'scope_type': ar.scope_type,
-                'parent': ar.parent_frame.name if ar.parent_frame else None,
-                'lex_parent': ar.lex_parent_frame.name if ar.lex_parent_frame else None,
-                'locals': ar.locals.copy()
-            })
-        global_vars = {}
-        for k, v in self.global_scope.symbols.items():
-            if 'value' in v:
-                global_vars[k] = v['value']
-        log_entry = {
-            'action': action,
-            'scope_mode': self.scope_mode,
-            'call_stack': stack,
-            'global_scope': global_vars
-        }
-        if output is not None:
-            log_entry['output'] = output
-        with open(self.json_log_file, 'a') as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + '\n')
+    def _notify(self, action):
+        self.observer.on_state(self, action)
 
     def _setup_global_scope(self):
         for declaration in self.ast.declarations:
             if isinstance(declaration, VarDeclNode):
-                self.global_scope.insert(declaration.var_name, {
-                                         'type': declaration.var_type, 'value': None})
+                global_var_info = {'type': declaration.var_type, 'value': None}
+                self.global_scope.insert(declaration.var_name, global_var_info)
+                self.global_slots.append(global_var_info)
             elif isinstance(declaration, FunctionDefNode):
                 self.global_scope.insert(declaration.name, {
                     'type': 'function',
@@ -84,17 +85,27 @@ class Interpreter:
             name='main',
             scope_type=self.scope_mode,
             parent_frame=None,
-            lex_parent_frame=self.global_scope if self.scope_mode == 'static' else None
+            lex_parent_frame=self.global_scope if self.scope_mode == 'static' else None,
+            frame_size=(main_func_node.frame_size or 0) if self.scope_mode == 'static' else 0
         )
         self.call_stack.push(main_frame)
 
-        self._print_call_stack_state("Program Start")
+        self._notify("Program Start")
+        if self.observes_calls:
+            self.observer.on_call(self, 'main')
 
-        self.visit(main_func_node.body)
+        try:
+            self._execute_body(main_func_node)
+        except RecursionError:
+            raise self._stack_overflow(
+                f"Python recursion limit reached at call depth {len(self.call_stack.stack)} "
+                "(the 'stack' and 'vm' engines do not have this limit)") from None
 
-        self.call_stack.pop()
+        self._pop_frame(main_frame)
 
-        self._print_call_stack_state("Program End")
+        if self.observes_calls:
+            self.observer.on_return(self, 'main')
+        self._notify("Program End")
 
     def visit(self, node):
         method_name = f'visit_{type(node).__name__}'
@@ -114,26 +125,35 @@ class Interpreter:
     def visit_VarDeclNode(self, node):
         current_frame = self.call_stack.peek()
         if current_frame:
-            if node.var_type == 'int':
-                current_frame.set_local(node.var_name, 0)
-            elif node.var_type == 'float':
-                current_frame.set_local(node.var_name, 0.0)
-            elif node.var_type == 'char':
-                current_frame.set_local(node.var_name, '\0')
+            default_value = self.DEFAULT_VALUES.get(node.var_type)
+            if self.scope_mode == 'static' and node.slot is not None:
+                current_frame.set_slot(node.slot, node.var_name, default_value)
+            elif self.shallow_bindings:
+                self.shallow_bindings.bind(
+                    current_frame, node.var_name, default_value)
             else:
-                current_frame.set_local(node.var_name, None)
+                current_frame.set_local(node.var_name, default_value)
 
     def visit_AssignNode(self, node):
-        identifier_name = node.identifier.name
         value_to_assign = self.visit(node.expression)
+        self._assign(node.identifier, value_to_assign)
 
+    def _assign(self, identifier, value_to_assign):
+        identifier_name = identifier.name
         found_variable_location = False
-        target_ar = None
-        target_scope = None
 
         current_frame = self.call_stack.peek()
+        address = identifier.address
 
-        if self.scope_mode == 'static':
+        if self.scope_mode == 'static' and address is not None:
+            depth, slot = address
+            if depth == 0:
+                current_frame.set_slot(slot, identifier_name, value_to_assign)
+            else:
+                self.global_slots[slot]['value'] = value_to_assign
+            found_variable_location = True
+
+        elif self.scope_mode == 'static':
             if current_frame and identifier_name in current_frame.locals:
                 current_frame.set_local(identifier_name, value_to_assign)
                 found_variable_location = True
@@ -144,6 +164,18 @@ class Interpreter:
                     global_var_info['value'] = value_to_assign
                     found_variable_location = True
 
+        elif self.shallow_bindings:
+            binding_frame = self.shallow_bindings.lookup(identifier_name)
+            if binding_frame:
+                binding_frame.set_local(identifier_name, value_to_assign)
+                found_variable_location = True
+            else:
+                global_var_info = self.global_scope.lookup_current_scope(
+                    identifier_name)
+                if global_var_info and global_var_info['type'] != 'function':
+                    global_var_info['value'] = value_to_assign
+                    found_variable_location = True
+
         elif self.scope_mode == 'dynamic':
             temp_frame = current_frame
             while temp_frame:
@@ -163,10 +195,27 @@ class Interpreter:
             raise Exception(
                 f"Assignment error: Variable '{identifier_name}' not found or cannot be assigned.")
 
-        self._print_call_stack_state(
-            f"Assignment: {identifier_name} = {value_to_assign}")
+        if self.observes_state:
+            self._notify(f"Assignment: {identifier_name} = {value_to_assign}")
 
     def visit_CallNode(self, node):
+        if node.tail and self.tail_calls:
+            self.pending_tail_call = self._begin_tail_call(node)
+            return
+        call = self._begin_call(node)
+        if call is None:
+            return
+        func_node, new_frame = call
+
+        self._execute_body(func_node)
+        while self.pending_tail_call is not None:
+            func_node = self.pending_tail_call
+            self.pending_tail_call = None
+            self._execute_body(func_node)
+
+        self._end_call(self.call_stack.stack[-1])
+
+    def _begin_call(self, node):
         func_name = node.function_name.name
         func_info = self.global_scope.lookup(func_name)
 
@@ -175,40 +224,125 @@ class Interpreter:
 
         if func_info['type'] == 'builtin_function' and func_name == 'print':
             self._handle_print(node.args)
-            return
+            return None
 
         func_node = func_info['node']
 
         evaluated_args = [self.visit(arg_node) for arg_node in node.args]
 
+        new_frame = self._create_frame(
+            func_name, func_info, func_node, evaluated_args)
+
+        self.call_stack.push(new_frame)
+        if self.observes_state:
+            self._notify(f"Function Call: {func_name}")
+        if self.observes_calls:
+            self.observer.on_call(self, func_name)
+        return func_node, new_frame
+
+    def _begin_tail_call(self, node):
+        func_name = node.function_name.name
+        func_info = self.global_scope.lookup(func_name)
+
+        if not func_info:
+            raise Exception(f"Call error: Function '{func_name}' not defined.")
+
+        func_node = func_info['node']
+        evaluated_args = [self.visit(arg_node) for arg_node in node.args]
+        self._replace_frame(func_name, func_info, func_node, evaluated_args)
+        return func_node
+
+    def _replace_frame(self, func_name, func_info, func_node, evaluated_args):
+        # No escopo estático o registro de quem chama é trocado pelo da função
+        # chamada, que só enxerga os globais. No dinâmico ele é reaproveitado:
+        # os parâmetros são vinculados sobre os locais de quem chama, que
+        # continuam visíveis na mesma ordem de busca, já que quem chama não
+        # executa mais nada.
+        frame = self.call_stack.stack[-1]
+        caller_name = frame.name
+        if self.scope_mode == 'static':
+            self._pop_frame(frame)
+            frame = self._create_frame(func_name, func_info, func_node, evaluated_args)
+            self.call_stack.push(frame)
+        else:
+            if len(func_node.params) != len(evaluated_args):
+                raise Exception(
+                    f"Function call error: '{func_name}' expects {len(func_node.params)} arguments, but got {len(evaluated_args)}.")
+            frame.name = func_name
+            for param, value in zip(func_node.params, evaluated_args):
+                if self.shallow_bindings:
+                    self.shallow_bindings.bind(frame, param.var_name, value)
+                else:
+                    frame.set_local(param.var_name, value)
+        if self.observes_state:
+            self._notify(f"Tail Call: {func_name} (elides {caller_name})")
+        if self.observes_calls:
+            self.observer.on_return(self, caller_name)
+            self.observer.on_call(self, func_name)
+        return frame
+
+    def _end_call(self, frame):
+        self._pop_frame(frame)
+        if self.observes_state:
+            self._notify(f"Function Return: {frame.name}")
+        if self.observes_calls:
+            self.observer.on_return(self, frame.name)
+
+    def _stack_overflow(self, reason, callee=None):
+        names = [frame.name for frame in self.call_stack.stack]
+        if callee is not None:
+            names.append(callee)
+        return Exception(f"Stack overflow: {reason}. Call chain: {format_call_chain(names)}")
+
+    def _check_depth(self, func_name):
+        if len(self.call_stack.stack) >= self.max_depth:
+            raise self._stack_overflow(
+                f"maximum call depth of {self.max_depth} exceeded", func_name)
+
+    def _create_frame(self, func_name, func_info, func_node, evaluated_args):
+        self._check_depth(func_name)
         current_frame = self.call_stack.peek()
 
         new_frame = ActivationRecord(
             name=func_name,
             scope_type=self.scope_mode,
             parent_frame=current_frame if self.scope_mode == 'dynamic' else None,
-            lex_parent_frame=func_info['closure_scope'] if self.scope_mode == 'static' else None
+            lex_parent_frame=func_info['closure_scope'] if self.scope_mode == 'static' else None,
+            frame_size=(func_node.frame_size or 0) if self.scope_mode == 'static' else 0
         )
 
         if len(func_node.params) != len(evaluated_args):
             raise Exception(
                 f"Function call error: '{func_name}' expects {len(func_node.params)} arguments, but got {len(evaluated_args)}.")
         for i, param in enumerate(func_node.params):
-            new_frame.set_local(param.var_name, evaluated_args[i])
-
-        self.call_stack.push(new_frame)
-        self._print_call_stack_state(f"Function Call: {func_name}")
+            if self.scope_mode == 'static' and param.slot is not None:
+                new_frame.set_slot(param.slot, param.var_name, evaluated_args[i])
+            elif self.shallow_bindings:
+                self.shallow_bindings.bind(
+                    new_frame, param.var_name, evaluated_args[i])
+            else:
+                new_frame.set_local(param.var_name, evaluated_args[i])
+        return new_frame
 
+    def _execute_body(self, func_node):
         self.visit(func_node.body)
 
+    def _pop_frame(self, frame):
         self.call_stack.pop()
-        self._print_call_stack_state(f"Function Return: {func_name}")
+        if self.shallow_bindings:
+            self.shallow_bindings.release(frame)
 
     def visit_IdentifierNode(self, node):
         identifier_name = node.name
         value = None
 
-        if self.scope_mode == 'static':
+        if self.scope_mode == 'static' and node.address is not None:
+            depth, slot = node.address
+            if depth == 0:
+                return self.call_stack.stack[-1].slots[slot]
+            return self.global_slots[slot]['value']
+
+        elif self.scope_mode == 'static':
             current_ar_or_scope = self.call_stack.peek()
             if not current_ar_or_scope:
                 current_ar_or_scope = self.global_scope
@@ -235,6 +369,18 @@ class Interpreter:
             raise Exception(
                 f"Static Scope Error: Undefined variable '{identifier_name}'.")
 
+        elif self.shallow_bindings:
+            binding_frame = self.shallow_bindings.lookup(identifier_name)
+            if binding_frame:
+                return binding_frame.locals[identifier_name]
+
+            global_var_info = self.global_scope.lookup_current_scope(
+                identifier_name)
+            if global_var_info and global_var_info['type'] != 'function':
+                return global_var_info['value']
+            raise Exception(
+                f"Dynamic Scope Error: Undefined variable '{identifier_name}'.")
+
         elif self.scope_mode == 'dynamic':
             temp_frame = self.call_stack.peek()
             while temp_frame:
@@ -262,78 +408,32 @@ class Interpreter:
         return node.value
 
     def visit_PrintNode(self, node):
-        value = self.visit(node.expression)
-        print(f"OUTPUT: {value}")
-        self._log_json_state(f"Print statement: {value}", output=value)
-        self._print_call_stack_state(f"Print statement: {value}")
+        self._output(self.visit(node.expression))
+
+    def _output(self, value):
+        if not self.observes_state:
+            self.observer.on_output(self, value)
+            return
+        self.observer.on_output(self, value, f"Print statement: {value}")
+        self._notify(f"Print statement: {value}")
 
     def _handle_print(self, args):
         if not args:
-            print("OUTPUT: (empty line)")
+            self.observer.on_output(self, "(empty line)")
             return
         value_to_print = self.visit(args[0])
-        print(f"OUTPUT: {value_to_print}")
+        self.observer.on_output(self, value_to_print)
         # but you can add it if desired.
-        # self._print_call_stack_state(f"Built-in Print: {value_to_print}")
-
-    def _print_call_stack_state(self, action):
-        self._log_json_state(action)
-        console = Console()
-        console.rule()
-        if action.startswith("Function Call") or action.startswith("Function Return"):
-            with Live(refresh_per_second=10, console=console, transient=True) as live:
-                for i in range(3):
-                    live.update(
-                        Panel(f"[bold green]{action}{'.' * (i+1)}", border_style="green"))
-                    sleep(0.08)
-        else:
-            console.rule(f"[bold cyan]{action}")
-        stack_panels = []
-        for i, ar in enumerate(reversed(self.call_stack.stack)):
-            lex_parent_name = ar.lex_parent_frame.name if ar.lex_parent_frame else "None"
-            parent_name = ar.parent_frame.name if ar.parent_frame else "None"
-            locals_table = Table(
-                box=box.MINIMAL, show_header=True, header_style="bold blue")
-            locals_table.add_column("Local", style="bold yellow")
-            locals_table.add_column("Value", style="white")
-            if ar.locals:
-                for k, v in ar.locals.items():
-                    locals_table.add_row(k, repr(v))
-            else:
-                locals_table.add_row("(empty)", "-")
-            panel = Panel(
-                locals_table, title=f"[bold magenta]{ar.name}[/] (type={ar.scope_type}, lex={lex_parent_name}, parent={parent_name})", border_style="magenta")
-            stack_panels.append(panel)
-        if stack_panels:
-            stack_render = Group(*stack_panels)
-            console.print(
-                Panel(stack_render, title="[bold]Call Stack (Top → Base)", border_style="cyan"))
-        else:
-            console.print(
-                Panel("(empty)", title="Call Stack", border_style="cyan"))
-        global_table = Table(title="Global Scope",
-                             box=box.SIMPLE, show_lines=True, expand=True)
-        global_table.add_column("Name", style="bold yellow")
-        global_table.add_column("Value", style="white")
-        global_vars_display = {}
-        for k, v in self.global_scope.symbols.items():
-            if 'value' in v:
-                global_vars_display[k] = v['value']
-        if global_vars_display:
-            for k, v in global_vars_display.items():
-                global_table.add_row(k, repr(v))
-        else:
-            global_table.add_row("(empty)", "-")
-        console.print(Panel(
-            global_table, title="🌎 [bold blue]Global Scope[/]", border_style="blue", padding=(1, 2)))
-        console.rule()
+        # self._notify(f"Built-in Print: {value_to_print}")
 
     def visit_BinaryOpNode(self, node):
         left = self.visit(node.left)
         right = self.visit(node.right)
-        if node.op == '+':
-            return left + right
-        elif node.op == '-':
-            return left - right
-        else:
-            raise Exception(f"Unsupported binary operator: {node.op}")
+        try:
+            if node.op == '+':
+                return left + right
+            elif node.op == '-':
+                return left - right
+        except TypeError:
+            raise operand_error(node.op, left, right) from None
+        raise Exception(f"Unsupported binary operator: {node.op}")
@@ -1,24 +1,72 @@
 """
-Este módulo implementa o analisador léxico (lexer) do interpretador. É responsável 
-por dividir o código fonte em tokens, reconhecendo palavras-chave, identificadores, 
-literais numéricos (inteiros e floats), literais de caracteres, operadores e 
-delimitadores. Remove comentários e espaços em branco durante o processo de tokenização. 
-Define a classe Token para representar os tokens e a classe Lexer que implementa 
-o algoritmo de análise léxica usando expressões regulares.
+Este módulo implementa o analisador léxico (lexer) do interpretador. É responsável
+por dividir o código fonte em tokens, reconhecendo palavras-chave, identificadores,
+literais numéricos (inteiros e floats), literais de caracteres, operadores e
+delimitadores. Remove comentários e espaços em branco durante o processo de tokenização.
+Define a classe Token para representar os tokens e a classe Lexer que implementa
+o algoritmo de análise léxica usando uma única expressão regular pré-compilada
+(alternância de grupos nomeados), além da tabela de deslocamentos de linha usada
+para reportar linha:coluna de tokens e erros. A classe StreamingLexer percorre um
+mapeamento em memória (mmap) do arquivo fonte e produz os tokens sob demanda, para
+que programas muito grandes não precisem ser carregados inteiros na memória. Os
+blocos do arquivo são decodificados incrementalmente, com a mesma tradução de
+fins de linha da leitura em modo texto, e cada trecho de linhas completas é
+analisado pela mesma expressão regular do Lexer, de modo que os tokens, as
+posições e as colunas (em caracteres) coincidem com os da leitura completa.
 """
 
+import codecs
+import io
+import mmap
 import re
+import sys
+from bisect import bisect_right
+
+SOURCE_ENCODING = 'utf-8'
+
+
+def source_decoder(encoding=SOURCE_ENCODING):
+    return io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder(encoding)(), translate=True)
+
+
+def decode_source(data, encoding=SOURCE_ENCODING):
+    return source_decoder(encoding).decode(data, final=True)
 
 
 class Token:
-    def __init__(self, type, value):
+    __slots__ = ('type', 'value', 'pos')
+
+    def __init__(self, type, value, pos=None):
         self.type = type
         self.value = value
+        self.pos = pos
 
     def __repr__(self):
         return f"Token({self.type}, {self.value})"
 
 
+class LineTable:
+    def __init__(self, text=None):
+        self.line_starts = [0]
+        if text is not None:
+            self.line_starts.extend(
+                m.end() for m in re.finditer('\n', text))
+
+    def add_line_start(self, offset):
+        self.line_starts.append(offset)
+
+    def locate(self, pos):
+        line = bisect_right(self.line_starts, pos)
+        return line, pos - self.line_starts[line - 1] + 1
+
+    def format(self, pos):
+        if pos is None:
+            return "end of input"
+        line, column = self.locate(pos)
+        return f"line {line}, column {column}"
+
+
 class Lexer:
     KEYWORDS = ['int', 'float', 'char', 'def', 'print']
     OPERATORS = ['=', '+', '-']
@@ -35,54 +83,158 @@ class Lexer:
         ('DELIMITER', r'[{}(),;]'),
     ]
 
+    MASTER_PATTERN = re.compile('|'.join(
+        f'(?P<{name}>{pattern})' for name, pattern in TOKEN_SPECIFICATIONS))
+
+    KEYWORD_TYPES = {keyword: keyword.upper() for keyword in KEYWORDS}
+
     def __init__(self, text):
         self.text = text
         self.position = 0
+        self.lines = LineTable(text)
         self.tokens = []
         self._tokenize()
 
     def _tokenize(self):
-        token_patterns = [(name, re.compile(pattern))
-                          for name, pattern in self.TOKEN_SPECIFICATIONS]
-
-        while self.position < len(self.text):
-            match = None
-            for token_type, pattern in token_patterns:
-                m = pattern.match(self.text, self.position)
-                if m:
-                    value = m.group(0)
-                    if token_type == 'WHITESPACE' or token_type == 'COMMENT':
-                        pass
-                    elif token_type == 'IDENTIFIER':
-                        if value in self.KEYWORDS:
-                            self.tokens.append(Token(value.upper(), value))
-                        else:
-                            self.tokens.append(Token('ID', value))
-                    elif token_type == 'INTEGER':
-                        self.tokens.append(Token('INT_LITERAL', int(value)))
-                    elif token_type == 'FLOAT':
-                        self.tokens.append(
-                            Token('FLOAT_LITERAL', float(value)))
-                    elif token_type == 'CHAR':
-                        self.tokens.append(Token('CHAR_LITERAL', value[1]))
-                    elif token_type == 'OPERATOR':
-                        self.tokens.append(Token(value, value))
-                    elif token_type == 'DELIMITER':
-                        self.tokens.append(Token(value, value))
-                    else:
-                        raise Exception(f"Unknown token type: {token_type}")
-                    self.position = m.end(0)
-                    match = True
-                    break
-            if not match:
+        text = self.text
+        end = len(text)
+        match = self.MASTER_PATTERN.match
+        keyword_types = self.KEYWORD_TYPES
+        append = self.tokens.append
+        intern = sys.intern
+        position = 0
+
+        while position < end:
+            m = match(text, position)
+            if not m:
+                self.position = position
                 raise Exception(
-                    f"Lexer error: Unexpected character at position {self.position}: '{self.text[self.position]}'")
-        self.tokens.append(Token('EOF', None))
+                    f"Lexer error: Unexpected character at {self.lines.format(position)}: '{text[position]}'")
+            token_type = m.lastgroup
+            if token_type == 'IDENTIFIER':
+                value = intern(m.group())
+                append(Token(keyword_types.get(value, 'ID'), value, position))
+            elif token_type == 'WHITESPACE' or token_type == 'COMMENT':
+                pass
+            elif token_type == 'INTEGER':
+                append(Token('INT_LITERAL', int(m.group()), position))
+            elif token_type == 'FLOAT':
+                append(Token('FLOAT_LITERAL', float(m.group()), position))
+            elif token_type == 'CHAR':
+                append(Token('CHAR_LITERAL', text[position + 1], position))
+            elif token_type == 'OPERATOR' or token_type == 'DELIMITER':
+                value = m.group()
+                append(Token(value, value, position))
+            else:
+                raise Exception(f"Unknown token type: {token_type}")
+            position = m.end()
+        self.position = position
+        self.tokens.append(Token('EOF', None, position))
 
     def get_tokens(self):
         return self.tokens
 
 
+class StreamingLexer:
+    BLOCK_SIZE = 1 << 16
+
+    def __init__(self, file_path, encoding=SOURCE_ENCODING, digest=None):
+        self.file_path = file_path
+        self.encoding = encoding
+        self.digest = digest
+        self.position = 0
+        self.lines = LineTable()
+        self._file = open(file_path, 'rb')
+        try:
+            self._buffer = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._buffer = b''
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._buffer = b''
+        self._file.close()
+
+    def _decoded_chunks(self):
+        # Decodifica o arquivo em blocos, com a mesma tradução de fins de linha
+        # do modo texto, e produz pares (trecho, final) em que todo trecho não
+        # final termina em uma quebra de linha. Os blocos lidos atualizam o
+        # digest, quando dado (ver frontend_cache.py).
+        buffer = self._buffer
+        decoder = source_decoder(self.encoding)
+        pending = ''
+        for start in range(0, len(buffer), self.BLOCK_SIZE):
+            block = buffer[start:start + self.BLOCK_SIZE]
+            if self.digest is not None:
+                self.digest.update(block)
+            pending += decoder.decode(block)
+            cut = pending.rfind('\n') + 1
+            if cut:
+                yield pending[:cut], False
+                pending = pending[cut:]
+        yield pending + decoder.decode(b'', final=True), True
+
+    def tokens(self):
+        match = Lexer.MASTER_PATTERN.match
+        keyword_types = Lexer.KEYWORD_TYPES
+        add_line_start = self.lines.add_line_start
+        intern = sys.intern
+        offset = 0
+        text = ''
+        position = 0
+
+        for chunk, final in self._decoded_chunks():
+            chunk_start = offset + len(text)
+            newline = chunk.find('\n')
+            while newline != -1:
+                add_line_start(chunk_start + newline + 1)
+                newline = chunk.find('\n', newline + 1)
+            offset += position
+            text = text[position:] + chunk
+            position = 0
+            end = len(text)
+
+            while position < end:
+                m = match(text, position)
+                if not m:
+                    # Um literal de caractere pode conter uma quebra de linha e
+                    # terminar no trecho seguinte.
+                    if text[position] == "'" and not final:
+                        break
+                    self.position = offset + position
+                    raise Exception(
+                        f"Lexer error: Unexpected character at "
+                        f"{self.lines.format(offset + position)}: '{text[position]}'")
+                token_type = m.lastgroup
+                if token_type == 'IDENTIFIER':
+                    value = intern(m.group())
+                    yield Token(keyword_types.get(value, 'ID'), value, offset + position)
+                elif token_type == 'WHITESPACE' or token_type == 'COMMENT':
+                    pass
+                elif token_type == 'INTEGER':
+                    yield Token('INT_LITERAL', int(m.group()), offset + position)
+                elif token_type == 'FLOAT':
+                    yield Token('FLOAT_LITERAL', float(m.group()), offset + position)
+                elif token_type == 'CHAR':
+                    yield Token('CHAR_LITERAL', text[position + 1], offset + position)
+                elif token_type == 'OPERATOR' or token_type == 'DELIMITER':
+                    value = m.group()
+                    yield Token(value, value, offset + position)
+                else:
+                    raise Exception(f"Unknown token type: {token_type}")
+                position = m.end()
+        self.position = offset + position
+        yield Token('EOF', None, self.position)
+
+
 if __name__ == '__main__':
     code = """
     int x;
@@ -98,4 +250,4 @@ if __name__ == '__main__':
     """
     lexer = Lexer(code)
     for token in lexer.get_tokens():
-        print(token)
+        print(token, lexer.lines.format(token.pos))
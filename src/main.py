@@ -1,68 +1,224 @@
 """
-Este módulo é o ponto de entrada principal do interpretador. Coordena todas as 
-fases de compilação e interpretação: análise léxica, sintática e semântica, 
-resolução de escopo estático (quando aplicável) e interpretação final. Aceita 
-argumentos de linha de comando para especificar o arquivo de código fonte, 
-modo de escopo (estático ou dinâmico) e arquivo de log opcional. Gerencia 
-o fluxo completo de execução e tratamento de erros.
+Este módulo é o ponto de entrada principal do interpretador. Coordena todas as
+fases de compilação e interpretação: frontend (lido do cache .pseudoc quando
+possível), pipeline de otimizações e execução pelo motor escolhido com
+--engine. A renderização da pilha, o log JSON, a saída do programa, as
+estatísticas (--stats) e o profiler (--profile) são observadores da execução.
+Gerencia o fluxo completo de execução e tratamento de erros: um erro do
+programa termina com código de saída 1, e erros internos mostram o traceback.
 """
 
+import argparse
+import json
+import os
 import sys
-from lexer import Lexer
-from parser import Parser
-from interpreter import Interpreter
-from scope_resolver import StaticScopeResolver
-from semantic_checker import SemanticChecker
+import traceback
+from frontend import load_program
+from frontend_cache import FrontendCache
+from bytecode import BytecodeCompiler, disassemble_program
+from engines import ENGINES, EXPLICIT_STACK_ENGINES, TAIL_CALL_ENGINES
+from interpreter import DEFAULT_MAX_DEPTH, PseudoRuntimeError
+from observers import CompositeObserver, build_observer
+from optimizer import OptimizationPipeline
+from profiler import PseudoProfiler
+from stats import (INSTRUMENTED_ENGINES, NULL_TIMER, ExecutionStats, PhaseTimer, StatsObserver,
+                   instrumented, timed_observer)
+from trace_format import DEFAULT_KEYFRAME_INTERVAL
+from trace_writer import DEFAULT_BUFFER_SIZE
 
 
-def run_simulation(file_path, scope_mode, json_log_file=None):
+def _is_program_error(error):
+    return type(error) is Exception or isinstance(error, (PseudoRuntimeError, RecursionError))
+
+
+def _trace_bytes(json_log_file):
     try:
-        with open(file_path, 'r') as f:
-            code = f.read()
+        return os.path.getsize(json_log_file) if json_log_file else None
+    except OSError:
+        return None
 
+
+def run_simulation(file_path, scope_mode, json_log_file=None, stream=False, cache=None,
+                   binding='deep', opt_level=1, fold=True, engine='tree', disassemble=False,
+                   render=False, quiet=False, log_buffer_size=DEFAULT_BUFFER_SIZE,
+                   trace_format='full', keyframe_interval=DEFAULT_KEYFRAME_INTERVAL,
+                   trace_codec='zlib', stats_file=None, profile_file=None,
+                   profile_collapsed_file=None, max_depth=DEFAULT_MAX_DEPTH, tail_calls=False):
+    timer = PhaseTimer() if stats_file else NULL_TIMER
+    profiler = None
+    execution_stats = ExecutionStats() if stats_file else None
+    observer = None
+    error = None
+    try:
         print(
             f"Running simulation for '{file_path}' with {scope_mode.upper()} Scope.\n")
+        if tail_calls and engine not in TAIL_CALL_ENGINES:
+            raise Exception(f"Tail calls are not supported by the '{engine}' engine.")
 
-        lexer = Lexer(code)
-        tokens = lexer.get_tokens()
+        ast = load_program(file_path, scope_mode, stream=stream, cache=cache, timer=timer)
 
-        parser = Parser(tokens)
-        ast = parser.parse_program()
+        with timer.phase('optimization'):
+            pipeline = OptimizationPipeline.for_level(opt_level, fold=fold)
+            for optimization, count in pipeline.run(ast, scope_mode):
+                if count:
+                    print(optimization.report(count))
 
-        semantic_analyzer = SemanticChecker()
-        semantic_analyzer.visit(ast)
-
-        if scope_mode == 'static':
-            static_resolver = StaticScopeResolver()
-            static_resolver.visit(ast)
+        if disassemble:
+            print(disassemble_program(
+                BytecodeCompiler(scope_mode).compile_program(ast)))
+            print()
 
         print(f"--- Starting Interpreter with {scope_mode.upper()} Scope ---")
-        interpreter = Interpreter(ast, scope_mode, json_log_file=json_log_file)
-        interpreter.interpret()
+        observer = build_observer(json_log_file, output=not quiet,
+                                  render=render,
+                                  log_buffer_size=log_buffer_size,
+                                  trace_format=trace_format,
+                                  keyframe_interval=keyframe_interval,
+                                  trace_codec=trace_codec)
+        if profile_file or profile_collapsed_file:
+            profiler = PseudoProfiler()
+            observer = CompositeObserver([profiler, observer])
+        engine_class = ENGINES[engine]
+        engine_options = {'tail_calls': True} if tail_calls else {}
+        if execution_stats is not None:
+            observer = CompositeObserver(
+                [StatsObserver(execution_stats), timed_observer(observer, timer)])
+            if engine in INSTRUMENTED_ENGINES:
+                engine_class = instrumented(engine_class)
+                engine_options['stats'] = execution_stats
+        with timer.phase('engine_setup'):
+            interpreter = engine_class(
+                ast, scope_mode, binding=binding, observer=observer, max_depth=max_depth,
+                **engine_options)
+        with timer.phase('interpretation'):
+            interpreter.interpret()
         print(f"--- Interpreter Finished for {scope_mode.upper()} Scope ---")
 
     except Exception as e:
+        error = e
         print(f"An error occurred: {e}")
+        if not _is_program_error(e):
+            traceback.print_exc()
+    finally:
+        if observer is not None:
+            try:
+                observer.close()
+            except Exception as e:
+                error = error or e
+                print(f"An error occurred while writing the log: {e}")
+    if profiler is not None:
+        if profile_collapsed_file:
+            profiler.write_collapsed(profile_collapsed_file)
+        if profile_file == '-':
+            print(profiler.report(), file=sys.stderr)
+        elif profile_file:
+            with open(profile_file, 'w') as f:
+                f.write(profiler.report() + "\n")
+    if stats_file:
+        report = {
+            'file': file_path,
+            'scope_mode': scope_mode,
+            'engine': engine,
+            'binding': binding,
+            'opt_level': opt_level,
+            'status': 'ok' if error is None else 'error',
+            'error': None if error is None else str(error),
+            'phases': timer.phases,
+            'counters': execution_stats.as_dict(instrumented=engine in INSTRUMENTED_ENGINES),
+            'trace_bytes': _trace_bytes(json_log_file),
+        }
+        if stats_file == '-':
+            print(json.dumps(report, indent=2), file=sys.stderr)
+        else:
+            with open(stats_file, 'w') as f:
+                json.dump(report, f, indent=2)
+                f.write("\n")
+    return error is None
+
+
+def build_arg_parser():
+    arg_parser = argparse.ArgumentParser(
+        description="Interpretador com escopo estático ou dinâmico.")
+    arg_parser.add_argument('file_path', help='Arquivo de código fonte (.pseudo)')
+    scope_group = arg_parser.add_mutually_exclusive_group(required=True)
+    scope_group.add_argument('--static', dest='scope_mode', action='store_const',
+                             const='static', help='Usa escopo estático')
+    scope_group.add_argument('--dynamic', dest='scope_mode', action='store_const',
+                             const='dynamic', help='Usa escopo dinâmico')
+    arg_parser.add_argument('--json-log', dest='json_log_file', default=None,
+                            help='Arquivo JSONL onde o estado de cada etapa é registrado')
+    arg_parser.add_argument('--log-buffer', dest='log_buffer_size', type=int,
+                            default=DEFAULT_BUFFER_SIZE,
+                            help='Número máximo de entradas do log JSON aguardando gravação '
+                                 f'(padrão: {DEFAULT_BUFFER_SIZE})')
+    arg_parser.add_argument('--trace-format', choices=['full', 'delta', 'binary'], default='full',
+                            help='Formato do log: JSONL com o estado completo a cada etapa (full), '
+                                 'JSONL apenas com as mudanças e quadros-chave periódicos (delta) '
+                                 'ou binário comprimido em blocos e indexado por etapa (binary)')
+    arg_parser.add_argument('--keyframe-interval', type=int, default=DEFAULT_KEYFRAME_INTERVAL,
+                            help='Etapas entre quadros-chave no formato delta '
+                                 f'(padrão: {DEFAULT_KEYFRAME_INTERVAL})')
+    arg_parser.add_argument('--trace-codec', choices=['zlib', 'lzma'], default='zlib',
+                            help='Compressão dos blocos no formato binary (padrão: zlib)')
+    arg_parser.add_argument('--stream', action='store_true',
+                            help='Lê o fonte via mmap e analisa os tokens sob demanda')
+    arg_parser.add_argument('--no-cache', action='store_true',
+                            help='Não lê nem grava o cache de frontend (.pseudoc)')
+    arg_parser.add_argument('--cache-dir', default=None,
+                            help='Diretório do cache de frontend, que não deve ser gravável por outros '
+                                 'usuários (padrão: $XDG_CACHE_HOME/pseudo-interpreter ou '
+                                 '~/.cache/pseudo-interpreter)')
+    arg_parser.add_argument('--binding', choices=['deep', 'shallow'], default='deep',
+                            help='Implementação do escopo dinâmico: busca na cadeia de '
+                                 'registros (deep) ou tabela central de vínculos (shallow)')
+    arg_parser.add_argument('-O', dest='opt_level', type=int, choices=[0, 1, 2], default=1,
+                            help='Nível de otimização: 0 (nenhuma), 1 (constantes e funções '
+                                 'inalcançáveis, padrão) ou 2 (também atribuições mortas)')
+    arg_parser.add_argument('--no-fold', dest='fold', action='store_false',
+                            help='Desativa a propagação de constantes nas expressões')
+    arg_parser.add_argument('--engine', choices=sorted(ENGINES), default='tree',
+                            help='Motor de execução: percurso da AST (tree), percurso com nós '
+                                 'especializados por tipo (quickening), percurso com pilha de '
+                                 'chamadas explícita (stack), closures compiladas (closure) ou '
+                                 'máquina virtual de bytecode (vm)')
+    arg_parser.add_argument('--max-depth', type=int, default=DEFAULT_MAX_DEPTH,
+                            help='Profundidade máxima de chamadas antes do estouro de pilha '
+                                 f'(padrão: {DEFAULT_MAX_DEPTH}); só os motores '
+                                 + ', '.join(EXPLICIT_STACK_ENGINES) + ' alcançam valores '
+                                 'acima de cerca de 200, pois nos demais o limite de recursão '
+                                 'do Python encerra a execução antes')
+    arg_parser.add_argument('--tail-calls', action='store_true',
+                            help='Reaproveita o registro de ativação nas chamadas em posição de '
+                                 'cauda (motores ' + ', '.join(TAIL_CALL_ENGINES) + ')')
+    arg_parser.add_argument('--disassemble', action='store_true',
+                            help='Mostra o bytecode de cada função antes da execução')
+    arg_parser.add_argument('--render', action='store_true',
+                            help='Renderiza a pilha de chamadas e o escopo global a cada etapa')
+    arg_parser.add_argument('--quiet', action='store_true',
+                            help='Omite a saída do programa')
+    arg_parser.add_argument('--stats', dest='stats_file', nargs='?', const='-', default=None,
+                            help='Registra em JSON o tempo de cada fase e os contadores da '
+                                 'execução, no arquivo dado ou na saída de erro')
+    arg_parser.add_argument('--profile', dest='profile_file', nargs='?', const='-', default=None,
+                            help='Relatório do tempo e das instruções de cada função do programa, '
+                                 'no arquivo dado ou na saída de erro')
+    arg_parser.add_argument('--profile-collapsed', dest='profile_collapsed_file', default=None,
+                            help='Arquivo onde o perfil é exportado como pilhas colapsadas '
+                                 '(flame graph)')
+    return arg_parser
 
 
 if __name__ == '__main__':
-    if len(sys.argv) < 3:
-        print(
-            "Usage: python main.py <program_file.pseudo> [--static | --dynamic] [--json-log <logfile.jsonl>]")
-        sys.exit(1)
-
-    file_path = sys.argv[1]
-    scope_flag = sys.argv[2]
-    json_log_file = None
-    if len(sys.argv) > 3 and sys.argv[3] == '--json-log' and len(sys.argv) > 4:
-        json_log_file = sys.argv[4]
-
-    if scope_flag == '--static':
-        scope_mode = 'static'
-    elif scope_flag == '--dynamic':
-        scope_mode = 'dynamic'
-    else:
-        print("Invalid scope flag. Use --static or --dynamic.")
-        sys.exit(1)
-
-    run_simulation(file_path, scope_mode, json_log_file=json_log_file)
+    args = build_arg_parser().parse_args()
+    cache = None if args.no_cache else FrontendCache(args.cache_dir)
+    succeeded = run_simulation(args.file_path, args.scope_mode,
+                               json_log_file=args.json_log_file, stream=args.stream, cache=cache,
+                               binding=args.binding, opt_level=args.opt_level, fold=args.fold,
+                               engine=args.engine, disassemble=args.disassemble,
+                               render=args.render, quiet=args.quiet,
+                               log_buffer_size=args.log_buffer_size, trace_format=args.trace_format,
+                               keyframe_interval=args.keyframe_interval, trace_codec=args.trace_codec,
+                               stats_file=args.stats_file, profile_file=args.profile_file,
+                               profile_collapsed_file=args.profile_collapsed_file,
+                               max_depth=args.max_depth, tail_calls=args.tail_calls)
+    sys.exit(0 if succeeded else 1)
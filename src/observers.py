@@ -0,0 +1,236 @@
+"""
+Este módulo define a interface de observadores da execução. O interpretador não
+imprime, renderiza nem registra nada diretamente: a cada mudança de estado
+(início e fim do programa, atribuição, chamada, retorno e impressão) e a cada
+saída do programa ele notifica o observador configurado. O observador padrão
+(ExecutionObserver) não faz nada, e os motores só montam a descrição de cada
+etapa quando algum observador implementa on_state (observes_state), de modo
+que a execução sem observadores, ou apenas com a saída do programa, roda na
+velocidade do interpretador. Quem só precisa das chamadas e retornos implementa
+on_call e on_return (observes_calls), que recebem apenas o nome da função. StdoutObserver escreve a saída do programa
+("OUTPUT: ..."), JsonLogObserver registra o estado de cada etapa em um arquivo
+JSONL completo ou com deltas, ou no formato binário indexado (gravado em
+segundo plano pelo TraceWriter), e RichObserver renderiza a pilha de chamadas
+e o escopo global com rich; RecordingObserver conta as etapas e guarda em
+memória a saída e, opcionalmente, as ações e o estado de cada etapa.
+CompositeObserver combina vários observadores, notificados na ordem dada.
+"""
+
+from time import sleep
+from rich.console import Console, Group
+from rich.table import Table
+from rich.panel import Panel
+from rich import box
+from rich.live import Live
+from binary_trace import BinaryTraceWriter
+from trace_format import DeltaEncoder, DEFAULT_KEYFRAME_INTERVAL
+from trace_writer import TraceWriter, DEFAULT_BUFFER_SIZE
+
+
+def snapshot(interpreter, action, output=None):
+    stack = []
+    for ar in interpreter.call_stack.stack:
+        stack.append({
+            'name': ar.name,
+            'scope_type': ar.scope_type,
+            'parent': ar.parent_frame.name if ar.parent_frame else None,
+            'lex_parent': ar.lex_parent_frame.name if ar.lex_parent_frame else None,
+            'locals': ar.locals.copy()
+        })
+    global_vars = {}
+    for k, v in interpreter.global_scope.symbols.items():
+        if 'value' in v:
+            global_vars[k] = v['value']
+    log_entry = {
+        'action': action,
+        'scope_mode': interpreter.scope_mode,
+        'call_stack': stack,
+        'global_scope': global_vars
+    }
+    if output is not None:
+        log_entry['output'] = output
+    return log_entry
+
+
+class ExecutionObserver:
+    @property
+    def observes_state(self):
+        return type(self).on_state is not ExecutionObserver.on_state
+
+    @property
+    def observes_calls(self):
+        return (type(self).on_call is not ExecutionObserver.on_call or
+                type(self).on_return is not ExecutionObserver.on_return)
+
+    def on_state(self, interpreter, action):
+        pass
+
+    def on_call(self, interpreter, func_name):
+        pass
+
+    def on_return(self, interpreter, func_name):
+        pass
+
+    def on_output(self, interpreter, value, action=None):
+        pass
+
+    def close(self):
+        pass
+
+
+class CompositeObserver(ExecutionObserver):
+    def __init__(self, observers):
+        self.observers = list(observers)
+
+    @property
+    def observes_state(self):
+        return any(observer.observes_state for observer in self.observers)
+
+    @property
+    def observes_calls(self):
+        return any(observer.observes_calls for observer in self.observers)
+
+    def on_state(self, interpreter, action):
+        for observer in self.observers:
+            observer.on_state(interpreter, action)
+
+    def on_call(self, interpreter, func_name):
+        for observer in self.observers:
+            observer.on_call(interpreter, func_name)
+
+    def on_return(self, interpreter, func_name):
+        for observer in self.observers:
+            observer.on_return(interpreter, func_name)
+
+    def on_output(self, interpreter, value, action=None):
+        for observer in self.observers:
+            observer.on_output(interpreter, value, action)
+
+    def close(self):
+        for observer in self.observers:
+            observer.close()
+
+
+class StdoutObserver(ExecutionObserver):
+    def on_output(self, interpreter, value, action=None):
+        print(f"OUTPUT: {value}")
+
+
+class RecordingObserver(ExecutionObserver):
+    def __init__(self, record_actions=True, record_states=False):
+        self.steps = 0
+        self.outputs = []
+        self.actions = [] if record_actions else None
+        self.trace = [] if record_states else None
+
+    def _record(self, interpreter, action, output=None):
+        self.steps += 1
+        if self.actions is not None:
+            self.actions.append(action)
+        if self.trace is not None:
+            self.trace.append(snapshot(interpreter, action, output))
+
+    def on_state(self, interpreter, action):
+        self._record(interpreter, action)
+
+    def on_output(self, interpreter, value, action=None):
+        self.outputs.append(value)
+        if action is not None:
+            self._record(interpreter, action, value)
+
+
+class JsonLogObserver(ExecutionObserver):
+    def __init__(self, json_log_file, buffer_size=DEFAULT_BUFFER_SIZE, trace_format='full',
+                 keyframe_interval=DEFAULT_KEYFRAME_INTERVAL, codec='zlib'):
+        self.json_log_file = json_log_file
+        encoder = DeltaEncoder(keyframe_interval) if trace_format == 'delta' else None
+        sink = BinaryTraceWriter(
+            json_log_file, codec=codec) if trace_format == 'binary' else None
+        self.writer = TraceWriter(
+            json_log_file, buffer_size=buffer_size, encoder=encoder, sink=sink)
+
+    def on_state(self, interpreter, action):
+        self.writer.write(snapshot(interpreter, action))
+
+    def on_output(self, interpreter, value, action=None):
+        if action is not None:
+            self.writer.write(snapshot(interpreter, action, output=value))
+
+    def close(self):
+        self.writer.close()
+
+
+class RichObserver(ExecutionObserver):
+    def __init__(self, animation_delay=0.08):
+        self.animation_delay = animation_delay
+        self.console = Console()
+
+    def on_state(self, interpreter, action):
+        console = self.console
+        console.rule()
+        if action.startswith(("Function Call", "Function Return", "Tail Call")):
+            with Live(refresh_per_second=10, console=console, transient=True) as live:
+                for i in range(3):
+                    live.update(
+                        Panel(f"[bold green]{action}{'.' * (i+1)}", border_style="green"))
+                    sleep(self.animation_delay)
+        else:
+            console.rule(f"[bold cyan]{action}")
+        stack_panels = []
+        for i, ar in enumerate(reversed(interpreter.call_stack.stack)):
+            lex_parent_name = ar.lex_parent_frame.name if ar.lex_parent_frame else "None"
+            parent_name = ar.parent_frame.name if ar.parent_frame else "None"
+            locals_table = Table(
+                box=box.MINIMAL, show_header=True, header_style="bold blue")
+            locals_table.add_column("Local", style="bold yellow")
+            locals_table.add_column("Value", style="white")
+            if ar.locals:
+                for k, v in ar.locals.items():
+                    locals_table.add_row(k, repr(v))
+            else:
+                locals_table.add_row("(empty)", "-")
+            panel = Panel(
+                locals_table, title=f"[bold magenta]{ar.name}[/] (type={ar.scope_type}, lex={lex_parent_name}, parent={parent_name})", border_style="magenta")
+            stack_panels.append(panel)
+        if stack_panels:
+            stack_render = Group(*stack_panels)
+            console.print(
+                Panel(stack_render, title="[bold]Call Stack (Top → Base)", border_style="cyan"))
+        else:
+            console.print(
+                Panel("(empty)", title="Call Stack", border_style="cyan"))
+        global_table = Table(title="Global Scope",
+                             box=box.SIMPLE, show_lines=True, expand=True)
+        global_table.add_column("Name", style="bold yellow")
+        global_table.add_column("Value", style="white")
+        global_vars_display = {}
+        for k, v in interpreter.global_scope.symbols.items():
+            if 'value' in v:
+                global_vars_display[k] = v['value']
+        if global_vars_display:
+            for k, v in global_vars_display.items():
+                global_table.add_row(k, repr(v))
+        else:
+            global_table.add_row("(empty)", "-")
+        console.print(Panel(
+            global_table, title="🌎 [bold blue]Global Scope[/]", border_style="blue", padding=(1, 2)))
+        console.rule()
+
+
+def build_observer(json_log_file=None, output=True, render=False,
+                   log_buffer_size=DEFAULT_BUFFER_SIZE, trace_format='full',
+                   keyframe_interval=DEFAULT_KEYFRAME_INTERVAL, trace_codec='zlib'):
+    observers = []
+    if output:
+        observers.append(StdoutObserver())
+    if json_log_file:
+        observers.append(JsonLogObserver(
+            json_log_file, buffer_size=log_buffer_size, trace_format=trace_format,
+            keyframe_interval=keyframe_interval, codec=trace_codec))
+    if render:
+        observers.append(RichObserver())
+    if not observers:
+        return ExecutionObserver()
+    if len(observers) == 1:
+        return observers[0]
+    return CompositeObserver(observers)
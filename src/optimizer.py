@@ -0,0 +1,209 @@
+"""
+Este módulo implementa as otimizações aplicadas à AST depois da verificação
+semântica, organizadas em um pipeline de passes selecionado pelo nível de
+otimização (-O0, -O1, -O2). O ConstantFolder percorre as expressões do
+programa e substitui subárvores de BinaryOpNode formadas apenas por literais
+inteiros e de ponto flutuante por um único literal, seguindo as regras de
+coerção do verificador semântico (int com int resulta em int; qualquer operando
+float resulta em float). Subárvores com identificadores ou caracteres são
+preservadas, e a ordem de avaliação da esquerda para a direita é mantida, de
+modo que o resultado de cada expressão é idêntico ao calculado pelo
+interpretador.
+O UnreachableFunctionEliminator monta o grafo de chamadas a partir de main e
+remove as funções inalcançáveis. O DeadStoreEliminator remove atribuições a
+variáveis locais sobrescritas antes de serem lidas; no escopo dinâmico toda
+chamada conta como leitura dos locais já declarados, pois a função chamada pode
+enxergá-los. Se a última instrução de um corpo passa a ser uma chamada, ela é
+marcada como chamada de cauda.
+"""
+
+from analyzer import mark_tail_call
+from ast_nodes import *
+
+
+class ConstantFolder:
+    name = 'constant-folding'
+
+    def __init__(self):
+        self.folded_count = 0
+
+    def run(self, ast, scope_mode):
+        self.visit(ast)
+        return self.folded_count
+
+    def report(self, count):
+        return f"Constant folding: {count} node(s) folded."
+
+    def visit(self, node):
+        method_name = f'visit_{type(node).__name__}'
+        visitor = getattr(self, method_name, self.generic_visit)
+        return visitor(node)
+
+    def generic_visit(self, node):
+        return node
+
+    def visit_ProgramNode(self, node):
+        for declaration in node.declarations:
+            if isinstance(declaration, FunctionDefNode):
+                self.visit(declaration.body)
+        return node
+
+    def visit_BlockNode(self, node):
+        for statement in node.statements:
+            self.visit(statement)
+        return node
+
+    def visit_AssignNode(self, node):
+        node.expression = self.visit(node.expression)
+        return node
+
+    def visit_PrintNode(self, node):
+        node.expression = self.visit(node.expression)
+        return node
+
+    def visit_CallNode(self, node):
+        node.args = [self.visit(arg) for arg in node.args]
+        return node
+
+    def visit_BinaryOpNode(self, node):
+        node.left = self.visit(node.left)
+        node.right = self.visit(node.right)
+        left, right = node.left, node.right
+        if not isinstance(left, (IntegerNode, FloatNode)) or not isinstance(right, (IntegerNode, FloatNode)):
+            return node
+        if node.op == '+':
+            value = left.value + right.value
+        elif node.op == '-':
+            value = left.value - right.value
+        else:
+            return node
+        self.folded_count += 1
+        if isinstance(left, IntegerNode) and isinstance(right, IntegerNode):
+            return IntegerNode(value)
+        return FloatNode(float(value))
+
+
+class UnreachableFunctionEliminator:
+    name = 'unreachable-functions'
+
+    def run(self, ast, scope_mode):
+        functions = {declaration.name: declaration for declaration in ast.declarations
+                     if isinstance(declaration, FunctionDefNode)}
+        if 'main' not in functions:
+            return 0
+        reachable = set()
+        pending = ['main']
+        while pending:
+            func_name = pending.pop()
+            if func_name in reachable or func_name not in functions:
+                continue
+            reachable.add(func_name)
+            for statement in functions[func_name].body.statements:
+                if isinstance(statement, CallNode):
+                    pending.append(statement.function_name.name)
+        declarations = [declaration for declaration in ast.declarations
+                        if not isinstance(declaration, FunctionDefNode) or declaration.name in reachable]
+        removed_count = len(ast.declarations) - len(declarations)
+        ast.declarations = declarations
+        return removed_count
+
+    def report(self, count):
+        return f"Unreachable functions: {count} removed."
+
+
+class DeadStoreEliminator:
+    name = 'dead-stores'
+
+    def run(self, ast, scope_mode):
+        global_names = {declaration.var_name for declaration in ast.declarations
+                        if isinstance(declaration, VarDeclNode)}
+        removed_count = 0
+        for declaration in ast.declarations:
+            if isinstance(declaration, FunctionDefNode):
+                removed_count += self._eliminate(declaration, scope_mode, global_names)
+        return removed_count
+
+    def report(self, count):
+        return f"Dead stores: {count} removed."
+
+    def _eliminate(self, func_node, scope_mode, global_names):
+        statements = func_node.body.statements
+        declared = {param.var_name for param in func_node.params}
+        declared_before = []
+        for statement in statements:
+            declared_before.append(frozenset(declared))
+            if isinstance(statement, VarDeclNode):
+                declared.add(statement.var_name)
+
+        live = set()
+        kept = []
+        for statement, local_names in zip(reversed(statements), reversed(declared_before)):
+            if isinstance(statement, AssignNode):
+                target = statement.identifier.name
+                if target in local_names:
+                    if target not in live and self._cannot_fail(statement.expression, local_names, global_names, scope_mode):
+                        continue
+                    live.discard(target)
+                live.update(self._reads(statement.expression))
+            elif isinstance(statement, VarDeclNode):
+                live.discard(statement.var_name)
+            elif isinstance(statement, PrintNode):
+                live.update(self._reads(statement.expression))
+            elif isinstance(statement, CallNode):
+                for arg in statement.args:
+                    live.update(self._reads(arg))
+                if scope_mode == 'dynamic':
+                    live.update(local_names)
+            kept.append(statement)
+
+        kept.reverse()
+        func_node.body.statements = kept
+        mark_tail_call(func_node)
+        return len(statements) - len(kept)
+
+    def _reads(self, expression):
+        names = set()
+        pending = [expression]
+        while pending:
+            node = pending.pop()
+            if isinstance(node, IdentifierNode):
+                names.add(node.name)
+            elif isinstance(node, BinaryOpNode):
+                pending.append(node.left)
+                pending.append(node.right)
+        return names
+
+    def _cannot_fail(self, expression, local_names, global_names, scope_mode):
+        # Somente literais e leituras de variáveis que certamente existem: uma
+        # expressão aritmética pode falhar em tempo de execução (ex.: global ainda
+        # sem valor), e remover a atribuição esconderia o erro.
+        if isinstance(expression, (IntegerNode, FloatNode, CharNode)):
+            return True
+        if isinstance(expression, IdentifierNode):
+            if scope_mode == 'static':
+                return expression.address is not None
+            return expression.name in local_names or expression.name in global_names
+        return False
+
+
+OPTIMIZATION_LEVELS = {
+    0: [],
+    1: [ConstantFolder, UnreachableFunctionEliminator],
+    2: [ConstantFolder, UnreachableFunctionEliminator, DeadStoreEliminator],
+}
+
+
+class OptimizationPipeline:
+    def __init__(self, passes):
+        self.passes = passes
+
+    @classmethod
+    def for_level(cls, level, fold=True):
+        return cls([pass_class() for pass_class in OPTIMIZATION_LEVELS[level]
+                    if fold or pass_class is not ConstantFolder])
+
+    def run(self, ast, scope_mode):
+        results = []
+        for optimization in self.passes:
+            results.append((optimization, optimization.run(ast, scope_mode)))
+        return results
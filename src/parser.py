@@ -5,24 +5,39 @@ análise sintática descendente recursiva, convertendo a sequência de tokens em
 declarações de variáveis, definições de funções, blocos de código, atribuições, 
 chamadas de função, expressões aritméticas e comandos de impressão. Implementa 
 métodos para cada construção gramatical e produz nós AST correspondentes.
+Os tokens são consumidos de qualquer iterável através de um pequeno buffer de
+lookahead, o que permite alimentar o parser diretamente por um lexer em streaming.
 """
 
+from collections import deque
 from lexer import Token
 from ast_nodes import *
 
 
 class Parser:
-    def __init__(self, tokens):
-        self.tokens = tokens
-        self.current_token_index = 0
-        self.current_token = self.tokens[self.current_token_index]
+    def __init__(self, tokens, lines=None):
+        self.tokens = iter(tokens)
+        self.lines = lines
+        self.lookahead = deque()
+        self.current_token = self._next_token()
+
+    def _next_token(self):
+        if self.lookahead:
+            return self.lookahead.popleft()
+        return next(self.tokens, None) or Token('EOF', None)
+
+    def _peek(self, offset=1):
+        while len(self.lookahead) < offset:
+            self.lookahead.append(next(self.tokens, None) or Token('EOF', None))
+        return self.lookahead[offset - 1]
 
     def _advance(self):
-        self.current_token_index += 1
-        if self.current_token_index < len(self.tokens):
-            self.current_token = self.tokens[self.current_token_index]
-        else:
-            self.current_token = Token('EOF', None)
+        self.current_token = self._next_token()
+
+    def _location(self):
+        if self.lines is None or self.current_token.pos is None:
+            return ""
+        return f" at {self.lines.format(self.current_token.pos)}"
 
     def _eat(self, token_type):
         if self.current_token.type == token_type:
@@ -31,7 +46,7 @@ class Parser:
             return value
         else:
             raise Exception(
-                f"Parser error: Expected {token_type}, got {self.current_token.type}")
+                f"Parser error: Expected {token_type}, got {self.current_token.type}{self._location()}")
 
     def parse_program(self):
         declarations = []
@@ -44,7 +59,7 @@ class Parser:
                 declarations.append(self._parse_main_function())
             else:
                 raise Exception(
-                    f"Parser error: Unexpected token at program level: {self.current_token.type}")
+                    f"Parser error: Unexpected token at program level: {self.current_token.type}{self._location()}")
         return ProgramNode(declarations)
 
     def _parse_var_declaration(self):
@@ -90,20 +105,21 @@ class Parser:
 
     def _parse_statement(self):
         if self.current_token.type == 'ID':
-            if self.tokens[self.current_token_index + 1].type == '=':
+            next_token_type = self._peek().type
+            if next_token_type == '=':
                 return self._parse_assignment_statement()
-            elif self.tokens[self.current_token_index + 1].type == '(':
+            elif next_token_type == '(':
                 return self._parse_call_statement()
             else:
                 raise Exception(
-                    f"Parser error: Unexpected ID usage in statement: {self.current_token.type}")
+                    f"Parser error: Unexpected ID usage in statement: {self.current_token.type}{self._location()}")
         elif self.current_token.type in ['INT', 'FLOAT', 'CHAR']:
             return self._parse_var_declaration()
         elif self.current_token.type == 'PRINT':
             return self._parse_print_statement()
         else:
             raise Exception(
-                f"Parser error: Unexpected token in statement: {self.current_token.type}")
+                f"Parser error: Unexpected token in statement: {self.current_token.type}{self._location()}")
 
     def _parse_assignment_statement(self):
         identifier = IdentifierNode(self._eat('ID'))
@@ -156,7 +172,7 @@ class Parser:
             return IdentifierNode(name)
         else:
             raise Exception(
-                f"Parser error: Expected expression, got {self.current_token.type}")
+                f"Parser error: Expected expression, got {self.current_token.type}{self._location()}")
 
 
 if __name__ == '__main__':
@@ -177,22 +193,22 @@ if __name__ == '__main__':
     }
     """
     lexer = Lexer(code)
-    parser = Parser(lexer.get_tokens())
+    parser = Parser(lexer.get_tokens(), lexer.lines)
     ast = parser.parse_program()
 
     def print_ast(node, indent=0):
         if isinstance(node, ASTNode):
             print("  " * indent + f"{node.__class__.__name__}")
-            for attr, value in node.__dict__.items():
-                if attr not in ['scope_info'] and not attr.startswith('_'):
-                    if isinstance(value, list):
-                        print("  " * (indent + 1) + f"{attr}: [")
-                        for item in value:
-                            print_ast(item, indent + 2)
-                        print("  " * (indent + 1) + "]")
-                    else:
-                        print("  " * (indent + 1) + f"{attr}:")
-                        print_ast(value, indent + 2)
+            for attr in node._fields:
+                value = getattr(node, attr)
+                if isinstance(value, list):
+                    print("  " * (indent + 1) + f"{attr}: [")
+                    for item in value:
+                        print_ast(item, indent + 2)
+                    print("  " * (indent + 1) + "]")
+                else:
+                    print("  " * (indent + 1) + f"{attr}:")
+                    print_ast(value, indent + 2)
         else:
             print("  " * indent + str(node))
 
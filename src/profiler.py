@@ -0,0 +1,131 @@
+"""
+Este módulo implementa o profiler das funções do programa interpretado (e não
+dos métodos Python do interpretador). O PseudoProfiler observa apenas as
+chamadas e retornos (on_call e on_return): a cada um lê o relógio uma vez e
+mantém uma pilha paralela à CallStack, atribuindo a cada função pseudo o número
+de chamadas, o tempo próprio (excluídas as funções chamadas), o tempo acumulado
+(contado uma única vez em chamadas recursivas) e o número de instruções
+executadas, obtido do corpo da função na AST, já que as funções não têm
+desvios. O tempo próprio também é acumulado por pilha de chamadas, para
+exportação no formato de pilhas colapsadas usado por ferramentas de flame graph
+("main;f1;f2 <microssegundos>"). Uma chamada de cauda encerra a função que
+chama e inicia a chamada no mesmo nível, como ocorre com o registro de
+ativação. Como não ativa a descrição das etapas (observes_state), o custo se
+limita a essas duas notificações por chamada.
+"""
+
+import time
+from observers import ExecutionObserver
+
+
+class FunctionProfile:
+    __slots__ = ('name', 'calls', 'self_time', 'cumulative_time', 'body_statements', 'active')
+
+    def __init__(self, name, body_statements):
+        self.name = name
+        self.calls = 0
+        self.self_time = 0.0
+        self.cumulative_time = 0.0
+        self.body_statements = body_statements
+        self.active = 0
+
+    @property
+    def statements(self):
+        return self.calls * self.body_statements
+
+
+class CallPath:
+    __slots__ = ('names', 'children', 'self_time')
+
+    def __init__(self, names):
+        self.names = names
+        self.children = {}
+        self.self_time = 0.0
+
+
+class PseudoProfiler(ExecutionObserver):
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.functions = {}
+        self.roots = {}
+        self.frames = []
+
+    def on_call(self, interpreter, func_name):
+        profile = self.functions.get(func_name)
+        if profile is None:
+            profile = self.functions[func_name] = FunctionProfile(
+                func_name, self._statements(interpreter, func_name))
+        profile.calls += 1
+        profile.active += 1
+        frames = self.frames
+        parent = frames[-1][1] if frames else None
+        children = parent.children if parent else self.roots
+        path = children.get(func_name)
+        if path is None:
+            path = children[func_name] = CallPath(
+                parent.names + (func_name,) if parent else (func_name,))
+        frames.append([profile, path, 0.0, self.clock()])
+
+    def on_return(self, interpreter, func_name):
+        self._exit(self.clock())
+
+    def _statements(self, interpreter, name):
+        func_info = interpreter.global_scope.lookup(name)
+        node = func_info.get('node') if func_info else None
+        return len(node.body.statements) if node is not None else 0
+
+    def _exit(self, now):
+        if not self.frames:
+            return
+        profile, path, child_time, start = self.frames.pop()
+        elapsed = now - start
+        self_time = elapsed - child_time
+        profile.self_time += self_time
+        path.self_time += self_time
+        profile.active -= 1
+        if not profile.active:
+            profile.cumulative_time += elapsed
+        if self.frames:
+            self.frames[-1][2] += elapsed
+
+    def close(self):
+        now = self.clock()
+        while self.frames:
+            self._exit(now)
+
+    def total_time(self):
+        return sum(profile.self_time for profile in self.functions.values())
+
+    def profiles(self):
+        return sorted(self.functions.values(),
+                      key=lambda profile: (-profile.self_time, profile.name))
+
+    def call_paths(self):
+        paths = []
+        pending = list(self.roots.values())
+        while pending:
+            path = pending.pop()
+            paths.append(path)
+            pending.extend(path.children.values())
+        return sorted(paths, key=lambda path: path.names)
+
+    def collapsed_lines(self):
+        return [f"{';'.join(path.names)} {round(path.self_time * 1e6)}"
+                for path in self.call_paths()]
+
+    def write_collapsed(self, path):
+        with open(path, 'w') as f:
+            for line in self.collapsed_lines():
+                f.write(line + "\n")
+
+    def report(self):
+        total = self.total_time()
+        lines = [f"Pseudo function profile (total {total * 1000:.3f} ms)",
+                 f"{'self ms':>10} {'self %':>7} {'cum ms':>10} {'calls':>8} "
+                 f"{'stmts':>9}  function"]
+        for profile in self.profiles():
+            share = profile.self_time / total * 100 if total else 0.0
+            lines.append(f"{profile.self_time * 1000:>10.3f} {share:>6.1f}% "
+                         f"{profile.cumulative_time * 1000:>10.3f} {profile.calls:>8} "
+                         f"{profile.statements:>9}  {profile.name}")
+        return "\n".join(lines)
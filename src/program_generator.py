@@ -0,0 +1,156 @@
+"""
+Este módulo gera programas .pseudo sintéticos e semanticamente válidos a partir
+de uma semente, para uso em benchmarks e testes de carga. Os programas são
+parametrizados pelos aspectos que mais pesam no interpretador: número de
+variáveis globais e de funções, profundidade das cadeias de chamadas, tamanho
+das expressões, variáveis locais por registro de ativação e a fração das
+locais que sombreiam uma global de mesmo nome e tipo. Como as funções de uma
+cadeia leem globais que as chamadoras sombreiam, essa fração controla o quanto
+as execuções com escopo estático e dinâmico divergem. Cada função só chama
+funções definidas antes dela, de modo que o programa também é válido com
+escopo estático, e main inicializa todas as globais antes da primeira chamada.
+Com fanout maior que 1, cada função chama a seguinte da cadeia várias vezes, e
+o corpo da última é executado fanout ** (call_depth - 1) vezes por cadeia, o
+que torna quentes as mesmas expressões (a linguagem não tem laços).
+A mesma semente e os mesmos parâmetros sempre produzem o mesmo programa.
+"""
+
+import random
+import sys
+
+NUMERIC_TYPES = ('int', 'float')
+
+
+class ProgramGenerator:
+    def __init__(self, seed=0, globals_count=8, functions=12, call_depth=4,
+                 expression_length=4, locals_per_frame=3, shadowing=0.5, statements=6,
+                 fanout=1):
+        if call_depth < 1:
+            raise ValueError("call_depth must be at least 1.")
+        if fanout < 1:
+            raise ValueError("fanout must be at least 1.")
+        self.random = random.Random(seed)
+        self.globals_count = max(globals_count, 1)
+        self.functions = functions
+        self.call_depth = call_depth
+        self.expression_length = max(expression_length, 1)
+        self.locals_per_frame = locals_per_frame
+        self.shadowing = shadowing
+        self.statements = statements
+        self.fanout = fanout
+
+    def _literal(self, var_type):
+        if var_type == 'int':
+            return str(self.random.randint(0, 20))
+        return f"{self.random.randint(0, 9)}.{self.random.randint(0, 99)}"
+
+    def _expression(self, names, var_type):
+        pool = [name for name, name_type in names.items()
+                if name_type == 'int' or var_type == 'float']
+        terms = []
+        for _ in range(self.random.randint(1, self.expression_length)):
+            if pool and self.random.random() < 0.6:
+                terms.append(self.random.choice(pool))
+            else:
+                terms.append(self._literal(
+                    'int' if var_type == 'int' else self.random.choice(NUMERIC_TYPES)))
+        expression = terms[0]
+        for term in terms[1:]:
+            expression += f" {self.random.choice('+-')} {term}"
+        return expression
+
+    def _function(self, index, global_types, callee):
+        name = f"f{index}"
+        param_type = self.random.choice(NUMERIC_TYPES)
+        names = dict(global_types)
+        names[f"p{index}"] = param_type
+        declared = []
+        for local in range(self.locals_per_frame):
+            candidates = [global_name for global_name in global_types
+                          if global_name not in declared]
+            if candidates and self.random.random() < self.shadowing:
+                local_name = self.random.choice(candidates)
+                names[local_name] = global_types[local_name]
+            else:
+                local_name = f"l{index}_{local}"
+                names[local_name] = self.random.choice(NUMERIC_TYPES)
+            declared.append(local_name)
+        body = [f"{names[local_name]} {local_name};" for local_name in declared]
+        for local_name in declared:
+            body.append(f"{local_name} = {self._expression(names, names[local_name])};")
+        for _ in range(self.statements):
+            choice = self.random.random()
+            if choice < 0.4:
+                target = self.random.choice(list(global_types))
+                body.append(f"{target} = {self._expression(names, names[target])};")
+            elif choice < 0.7:
+                target = self.random.choice(list(names))
+                body.append(f"{target} = {self._expression(names, names[target])};")
+            else:
+                body.append(f"print({self.random.choice(list(names))});")
+        if callee is not None:
+            callee_name, callee_type = callee
+            for _ in range(self.fanout):
+                body.append(f"{callee_name}({self._expression(names, callee_type)});")
+        return (name, param_type), (
+            f"def {name}({param_type} p{index}) {{\n    " + "\n    ".join(body) + "\n}")
+
+    def generate(self):
+        global_types = {f"g{index}": self.random.choice(NUMERIC_TYPES)
+                        for index in range(self.globals_count)}
+        lines = [f"{var_type} {name};" for name, var_type in global_types.items()]
+        chain_tops = []
+        previous = None
+        for index in range(self.functions):
+            callee = previous if index % self.call_depth else None
+            previous, source = self._function(index, global_types, callee)
+            lines.append(source)
+            if index % self.call_depth == self.call_depth - 1 or index == self.functions - 1:
+                chain_tops.append(previous)
+        main_body = [f"{name} = {self._literal(var_type)};"
+                     for name, var_type in global_types.items()]
+        for name, param_type in chain_tops:
+            main_body.append(f"{name}({self._literal(param_type)});")
+        main_body.extend(f"print({name});" for name in global_types)
+        lines.append("main() {\n    " + "\n    ".join(main_body) + "\n}")
+        return "\n".join(lines) + "\n"
+
+
+def generate_program(seed=0, **knobs):
+    return ProgramGenerator(seed, **knobs).generate()
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Gera um programa .pseudo sintético a partir de uma semente.")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--globals', dest='globals_count', type=int, default=8,
+                        help='Número de variáveis globais')
+    parser.add_argument('--functions', type=int, default=12, help='Número de funções')
+    parser.add_argument('--call-depth', type=int, default=4,
+                        help='Funções em cada cadeia de chamadas iniciada por main')
+    parser.add_argument('--expression-length', type=int, default=4,
+                        help='Número máximo de termos em cada expressão')
+    parser.add_argument('--locals', dest='locals_per_frame', type=int, default=3,
+                        help='Variáveis locais declaradas em cada função')
+    parser.add_argument('--shadowing', type=float, default=0.5,
+                        help='Fração das locais que sombreiam uma global (0 a 1)')
+    parser.add_argument('--statements', type=int, default=6,
+                        help='Atribuições e impressões em cada função')
+    parser.add_argument('--fanout', type=int, default=1,
+                        help='Chamadas de cada função à seguinte da cadeia')
+    parser.add_argument('-o', '--output', default=None,
+                        help='Arquivo de saída (padrão: saída padrão)')
+    args = vars(parser.parse_args())
+    output = args.pop('output')
+    source = generate_program(**args)
+    if output:
+        with open(output, 'w') as f:
+            f.write(source)
+    else:
+        sys.stdout.write(source)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Este módulo implementa o motor de execução com "quickening": operações binárias
+quentes passam a ser avaliadas por closures especializadas por tipo e operador
+(int+int, float-float, int+float com coerção etc.). A especialização usa os
+tipos inferidos pela verificação semântica (BinaryOpNode.operand_types) e
+ocorre na segunda avaliação do nó, quando os valores observados coincidem com
+esses tipos; como a linguagem não tem laços, a maioria dos nós é avaliada uma
+única vez e não paga pela especialização. A closure avalia os operandos sem o
+despacho genérico de visit (literais como constantes, variáveis com endereço
+léxico pelo slot, subexpressões quentes pelas próprias closures), confere os
+tipos e aplica o operador. As closures ficam em uma tabela do interpretador, e a
+AST não é alterada, podendo ser compartilhada com outros motores e serializada.
+Se a guarda falhar (no escopo dinâmico um nome pode se referir a uma variável
+de outro tipo, ou uma global pode estar sem valor), o resultado é calculado
+pelo caminho genérico e o nó deixa a tabela. O despacho de visit é memorizado
+por classe de nó. Os observadores recebem as mesmas notificações que no
+Interpreter.
+"""
+
+from ast_nodes import BinaryOpNode, CharNode, FloatNode, IdentifierNode, IntegerNode
+from interpreter import DEFAULT_MAX_DEPTH, Interpreter, operand_error
+
+TYPE_CLASSES = {'int': int, 'float': float}
+
+
+class QuickeningInterpreter(Interpreter):
+    def __init__(self, ast, scope_mode, json_log_file=None, binding='deep', observer=None,
+                 max_depth=DEFAULT_MAX_DEPTH, tail_calls=False):
+        super().__init__(ast, scope_mode, json_log_file=json_log_file, binding=binding,
+                         observer=observer, max_depth=max_depth, tail_calls=tail_calls)
+        self.specializations = {}
+        self.visitors = {}
+        self.quickened_count = 0
+        self.deoptimized_count = 0
+
+    def visit(self, node):
+        visitor = self.visitors.get(type(node))
+        if visitor is None:
+            visitor = self.visitors[type(node)] = getattr(
+                self, f'visit_{type(node).__name__}', self.generic_visit)
+        return visitor(node)
+
+    def visit_BinaryOpNode(self, node):
+        specialized = self.specializations.get(node)
+        if specialized:
+            return specialized()
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        try:
+            if node.op == '+':
+                result = left + right
+            elif node.op == '-':
+                result = left - right
+            else:
+                raise Exception(f"Unsupported binary operator: {node.op}")
+        except TypeError:
+            raise operand_error(node.op, left, right) from None
+        if specialized is None:
+            self.specializations[node] = False
+        else:
+            self._quicken(node, left, right)
+        return result
+
+    def _quicken(self, node, left, right):
+        if node.operand_types is None:
+            return
+        left_type, right_type = node.operand_types
+        left_class = TYPE_CLASSES.get(left_type)
+        right_class = TYPE_CLASSES.get(right_type)
+        if left_class is not type(left) or right_class is not type(right):
+            return
+        self.specializations[node] = self._specialize(node, left_class, right_class)
+        self.quickened_count += 1
+
+    def _specialize(self, node, left_class, right_class):
+        evaluate_left = self._evaluator(node.left)
+        evaluate_right = self._evaluator(node.right)
+        deoptimize = self._deoptimize
+        if node.op == '+':
+            def specialized():
+                left = evaluate_left()
+                right = evaluate_right()
+                if type(left) is left_class and type(right) is right_class:
+                    return left + right
+                return deoptimize(node, left, right)
+        else:
+            def specialized():
+                left = evaluate_left()
+                right = evaluate_right()
+                if type(left) is left_class and type(right) is right_class:
+                    return left - right
+                return deoptimize(node, left, right)
+        return specialized
+
+    def _evaluator(self, node):
+        if isinstance(node, (IntegerNode, FloatNode, CharNode)):
+            value = node.value
+            return lambda: value
+        if isinstance(node, IdentifierNode) and self.scope_mode == 'static' and node.address is not None:
+            depth, slot = node.address
+            if depth == 0:
+                stack = self.call_stack.stack
+                return lambda: stack[-1].slots[slot]
+            global_var_info = self.global_slots[slot]
+            return lambda: global_var_info['value']
+        if isinstance(node, BinaryOpNode):
+            specialized = self.specializations.get(node)
+            if specialized:
+                return specialized
+        visitor = getattr(self, f'visit_{type(node).__name__}', self.generic_visit)
+        return lambda: visitor(node)
+
+    def _deoptimize(self, node, left, right):
+        # Closures de nós pais podem continuar chamando esta variante depois
+        # que o nó deixa a tabela; o resultado genérico continua correto.
+        if self.specializations.get(node):
+            self.specializations[node] = False
+            self.deoptimized_count += 1
+        try:
+            if node.op == '+':
+                return left + right
+            return left - right
+        except TypeError:
+            raise operand_error(node.op, left, right) from None
@@ -4,7 +4,10 @@ resolve referências de identificadores de acordo com as regras de escopo léxic
 Constrói tabelas de símbolos aninhadas representando a estrutura de escopos do 
 programa e associa cada uso de identificador à sua declaração correspondente. 
 Utiliza o padrão Visitor para percorrer os nós da AST e armazena informações 
-de resolução nos próprios nós para uso posterior pelo interpretador.
+de resolução nos próprios nós para uso posterior pelo interpretador. Cada
+variável recebe um slot em seu nível léxico e cada identificador é anotado com
+seu endereço léxico (profundidade, slot), permitindo acesso direto pelo
+interpretador sem percorrer a cadeia de escopos.
 """
 
 from ast_nodes import *
@@ -14,6 +17,8 @@ from symbol_table import SymbolTable
 class StaticScopeResolver:
     def __init__(self):
         self.current_scope = None
+        self.scope_level = 0
+        self.next_slot = 0
 
     def visit(self, node):
         method_name = f'visit_{type(node).__name__}'
@@ -21,38 +26,49 @@ class StaticScopeResolver:
         return visitor(node)
 
     def generic_visit(self, node):
-        for attr in dir(node):
-            if not attr.startswith('_') and attr != 'scope_info':
-                value = getattr(node, attr)
-                if isinstance(value, list):
-                    for item in value:
-                        self.visit(item)
-                elif isinstance(value, ASTNode):
-                    self.visit(value)
+        for attr in node._fields:
+            value = getattr(node, attr)
+            if isinstance(value, list):
+                for item in value:
+                    self.visit(item)
+            elif isinstance(value, ASTNode):
+                self.visit(value)
+
+    def _declare_variable(self, node, symbol_type):
+        self.current_scope.insert(node.var_name, {
+            'type': symbol_type, 'node': node, 'level': self.scope_level, 'slot': self.next_slot})
+        node.slot = self.next_slot
+        self.next_slot += 1
 
     def visit_ProgramNode(self, node):
         self.current_scope = SymbolTable(name="global")
+        self.scope_level = 0
+        self.next_slot = 0
         for decl in node.declarations:
             self.visit(decl)
 
     def visit_VarDeclNode(self, node):
-        self.current_scope.insert(
-            node.var_name, {'type': node.var_type, 'node': node})
+        self._declare_variable(node, node.var_type)
 
     def visit_FunctionDefNode(self, node):
         self.current_scope.insert(
             node.name, {'type': 'function', 'node': node, 'closure_scope': self.current_scope})
 
         previous_scope = self.current_scope
+        previous_slot = self.next_slot
         self.current_scope = SymbolTable(
             parent=previous_scope, name=f"func_{node.name}_scope")
+        self.scope_level += 1
+        self.next_slot = 0
 
         for param in node.params:
-            self.current_scope.insert(
-                param.var_name, {'type': 'param', 'node': param})
+            self._declare_variable(param, 'param')
 
         self.visit(node.body)
+        node.frame_size = self.next_slot
         self.current_scope = previous_scope
+        self.scope_level -= 1
+        self.next_slot = previous_slot
 
     def visit_BlockNode(self, node):
         for stmt in node.statements:
@@ -66,6 +82,9 @@ class StaticScopeResolver:
         node.scope_info = symbol_info
         if 'type' in symbol_info:
             node.var_type = symbol_info['type']
+        if 'slot' in symbol_info:
+            node.address = (self.scope_level -
+                            symbol_info['level'], symbol_info['slot'])
 
     def visit_AssignNode(self, node):
         self.visit(node.identifier)
@@ -114,16 +133,16 @@ if __name__ == '__main__':
                   f"ID({node.name}) -> Resolved to: {node.scope_info['node'].__class__.__name__}")
         elif isinstance(node, ASTNode):
             print("  " * indent + f"{node.__class__.__name__}")
-            for attr, value in node.__dict__.items():
-                if attr not in ['scope_info'] and not attr.startswith('_'):
-                    if isinstance(value, list):
-                        print("  " * (indent + 1) + f"{attr}: [")
-                        for item in value:
-                            print_resolved_ast(item, indent + 2)
-                        print("  " * (indent + 1) + "]")
-                    else:
-                        print("  " * (indent + 1) + f"{attr}:")
-                        print_resolved_ast(value, indent + 2)
+            for attr in node._fields:
+                value = getattr(node, attr)
+                if isinstance(value, list):
+                    print("  " * (indent + 1) + f"{attr}: [")
+                    for item in value:
+                        print_resolved_ast(item, indent + 2)
+                    print("  " * (indent + 1) + "]")
+                else:
+                    print("  " * (indent + 1) + f"{attr}:")
+                    print_resolved_ast(value, indent + 2)
         else:
             print("  " * indent + str(node))
 
@@ -4,7 +4,8 @@ erros semânticos antes da interpretação. Verifica se variáveis foram declara
 antes do uso, se os tipos são compatíveis em atribuições e operações, se funções 
 são chamadas com o número correto de argumentos e tipos compatíveis. Mantém uma 
 tabela de símbolos para rastrear declarações e tipos, e aplica regras de coerção 
-de tipos (como conversão implícita de int para float).
+de tipos (como conversão implícita de int para float). Os tipos inferidos para
+os operandos e o resultado de cada operação binária ficam registrados no nó.
 """
 
 from ast_nodes import ASTNode, VarDeclNode, FunctionDefNode, CallNode, PrintNode, BlockNode
@@ -21,8 +22,9 @@ class SemanticChecker:
         return visitor(node)
 
     def generic_visit(self, node):
-        if hasattr(node, '__dict__'):
-            for child in node.__dict__.values():
+        if isinstance(node, ASTNode):
+            for field in node._fields:
+                child = getattr(node, field)
                 if isinstance(child, list):
                     for item in child:
                         if isinstance(item, ASTNode):
@@ -105,9 +107,12 @@ class SemanticChecker:
     def visit_BinaryOpNode(self, node):
         left_type = self.visit(node.left)
         right_type = self.visit(node.right)
+        node.operand_types = (left_type, right_type)
         if left_type == 'float' or right_type == 'float':
-            return 'float'
-        return 'int'
+            node.expr_type = 'float'
+        else:
+            node.expr_type = 'int'
+        return node.expr_type
 
     def visit_CallNode(self, node):
         func_name = node.function_name.name
@@ -0,0 +1,46 @@
+"""
+Este módulo implementa o interpretador de pilha explícita. As chamadas de
+função não são executadas recursivamente pela pilha do Python: cada chamada em
+andamento é uma entrada de uma pilha de trabalho, com o iterador das instruções
+restantes do corpo e o registro de ativação correspondente, e o laço principal
+sempre executa a próxima instrução da entrada do topo. Uma chamada empilha uma
+nova entrada (após avaliar os argumentos e criar o registro, como no
+Interpreter) e o fim do corpo a desempilha, notificando o retorno. As demais
+instruções e as expressões, que não contêm chamadas, são avaliadas pelos
+métodos de visita herdados. Assim a profundidade de chamadas é limitada apenas
+por max_depth (--max-depth) e pela memória, e não pelo limite de recursão do
+Python; ao excedê-la, a execução termina com um erro de estouro de pilha da
+linguagem que mostra a cadeia de chamadas. Com tail_calls, uma chamada de cauda
+substitui a entrada do topo pela do corpo da função chamada, cujo registro
+substitui ou reaproveita o de quem chama (ver Interpreter._replace_frame).
+"""
+
+from ast_nodes import CallNode
+from interpreter import Interpreter
+
+
+class StackInterpreter(Interpreter):
+    def _execute_body(self, func_node):
+        visit = self.visit
+        begin_call = self._begin_call
+        tail_calls = self.tail_calls
+        work = [(iter(func_node.body.statements), None)]
+        while work:
+            statements, frame = work[-1]
+            for statement in statements:
+                if type(statement) is CallNode:
+                    if statement.tail and tail_calls:
+                        callee_node = self._begin_tail_call(statement)
+                        work[-1] = (iter(callee_node.body.statements), self.call_stack.stack[-1])
+                        break
+                    call = begin_call(statement)
+                    if call is not None:
+                        callee_node, callee_frame = call
+                        work.append((iter(callee_node.body.statements), callee_frame))
+                        break
+                else:
+                    visit(statement)
+            else:
+                work.pop()
+                if frame is not None:
+                    self._end_call(frame)
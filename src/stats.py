@@ -0,0 +1,243 @@
+"""
+Este módulo implementa as estatísticas opcionais de execução (--stats). O
+PhaseTimer acumula o tempo de relógio e de CPU de cada fase (leitura, análise
+léxica e sintática, análise semântica e resolução de escopo, otimização,
+execução, renderização, saída e gravação do trace); o tempo de CPU é o do
+processo, e inclui portanto o da thread que grava o trace em segundo plano, e
+o tempo da execução inclui o dos observadores, também informado à parte. Os
+contadores da execução ficam em ExecutionStats: visitas a nós por tipo,
+buscas de variáveis (leituras e escritas), saltos na cadeia de escopos a cada
+busca, registros de ativação empilhados, chamadas de cauda (que não empilham
+registros) e profundidade máxima da pilha.
+Nada disso custa algo quando --stats não é usado: os registros de ativação são
+contados por um observador (StatsObserver) e as visitas e buscas por uma
+subclasse instrumentada do motor de execução (ver instrumented()), ambos só
+instalados quando as estatísticas são pedidas. No motor stack, as chamadas
+despachadas diretamente pelo laço de _execute_body, sem passar por visit, são
+contadas como visitas a CallNode, e não há visitas a BlockNode, pois os corpos
+são percorridos pelo próprio laço. Os motores que não percorrem a AST durante a
+execução (closure e vm) não têm visitas nem buscas contadas, e o quickening
+também não, pois os nós já especializados são executados sem passar por visit.
+"""
+
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from call_stack import ActivationRecord
+from observers import CompositeObserver, ExecutionObserver
+from stack_interpreter import StackInterpreter
+from symbol_table import SymbolTable
+
+INSTRUMENTED_ENGINES = ('tree', 'stack')
+
+OBSERVER_PHASES = {
+    'RichObserver': 'rendering',
+    'StdoutObserver': 'output',
+    'JsonLogObserver': 'trace_writing',
+    'PseudoProfiler': 'profiling',
+}
+
+
+class PhaseTimer:
+    def __init__(self):
+        self.phases = {}
+
+    def add(self, name, wall, cpu):
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = {'wall': 0.0, 'cpu': 0.0, 'calls': 0}
+        phase['wall'] += wall
+        phase['cpu'] += cpu
+        phase['calls'] += 1
+
+    @contextmanager
+    def phase(self, name):
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - wall, time.process_time() - cpu)
+
+
+class NullTimer:
+    def phase(self, name):
+        return nullcontext()
+
+
+NULL_TIMER = NullTimer()
+
+
+class ExecutionStats:
+    def __init__(self):
+        self.node_visits = Counter()
+        self.lookups = Counter()
+        self.hops = Counter()
+        self.frames_pushed = 0
+        self.tail_calls = 0
+        self.max_depth = 0
+        self.steps = 0
+
+    def record_lookup(self, kind, hops):
+        self.lookups[kind] += 1
+        self.hops[hops] += 1
+
+    def as_dict(self, instrumented=True):
+        lookups = sum(self.lookups.values())
+        total_hops = sum(hops * count for hops, count in self.hops.items())
+        counters = {
+            'steps': self.steps,
+            'frames_pushed': self.frames_pushed,
+            'tail_calls': self.tail_calls,
+            'max_stack_depth': self.max_depth,
+            'node_visits': None,
+            'lookups': None,
+            'scope_chain_hops': None,
+        }
+        if instrumented:
+            counters['node_visits'] = dict(self.node_visits.most_common())
+            counters['lookups'] = {'reads': self.lookups['read'],
+                                   'writes': self.lookups['write'], 'total': lookups}
+            counters['scope_chain_hops'] = {
+                'total': total_hops,
+                'mean': total_hops / lookups if lookups else 0.0,
+                'max': max(self.hops, default=0),
+                'histogram': {str(hops): count for hops, count in sorted(self.hops.items())},
+            }
+        return counters
+
+
+class StatsObserver(ExecutionObserver):
+    def __init__(self, stats):
+        self.stats = stats
+
+    def on_state(self, interpreter, action):
+        stats = self.stats
+        stats.steps += 1
+        if action == "Program Start" or action.startswith("Function Call"):
+            stats.frames_pushed += 1
+            depth = len(interpreter.call_stack.stack)
+            if depth > stats.max_depth:
+                stats.max_depth = depth
+        elif action.startswith("Tail Call"):
+            stats.tail_calls += 1
+
+    def on_output(self, interpreter, value, action=None):
+        if action is not None:
+            self.stats.steps += 1
+
+
+class TimedObserver(ExecutionObserver):
+    def __init__(self, observer, timer, name):
+        self.observer = observer
+        self.timer = timer
+        self.name = name
+
+    @property
+    def observes_state(self):
+        return self.observer.observes_state
+
+    @property
+    def observes_calls(self):
+        return self.observer.observes_calls
+
+    def on_state(self, interpreter, action):
+        with self.timer.phase(self.name):
+            self.observer.on_state(interpreter, action)
+
+    def on_call(self, interpreter, func_name):
+        with self.timer.phase(self.name):
+            self.observer.on_call(interpreter, func_name)
+
+    def on_return(self, interpreter, func_name):
+        with self.timer.phase(self.name):
+            self.observer.on_return(interpreter, func_name)
+
+    def on_output(self, interpreter, value, action=None):
+        with self.timer.phase(self.name):
+            self.observer.on_output(interpreter, value, action)
+
+    def close(self):
+        with self.timer.phase(self.name):
+            self.observer.close()
+
+
+def timed_observer(observer, timer):
+    observers = observer.observers if isinstance(observer, CompositeObserver) else [observer]
+    timed = [TimedObserver(child, timer, OBSERVER_PHASES.get(type(child).__name__,
+                                                             type(child).__name__))
+             for child in observers if type(child) is not ExecutionObserver]
+    return CompositeObserver(timed)
+
+
+def _scope_hops(interpreter, name, address):
+    if interpreter.scope_mode == 'static':
+        if address is not None:
+            return address[0]
+        scope = interpreter.call_stack.peek() or interpreter.global_scope
+        hops = 0
+        while scope is not None:
+            if isinstance(scope, ActivationRecord):
+                if name in scope.locals:
+                    return hops
+                scope = scope.lex_parent_frame
+            elif isinstance(scope, SymbolTable):
+                if scope.lookup_current_scope(name):
+                    return hops
+                scope = scope.parent
+            else:
+                break
+            hops += 1
+        return hops
+    if interpreter.shallow_bindings:
+        return 0
+    frame = interpreter.call_stack.peek()
+    hops = 0
+    while frame is not None and name not in frame.locals:
+        frame = frame.parent_frame
+        hops += 1
+    return hops
+
+
+_INSTRUMENTED_CLASSES = {}
+
+
+def instrumented(engine_class):
+    instrumented_class = _INSTRUMENTED_CLASSES.get(engine_class)
+    if instrumented_class is not None:
+        return instrumented_class
+
+    class InstrumentedEngine(engine_class):
+        def __init__(self, *args, stats=None, **kwargs):
+            self.stats = stats if stats is not None else ExecutionStats()
+            super().__init__(*args, **kwargs)
+
+        def visit(self, node):
+            self.stats.node_visits[type(node).__name__] += 1
+            return super().visit(node)
+
+        def visit_IdentifierNode(self, node):
+            self.stats.record_lookup('read', _scope_hops(self, node.name, node.address))
+            return super().visit_IdentifierNode(node)
+
+        def _assign(self, identifier, value_to_assign):
+            self.stats.record_lookup(
+                'write', _scope_hops(self, identifier.name, identifier.address))
+            return super()._assign(identifier, value_to_assign)
+
+    if issubclass(engine_class, StackInterpreter):
+        def _begin_call(self, node):
+            self.stats.node_visits['CallNode'] += 1
+            return super(InstrumentedEngine, self)._begin_call(node)
+
+        def _begin_tail_call(self, node):
+            self.stats.node_visits['CallNode'] += 1
+            return super(InstrumentedEngine, self)._begin_tail_call(node)
+
+        InstrumentedEngine._begin_call = _begin_call
+        InstrumentedEngine._begin_tail_call = _begin_tail_call
+
+    InstrumentedEngine.__name__ = InstrumentedEngine.__qualname__ = \
+        f"Instrumented{engine_class.__name__}"
+    _INSTRUMENTED_CLASSES[engine_class] = InstrumentedEngine
+    return InstrumentedEngine
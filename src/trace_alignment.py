@@ -0,0 +1,133 @@
+"""
+Este módulo implementa o alinhamento de dois traces (por exemplo, a execução do
+mesmo programa com escopo estático e dinâmico). Cada etapa é reduzida a uma
+assinatura do evento (a ação registrada, como "Assignment: x = 1" ou "Function
+Call: f"), guardada como um hash de 64 bits em um array compacto, e as duas
+sequências são alinhadas pelo algoritmo de diferenças de Myers em sua versão de
+espaço linear (busca da "middle snake" com divisão e conquista), após remover o
+prefixo e o sufixo comuns. O tempo é O((N+M)·D), em que D é o número de etapas
+diferentes, e a memória é proporcional ao tamanho das sequências de hashes, de
+modo que traces longos e parecidos são alinhados rapidamente. O resultado é uma
+sequência de pares (etapa estática, etapa dinâmica), em que None marca a etapa
+ausente em um dos lados, e summarize() aponta a primeira divergência.
+Executado diretamente, imprime o resumo do alinhamento de dois logs em JSON.
+"""
+
+import json
+from array import array
+from binary_trace import read_trace
+
+
+def event_signature(entry):
+    return entry['action']
+
+
+def action_signatures(actions):
+    return array('q', map(hash, actions))
+
+
+def signatures(entries):
+    return action_signatures(map(event_signature, entries))
+
+
+def _middle_snake(a, alo, ahi, b, blo, bhi):
+    n = ahi - alo
+    m = bhi - blo
+    delta = n - m
+    odd = delta & 1
+    max_d = (n + m + 1) // 2
+    offset = max_d + 1
+    forward = [0] * (2 * offset + 1)
+    backward = [0] * (2 * offset + 1)
+    for d in range(max_d + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and forward[offset + k - 1] < forward[offset + k + 1]):
+                x = forward[offset + k + 1]
+            else:
+                x = forward[offset + k - 1] + 1
+            y = x - k
+            start_x, start_y = x, y
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            forward[offset + k] = x
+            if odd and delta - (d - 1) <= k <= delta + (d - 1):
+                if x + backward[offset + delta - k] >= n:
+                    return start_x, start_y, x, y, 2 * d - 1
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and backward[offset + k - 1] < backward[offset + k + 1]):
+                x = backward[offset + k + 1]
+            else:
+                x = backward[offset + k - 1] + 1
+            y = x - k
+            start_x, start_y = x, y
+            while x < n and y < m and a[ahi - 1 - x] == b[bhi - 1 - y]:
+                x += 1
+                y += 1
+            backward[offset + k] = x
+            if not odd and -d <= delta - k <= d:
+                if x + forward[offset + delta - k] >= n:
+                    return n - x, m - y, n - start_x, m - start_y, 2 * d
+    raise AssertionError("middle snake not found")
+
+
+def _align(a, alo, ahi, b, blo, bhi):
+    while alo < ahi and blo < bhi and a[alo] == b[blo]:
+        yield alo, blo
+        alo += 1
+        blo += 1
+    suffix = 0
+    while alo < ahi - suffix and blo < bhi - suffix and a[ahi - 1 - suffix] == b[bhi - 1 - suffix]:
+        suffix += 1
+    ahi -= suffix
+    bhi -= suffix
+    if alo == ahi:
+        for j in range(blo, bhi):
+            yield None, j
+    elif blo == bhi:
+        for i in range(alo, ahi):
+            yield i, None
+    else:
+        x, y, u, v, _ = _middle_snake(a, alo, ahi, b, blo, bhi)
+        yield from _align(a, alo, alo + x, b, blo, blo + y)
+        for step in range(u - x):
+            yield alo + x + step, blo + y + step
+        yield from _align(a, alo + u, ahi, b, blo + v, bhi)
+    for step in range(suffix):
+        yield ahi + step, bhi + step
+
+
+def align(a, b):
+    return _align(a, 0, len(a), b, 0, len(b))
+
+
+def summarize(alignment):
+    summary = {'matched': 0, 'only_static': 0, 'only_dynamic': 0,
+               'first_divergence': None}
+    for row, (i, j) in enumerate(alignment):
+        if i is not None and j is not None:
+            summary['matched'] += 1
+            continue
+        summary['only_static' if j is None else 'only_dynamic'] += 1
+        if summary['first_divergence'] is None:
+            summary['first_divergence'] = {'row': row, 'static_step': i, 'dynamic_step': j}
+    return summary
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Alinha dois traces e resume suas diferenças em JSON.")
+    parser.add_argument('static_log')
+    parser.add_argument('dynamic_log')
+    args = parser.parse_args()
+    a = signatures(read_trace(args.static_log))
+    b = signatures(read_trace(args.dynamic_log))
+    summary = summarize(align(a, b))
+    summary['static_steps'] = len(a)
+    summary['dynamic_steps'] = len(b)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""
+Este módulo implementa o formato de trace com deltas e quadros-chave. Em vez de
+repetir em cada etapa a pilha de chamadas inteira e todas as globais, cada
+registro guarda apenas o que mudou desde a etapa anterior (registros empilhados
+ou desempilhados, variáveis locais ou globais alteradas e a saída emitida), e a
+cada keyframe_interval etapas é gravado um quadro-chave com o estado completo.
+O arquivo continua sendo JSONL: a primeira linha é um cabeçalho que identifica
+o formato, seguida de um registro por etapa. O DeltaEncoder converte as
+entradas completas produzidas pelos observadores em registros, e
+decode_records/state_at reconstroem o estado completo de qualquer etapa a partir
+do quadro-chave mais próximo, no mesmo formato das entradas do trace completo;
+os deltas anteriores a esse quadro-chave são apenas lidos, sem ser aplicados.
+"""
+
+DELTA_FORMAT = 'pseudo-trace-delta'
+DELTA_FORMAT_VERSION = 1
+DEFAULT_KEYFRAME_INTERVAL = 100
+
+FRAME_KEYS = ('name', 'scope_type', 'parent', 'lex_parent')
+
+
+def _same_value(a, b):
+    return type(a) is type(b) and a == b
+
+
+def _same_frame(a, b):
+    return all(a[key] == b[key] for key in FRAME_KEYS)
+
+
+def _diff_values(previous, current, set_op, unset_op, prefix=()):
+    ops = []
+    for name, value in current.items():
+        if name not in previous or not _same_value(previous[name], value):
+            ops.append([set_op, *prefix, name, value])
+    for name in previous:
+        if name not in current:
+            ops.append([unset_op, *prefix, name])
+    return ops
+
+
+class DeltaEncoder:
+    def __init__(self, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1.")
+        self.keyframe_interval = keyframe_interval
+        self.step = 0
+        self.previous = None
+
+    def encode(self, entry):
+        records = []
+        if self.previous is None:
+            records.append({'format': DELTA_FORMAT, 'version': DELTA_FORMAT_VERSION,
+                            'scope_mode': entry['scope_mode'],
+                            'keyframe_interval': self.keyframe_interval})
+        if self.step % self.keyframe_interval == 0:
+            record = {'step': self.step, 'keyframe': True, 'action': entry['action'],
+                      'call_stack': entry['call_stack'], 'global_scope': entry['global_scope']}
+        else:
+            record = {'step': self.step, 'action': entry['action'],
+                      'ops': self._diff(self.previous, entry)}
+        if 'output' in entry:
+            record['output'] = entry['output']
+        records.append(record)
+        self.previous = entry
+        self.step += 1
+        return records
+
+    def _diff(self, previous, current):
+        previous_stack = previous['call_stack']
+        current_stack = current['call_stack']
+        common = 0
+        while (common < len(previous_stack) and common < len(current_stack)
+               and _same_frame(previous_stack[common], current_stack[common])):
+            common += 1
+        ops = []
+        if len(previous_stack) > common:
+            ops.append(['pop', len(previous_stack) - common])
+        for index in range(common):
+            ops.extend(_diff_values(previous_stack[index]['locals'], current_stack[index]['locals'],
+                                    'set', 'unset', (index,)))
+        for frame in current_stack[common:]:
+            ops.append(['push', frame])
+        ops.extend(_diff_values(previous['global_scope'], current['global_scope'],
+                                'global', 'unset_global'))
+        return ops
+
+
+def is_delta_header(record):
+    return isinstance(record, dict) and record.get('format') == DELTA_FORMAT
+
+
+def _copy_state(call_stack, global_scope):
+    return ([dict(frame, locals=dict(frame['locals'])) for frame in call_stack],
+            dict(global_scope))
+
+
+def _apply(call_stack, global_scope, ops):
+    for op in ops:
+        kind = op[0]
+        if kind == 'set':
+            call_stack[op[1]]['locals'][op[2]] = op[3]
+        elif kind == 'global':
+            global_scope[op[1]] = op[2]
+        elif kind == 'push':
+            frame = op[1]
+            call_stack.append(dict(frame, locals=dict(frame['locals'])))
+        elif kind == 'pop':
+            del call_stack[len(call_stack) - op[1]:]
+        elif kind == 'unset':
+            del call_stack[op[1]]['locals'][op[2]]
+        elif kind == 'unset_global':
+            del global_scope[op[1]]
+        else:
+            raise ValueError(f"Unknown trace operation '{kind}'.")
+
+
+def _entry(header, record, call_stack, global_scope):
+    call_stack, global_scope = _copy_state(call_stack, global_scope)
+    entry = {
+        'action': record['action'],
+        'scope_mode': header['scope_mode'],
+        'call_stack': call_stack,
+        'global_scope': global_scope
+    }
+    if 'output' in record:
+        entry['output'] = record['output']
+    return entry
+
+
+def decode_records(records, start=0):
+    records = iter(records)
+    header = next(records, None)
+    if header is None:
+        return
+    if not is_delta_header(header):
+        raise ValueError("Not a delta-encoded trace.")
+    if header.get('version') != DELTA_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported delta trace version {header.get('version')}.")
+    call_stack, global_scope = None, None
+    skipped = []
+    for record in records:
+        if record['step'] < start:
+            if record.get('keyframe'):
+                skipped = [record]
+            elif skipped:
+                skipped.append(record)
+            continue
+        if skipped:
+            call_stack, global_scope = _copy_state(
+                skipped[0]['call_stack'], skipped[0]['global_scope'])
+            for skipped_record in skipped[1:]:
+                _apply(call_stack, global_scope, skipped_record['ops'])
+            skipped = []
+        if record.get('keyframe'):
+            call_stack, global_scope = _copy_state(
+                record['call_stack'], record['global_scope'])
+        elif call_stack is None:
+            raise ValueError(
+                f"Delta record for step {record['step']} has no preceding keyframe.")
+        else:
+            _apply(call_stack, global_scope, record['ops'])
+        yield _entry(header, record, call_stack, global_scope)
+
+
+def state_at(records, step):
+    entry = next(decode_records(records, start=step), None)
+    if entry is None:
+        raise IndexError(f"Step {step} is out of range.")
+    return entry
@@ -0,0 +1,92 @@
+"""
+Este módulo implementa o gravador de traces em segundo plano usado pelo
+JsonLogObserver. O arquivo de log é aberto uma única vez; o interpretador apenas
+enfileira as entradas (já copiadas do estado corrente) em uma fila limitada, e
+uma thread gravadora as serializa em JSON e escreve em lotes, liberando o
+interpretador da serialização e das escritas no disco. Um codificador opcional
+(como o DeltaEncoder) transforma as entradas em registros na própria thread
+gravadora, e o destino dos registros é um JsonlSink (uma linha JSON por
+registro) ou outro destino com write_batch/close, como o BinaryTraceWriter.
+Quando a fila está cheia o interpretador espera a gravadora, o que limita a
+memória usada pelo buffer. close() esvazia a fila, grava o que restar e fecha o
+arquivo; ele também é chamado ao término do processo, e erros da thread
+gravadora são relançados por close().
+"""
+
+import atexit
+import json
+import queue
+import threading
+
+DEFAULT_BUFFER_SIZE = 4096
+DEFAULT_BATCH_SIZE = 256
+
+_CLOSE = object()
+
+
+class JsonlSink:
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8')
+
+    def write_batch(self, records):
+        self.file.write(''.join(
+            json.dumps(record, ensure_ascii=False) + '\n' for record in records))
+
+    def close(self):
+        self.file.close()
+
+
+class TraceWriter:
+    def __init__(self, path, buffer_size=DEFAULT_BUFFER_SIZE, batch_size=DEFAULT_BATCH_SIZE,
+                 encoder=None, sink=None):
+        self.path = path
+        self.batch_size = batch_size
+        self.encoder = encoder
+        self.sink = sink if sink is not None else JsonlSink(path)
+        self.queue = queue.Queue(maxsize=buffer_size)
+        self.error = None
+        self.closed = False
+        self.thread = threading.Thread(
+            target=self._run, name='trace-writer', daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def write(self, entry):
+        if self.closed:
+            raise ValueError(f"Trace writer for '{self.path}' is closed.")
+        if self.error is not None:
+            raise self.error
+        self.queue.put(entry)
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            closing = batch[-1] is _CLOSE
+            if closing:
+                batch.pop()
+            if batch and self.error is None:
+                try:
+                    if self.encoder is not None:
+                        batch = [record for entry in batch
+                                 for record in self.encoder.encode(entry)]
+                    self.sink.write_batch(batch)
+                except Exception as e:
+                    self.error = e
+            if closing:
+                return
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        atexit.unregister(self.close)
+        self.queue.put(_CLOSE)
+        self.thread.join()
+        self.sink.close()
+        if self.error is not None:
+            raise self.error
@@ -0,0 +1,152 @@
+"""
+Este módulo implementa a máquina virtual de pilha que executa o bytecode gerado
+por BytecodeCompiler. O laço de despacho lê pares opcode/argumento do vetor de
+instruções da função corrente e opera sobre uma pilha de valores. Chamadas não
+usam a pilha do Python: o código e o contador de programa de quem chama vão
+para uma pilha de controle própria, de modo que a profundidade só é limitada
+por max_depth. As instruções por slot implementam o escopo estático, e
+LOAD_NAME/STORE_NAME resolvem nomes pela cadeia dinâmica (profunda ou rasa).
+Com tail_calls, TAIL_CALL substitui o registro corrente em vez de empilhar um.
+"""
+
+from ast_nodes import IdentifierNode
+from bytecode import *
+from interpreter import DEFAULT_MAX_DEPTH, Interpreter, operand_error
+
+
+class VirtualMachine(Interpreter):
+    def __init__(self, ast, scope_mode, json_log_file=None, binding='deep', observer=None,
+                 program=None, max_depth=DEFAULT_MAX_DEPTH, tail_calls=False):
+        super().__init__(ast, scope_mode, json_log_file=json_log_file, binding=binding,
+                         observer=observer, max_depth=max_depth, tail_calls=tail_calls)
+        self.program = program or BytecodeCompiler(scope_mode).compile_program(ast)
+
+    def _execute_body(self, func_node):
+        self.run(self.program.functions[func_node.name])
+
+    def _load_name(self, name):
+        if self.scope_mode == 'static':
+            return self.visit_IdentifierNode(IdentifierNode(name))
+        if self.shallow_bindings:
+            frames = self.shallow_bindings.bindings.get(name)
+            if frames:
+                return frames[-1].locals[name]
+        else:
+            frame = self.call_stack.peek()
+            while frame is not None:
+                if name in frame.locals:
+                    return frame.locals[name]
+                frame = frame.parent_frame
+        global_var_info = self.global_scope.lookup_current_scope(name)
+        if global_var_info and global_var_info['type'] != 'function':
+            return global_var_info['value']
+        raise Exception(f"Dynamic Scope Error: Undefined variable '{name}'.")
+
+    def run(self, code):
+        stack = self.call_stack.stack
+        global_slots = self.global_slots
+        global_names = self.program.global_names
+        functions = self.program.functions
+        notify = self._notify
+        observes_state = self.observes_state
+        observes_calls = self.observes_calls
+        observer = self.observer
+        control = []
+        values = []
+        push = values.append
+        pop = values.pop
+        instructions = code.instructions
+        constants = code.constants
+        frame = stack[-1]
+        pc = 0
+
+        while True:
+            opcode = instructions[pc]
+            argument = instructions[pc + 1]
+            pc += 2
+
+            if opcode == LOAD_CONST:
+                push(constants[argument])
+            elif opcode == LOAD_LOCAL:
+                push(frame.slots[argument])
+            elif opcode == LOAD_GLOBAL:
+                push(global_slots[argument]['value'])
+            elif opcode == LOAD_NAME:
+                push(self._load_name(code.names[argument]))
+            elif opcode == BINARY_ADD:
+                right = pop()
+                try:
+                    values[-1] = values[-1] + right
+                except TypeError:
+                    raise operand_error('+', values[-1], right) from None
+            elif opcode == BINARY_SUB:
+                right = pop()
+                try:
+                    values[-1] = values[-1] - right
+                except TypeError:
+                    raise operand_error('-', values[-1], right) from None
+            elif opcode == STORE_LOCAL:
+                name = code.local_names[argument]
+                value = pop()
+                frame.set_slot(argument, name, value)
+                if observes_state:
+                    notify(f"Assignment: {name} = {value}")
+            elif opcode == STORE_GLOBAL:
+                value = pop()
+                global_slots[argument]['value'] = value
+                if observes_state:
+                    notify(f"Assignment: {global_names[argument]} = {value}")
+            elif opcode == STORE_NAME:
+                self._assign(IdentifierNode(code.names[argument]), pop())
+            elif opcode == DECLARE:
+                name, default_value, slot = code.declarations[argument]
+                if slot is not None:
+                    frame.set_slot(slot, name, default_value)
+                elif self.shallow_bindings:
+                    self.shallow_bindings.bind(frame, name, default_value)
+                else:
+                    frame.set_local(name, default_value)
+            elif opcode == PRINT:
+                self._output(pop())
+            elif opcode == PRINT_BUILTIN:
+                self.observer.on_output(self, pop() if argument else "(empty line)")
+            elif opcode == CALL or opcode == TAIL_CALL:
+                func_name, argc = code.calls[argument]
+                func_info = self.global_scope.lookup(func_name)
+                if not func_info:
+                    raise Exception(
+                        f"Call error: Function '{func_name}' not defined.")
+                evaluated_args = values[len(values) - argc:]
+                del values[len(values) - argc:]
+                if opcode == TAIL_CALL and self.tail_calls:
+                    frame = self._replace_frame(
+                        func_name, func_info, func_info['node'], evaluated_args)
+                else:
+                    frame = self._create_frame(
+                        func_name, func_info, func_info['node'], evaluated_args)
+                    stack.append(frame)
+                    if observes_state:
+                        notify(f"Function Call: {func_name}")
+                    if observes_calls:
+                        observer.on_call(self, func_name)
+                    control.append((code, pc))
+                code = functions[func_name]
+                instructions = code.instructions
+                constants = code.constants
+                pc = 0
+            elif opcode == RETURN:
+                if not control:
+                    return
+                self._pop_frame(frame)
+                if observes_state:
+                    notify(f"Function Return: {code.name}")
+                if observes_calls:
+                    observer.on_return(self, code.name)
+                code, pc = control.pop()
+                instructions = code.instructions
+                constants = code.constants
+                frame = stack[-1]
+            elif opcode == FAIL:
+                raise Exception(constants[argument])
+            else:
+                raise Exception(f"Invalid opcode {opcode} at offset {pc - 2} in '{code.name}'")
@@ -0,0 +1,108 @@
+"""
+Teste diferencial da análise fundida do frontend: o SemanticChecker seguido do
+StaticScopeResolver é mantido como implementação de referência, e o
+ProgramAnalyzer deve produzir exatamente as mesmas anotações na AST (slots,
+endereços léxicos, tipos inferidos e tamanho dos registros) e os mesmos erros,
+na mesma ordem de prioridade, nos dois modos de escopo.
+"""
+
+import glob
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from analyzer import ProgramAnalyzer
+from ast_nodes import ASTNode
+from lexer import Lexer
+from parser import Parser
+from program_generator import generate_program
+from scope_resolver import StaticScopeResolver
+from semantic_checker import SemanticChecker
+from symbol_table import SymbolTable
+
+EXAMPLES = sorted(glob.glob(os.path.join(ROOT, 'src', 'exemples', '*.pseudo')))
+
+INVALID_SOURCES = [
+    "main() { x = 1; }",
+    "int x; main() { x = 'a'; }",
+    "int x; main() { x = y + 1; }",
+    "def f(int a) { print(a); } main() { f(); }",
+    "def f(int a) { print(a); } main() { f('a'); }",
+    "main() { g(); }",
+    "def f() { x = 1; } int x; main() { f(); }",
+    "def f() { g(); } def g() { print(1); } main() { f(); }",
+    "def f() { x = 1; } int x; main() { y = 2; }",
+]
+
+
+def _parse(source):
+    lexer = Lexer(source)
+    return Parser(lexer.get_tokens(), lexer.lines).parse_program()
+
+
+def _reference(source, scope_mode):
+    ast = _parse(source)
+    SemanticChecker().visit(ast)
+    if scope_mode == 'static':
+        StaticScopeResolver().visit(ast)
+    return ast
+
+
+def _fused(source, scope_mode):
+    ast = _parse(source)
+    ProgramAnalyzer(resolve=scope_mode == 'static').visit(ast)
+    return ast
+
+
+def _annotations(value):
+    # A marcação de chamadas de cauda só existe na análise fundida.
+    if isinstance(value, list):
+        return [_annotations(item) for item in value]
+    if isinstance(value, ASTNode):
+        return (type(value).__name__,
+                {name: _annotations(getattr(value, name, None))
+                 for name in type(value).__slots__ if name != 'tail'})
+    if isinstance(value, SymbolTable):
+        return value.name
+    if isinstance(value, dict):
+        return {key: (type(item).__name__, getattr(item, 'name', getattr(item, 'var_name', None)))
+                if key == 'node' else _annotations(item) for key, item in value.items()}
+    return value
+
+
+def _error(analyze, source, scope_mode):
+    try:
+        analyze(source, scope_mode)
+    except Exception as e:
+        return str(e)
+    return None
+
+
+def _sources():
+    sources = [pytest.param(generate_program(seed), id=f'seed-{seed}') for seed in range(10)]
+    for path in EXAMPLES:
+        with open(path, encoding='utf-8') as f:
+            sources.append(pytest.param(f.read(), id=os.path.basename(path)))
+    return sources
+
+
+@pytest.mark.parametrize('scope_mode', ['static', 'dynamic'])
+@pytest.mark.parametrize('source', _sources())
+def test_fused_analysis_matches_reference_annotations(source, scope_mode):
+    error = _error(_reference, source, scope_mode)
+    assert _error(_fused, source, scope_mode) == error
+    if error is None:
+        assert _annotations(_fused(source, scope_mode)) == \
+            _annotations(_reference(source, scope_mode))
+
+
+@pytest.mark.parametrize('scope_mode', ['static', 'dynamic'])
+@pytest.mark.parametrize('source', INVALID_SOURCES)
+def test_fused_analysis_matches_reference_errors(source, scope_mode):
+    error = _error(_reference, source, scope_mode)
+    assert error is not None or scope_mode == 'dynamic'
+    assert _error(_fused, source, scope_mode) == error
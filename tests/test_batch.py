@@ -0,0 +1,72 @@
+"""
+Testes do executor de lotes: cada tarefa termina com sua situação (ok, error ou
+timeout) e o tempo gasto até terminar, inclusive quando o frontend falha ou o
+tempo limite é atingido, e a morte de um processo do pool é registrada como
+erro das tarefas afetadas em vez de interromper o lote.
+"""
+
+import multiprocessing
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import batch
+from batch import run_batch
+from program_generator import generate_program
+
+EXAMPLE = os.path.join(ROOT, 'src', 'exemples', 'exemple4_funcoes_tipos.pseudo')
+
+
+def _write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def _kill_worker(*args, **kwargs):
+    os._exit(1)
+
+
+def test_results_and_summary(tmp_path):
+    broken = _write(tmp_path, 'broken.pseudo', "main() { x = ; }")
+    report = run_batch([EXAMPLE, broken], workers=2)
+    results = {(os.path.basename(record['file']), record['scope_mode']): record
+               for record in report['results']}
+    for scope_mode in ('static', 'dynamic'):
+        ok = results[('exemple4_funcoes_tipos.pseudo', scope_mode)]
+        assert ok['status'] == 'ok' and ok['output'] == [7.25, 4.75, 'Z']
+        failed = results[('broken.pseudo', scope_mode)]
+        assert failed['status'] == 'error' and failed['error'].startswith("Parser error")
+        assert failed['run_time'] > 0
+    summary = report['summary']
+    assert (summary['tasks'], summary['ok'], summary['errors'], summary['timeouts']) == (4, 2, 2, 0)
+    assert summary['task_time'] == pytest.approx(
+        sum(record['frontend_time'] + record['run_time'] for record in report['results']))
+
+
+def test_per_task_timeout(tmp_path):
+    # Com fanout 4, a cadeia mais longa executa 4 ** 11 corpos de função.
+    slow = _write(tmp_path, 'slow.pseudo',
+                  generate_program(0, functions=12, call_depth=12, fanout=4))
+    report = run_batch([slow, EXAMPLE], scope_modes=('static',), workers=1, timeout=0.2)
+    statuses = {os.path.basename(record['file']): record for record in report['results']}
+    timed_out = statuses['slow.pseudo']
+    assert timed_out['status'] == 'timeout'
+    assert timed_out['error'] == "Timed out after 0.2s."
+    assert 0.2 <= timed_out['run_time'] < 5
+    assert statuses['exemple4_funcoes_tipos.pseudo']['status'] == 'ok'
+    assert report['summary']['timeouts'] == 1
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                    reason="the patched run_mode only reaches forked workers")
+def test_terminated_worker_is_reported(monkeypatch):
+    monkeypatch.setattr(batch, 'run_mode', _kill_worker)
+    report = run_batch([EXAMPLE], workers=1)
+    assert [record['status'] for record in report['results']] == ['error', 'error']
+    assert {record['error'] for record in report['results']} == {"Worker process terminated."}
+    assert report['summary']['errors'] == 2
@@ -0,0 +1,84 @@
+"""
+Testes de ida e volta do formato binário de trace: a leitura de qualquer etapa
+e a partir de qualquer etapa, a continuação de um arquivo existente, a
+reconstrução do índice de um arquivo sem rodapé e a leitura por read_trace dos
+arquivos gravados por JsonLogObserver em cada formato. Os traces são os de
+execuções reais de programas gerados por program_generator.py, registrados por
+RecordingObserver.
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from binary_trace import BinaryTraceReader, BinaryTraceWriter, TRAILER, read_trace
+from frontend import analyze
+from interpreter import Interpreter
+from lexer import Lexer
+from observers import CompositeObserver, JsonLogObserver, RecordingObserver
+from parser import Parser
+from program_generator import generate_program
+
+
+def _execute(scope_mode, observer, seed=3):
+    source = generate_program(seed, functions=6, call_depth=3, fanout=2)
+    lexer = Lexer(source)
+    ast = analyze(Parser(lexer.get_tokens(), lexer.lines).parse_program(), scope_mode)
+    Interpreter(ast, scope_mode, observer=observer).interpret()
+
+
+def _trace(scope_mode='dynamic'):
+    recorder = RecordingObserver(record_states=True)
+    _execute(scope_mode, recorder)
+    return recorder.trace
+
+
+@pytest.mark.parametrize('codec', ['zlib', 'lzma'])
+def test_binary_seek_and_append(tmp_path, codec):
+    trace = _trace()
+    half = len(trace) // 2
+    path = str(tmp_path / 'trace.bin')
+    writer = BinaryTraceWriter(path, codec=codec, chunk_size=4)
+    writer.write_batch(trace[:half])
+    writer.close()
+    writer = BinaryTraceWriter(path, chunk_size=4, append=True)
+    writer.write_batch(trace[half:])
+    writer.close()
+
+    with BinaryTraceReader(path) as reader:
+        assert reader.codec == codec
+        assert len(reader) == len(trace)
+        steps = list(range(len(trace)))
+        random.Random(0).shuffle(steps)
+        for step in steps:
+            assert reader.read_step(step) == trace[step]
+        assert list(reader.entries(half - 1)) == trace[half - 1:]
+        with pytest.raises(IndexError):
+            reader.read_step(len(trace))
+
+
+def test_binary_index_is_rebuilt_without_footer(tmp_path):
+    trace = _trace()
+    path = str(tmp_path / 'trace.bin')
+    writer = BinaryTraceWriter(path, chunk_size=4)
+    writer.write_batch(trace)
+    writer.close()
+    with open(path, 'r+b') as f:
+        f.truncate(f.seek(0, os.SEEK_END) - TRAILER.size)
+    with BinaryTraceReader(path) as reader:
+        assert list(reader) == trace
+
+
+@pytest.mark.parametrize('trace_format', ['full', 'delta', 'binary'])
+def test_json_log_observer_round_trip(tmp_path, trace_format):
+    path = str(tmp_path / 'trace.log')
+    recorder = RecordingObserver(record_states=True)
+    log = JsonLogObserver(path, trace_format=trace_format, keyframe_interval=3)
+    _execute('static', CompositeObserver([recorder, log]))
+    log.close()
+    assert list(read_trace(path)) == recorder.trace
+    assert list(read_trace(path, start=5)) == recorder.trace[5:]
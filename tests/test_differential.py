@@ -0,0 +1,86 @@
+"""
+Teste diferencial dos motores de execução sobre programas gerados por
+program_generator.py. Para cada semente, o programa é executado em todas as
+combinações de motor, modo de escopo, vinculação (no escopo dinâmico), nível
+de otimização e tail_calls (nos motores que o aceitam), e a saída e o erro de
+cada execução devem coincidir com os do percurso da AST (tree) sem otimizações
+no mesmo modo de escopo. O trace registrado (ação e estado de cada etapa) deve
+coincidir com o do tree com o mesmo nível de otimização e tail_calls, já que
+as otimizações e as chamadas de cauda mudam as etapas, mas não a saída.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from engines import ENGINES, TAIL_CALL_ENGINES
+from frontend import analyze
+from lexer import Lexer
+from observers import RecordingObserver
+from optimizer import OptimizationPipeline
+from parser import Parser
+from program_generator import generate_program
+
+SEEDS = range(60)
+SCOPE_MODES = ('static', 'dynamic')
+OPT_LEVELS = (0, 1, 2)
+
+
+def _knobs(seed):
+    return {
+        'functions': 2 + seed % 9,
+        'call_depth': 1 + seed % 5,
+        'locals_per_frame': seed % 4,
+        'shadowing': (seed % 5) / 4,
+        'fanout': 1 + seed % 3,
+    }
+
+
+def _configurations(scope_mode):
+    bindings = ('deep', 'shallow') if scope_mode == 'dynamic' else ('deep',)
+    for engine in sorted(ENGINES):
+        for binding in bindings:
+            for opt_level in OPT_LEVELS:
+                for tail_calls in ((False, True) if engine in TAIL_CALL_ENGINES else (False,)):
+                    yield engine, binding, opt_level, tail_calls
+
+
+def _run(source, scope_mode, engine, binding, opt_level, tail_calls):
+    lexer = Lexer(source)
+    ast = analyze(Parser(lexer.get_tokens(), lexer.lines).parse_program(), scope_mode)
+    OptimizationPipeline.for_level(opt_level).run(ast, scope_mode)
+    observer = RecordingObserver(record_states=True)
+    options = {'tail_calls': True} if tail_calls else {}
+    error = None
+    try:
+        ENGINES[engine](ast, scope_mode, binding=binding, observer=observer,
+                        **options).interpret()
+    except Exception as e:
+        error = str(e)
+    return (observer.outputs, error), (observer.actions, observer.trace)
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_engines_agree_on_generated_program(seed):
+    source = generate_program(seed, **_knobs(seed))
+    mismatches = []
+    trace_mismatches = []
+    for scope_mode in SCOPE_MODES:
+        expected_traces = {}
+        for opt_level in OPT_LEVELS:
+            for tail_calls in (False, True):
+                expected_traces[opt_level, tail_calls] = _run(
+                    source, scope_mode, 'tree', 'deep', opt_level, tail_calls)
+        expected = expected_traces[0, False][0]
+        for configuration in _configurations(scope_mode):
+            result, trace = _run(source, scope_mode, *configuration)
+            _, _, opt_level, tail_calls = configuration
+            if result != expected:
+                mismatches.append((scope_mode,) + configuration)
+            if trace != expected_traces[opt_level, tail_calls][1]:
+                trace_mismatches.append((scope_mode,) + configuration)
+    assert not mismatches, f"seed {seed}: outputs differ from tree -O0 in {mismatches}"
+    assert not trace_mismatches, f"seed {seed}: traces differ from tree in {trace_mismatches}"
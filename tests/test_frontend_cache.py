@@ -0,0 +1,83 @@
+"""
+Testes do cache de artefatos do frontend (.pseudoc): a chave muda com o fonte,
+o modo de escopo e a versão do frontend, e entradas corrompidas são descartadas
+em vez de carregadas.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import frontend_cache
+from frontend import load_program
+from frontend_cache import FrontendCache
+from interpreter import Interpreter
+from observers import RecordingObserver
+
+SOURCE = (
+    "int x; // comentário com acentuação: ção\r\n"
+    "char c;\r\n"
+    "def f(int a) {\r\n"
+    "    x = a + 1;\r\n"
+    "    c = 'é';\r\n"
+    "}\r\n"
+    "main() {\r\n"
+    "    f(41);\r\n"
+    "    print(x);\r\n"
+    "}\r\n"
+)
+
+
+def _write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_bytes(text.encode('utf-8'))
+    return str(path)
+
+
+def test_cache_key_changes_with_source_scope_and_version(tmp_path, monkeypatch):
+    cache = FrontendCache(str(tmp_path / 'cache'))
+    path = _write(tmp_path, 'program.pseudo', SOURCE)
+    key = cache.key_for(path, 'static')
+    assert cache.key_for(path, 'static') == key
+    assert cache.key_for(path, 'dynamic') != key
+    _write(tmp_path, 'program.pseudo', SOURCE.replace('41', '42'))
+    assert cache.key_for(path, 'static') != key
+    changed_key = cache.key_for(path, 'static')
+    monkeypatch.setattr(frontend_cache, 'FRONTEND_VERSION', frontend_cache.FRONTEND_VERSION + 1)
+    assert cache.key_for(path, 'static') != changed_key
+
+
+def _run(ast, scope_mode):
+    observer = RecordingObserver(record_actions=False)
+    Interpreter(ast, scope_mode, observer=observer).interpret()
+    return observer.outputs
+
+
+def test_cache_is_used_and_invalidated_when_the_source_changes(tmp_path):
+    cache = FrontendCache(str(tmp_path / 'cache'))
+    path = _write(tmp_path, 'program.pseudo', SOURCE)
+    assert _run(load_program(path, 'static', cache=cache), 'static') == [42]
+    key = cache.key_for(path, 'static')
+    assert cache.load(key) is not None
+    assert _run(load_program(path, 'static', cache=cache), 'static') == [42]
+
+    _write(tmp_path, 'program.pseudo', SOURCE.replace('41', '9'))
+    assert cache.load(cache.key_for(path, 'static')) is None
+    assert _run(load_program(path, 'static', cache=cache), 'static') == [10]
+    assert cache.load(cache.key_for(path, 'static')) is not None
+
+
+def test_cache_rejects_corrupted_entries(tmp_path):
+    cache = FrontendCache(str(tmp_path / 'cache'))
+    path = _write(tmp_path, 'program.pseudo', SOURCE)
+    load_program(path, 'static', cache=cache)
+    key = cache.key_for(path, 'static')
+    entry = cache.path_for(key)
+    with open(entry, 'r+b') as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+    assert cache.load(key) is None
+    assert not os.path.exists(entry)
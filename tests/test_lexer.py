@@ -0,0 +1,71 @@
+"""
+Testes do Lexer e do Parser: as posições linha:coluna reportadas nos erros e
+guardadas nos tokens, contadas a partir do início de cada linha. O
+StreamingLexer deve produzir os mesmos tokens e posições que a leitura
+completa, qualquer que seja o tamanho dos blocos lidos.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from lexer import Lexer, StreamingLexer
+from parser import Parser
+
+SOURCE = (
+    "int x; // comentário com acentuação: ção\r\n"
+    "char c;\r\n"
+    "def f(int a) {\r\n"
+    "    x = a + 1;\r\n"
+    "    c = 'é';\r\n"
+    "}\r\n"
+    "main() {\r\n"
+    "    f(41);\r\n"
+    "    print(x);\r\n"
+    "}\r\n"
+)
+
+
+def _write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_bytes(text.encode('utf-8'))
+    return str(path)
+
+
+def test_lexer_reports_line_and_column():
+    with pytest.raises(Exception, match="line 3, column 11: '\\$'"):
+        Lexer("int x;\nmain() {\n    x = 1 $ 2;\n}\n")
+
+    lexer = Lexer("int x;\nmain() {\n  x = 1;\n}\n")
+    assignment = next(token for token in lexer.get_tokens() if token.type == '=')
+    assert lexer.lines.format(assignment.pos) == "line 3, column 5"
+
+
+def test_parser_reports_line_and_column():
+    lexer = Lexer("int x;\nmain() {\n    x = ;\n}\n")
+    with pytest.raises(Exception, match="line 3, column 9"):
+        Parser(lexer.get_tokens(), lexer.lines).parse_program()
+
+
+@pytest.mark.parametrize('block_size', [1, 7, 1 << 16])
+def test_streaming_lexer_matches_lexer(tmp_path, monkeypatch, block_size):
+    path = _write(tmp_path, 'program.pseudo', SOURCE)
+    with open(path, 'rb') as f:
+        expected = Lexer(f.read().decode('utf-8').replace('\r\n', '\n'))
+    monkeypatch.setattr(StreamingLexer, 'BLOCK_SIZE', block_size)
+    with StreamingLexer(path) as lexer:
+        tokens = list(lexer.tokens())
+        positions = [lexer.lines.format(token.pos) for token in tokens]
+    assert [(token.type, token.value, token.pos) for token in tokens] == \
+        [(token.type, token.value, token.pos) for token in expected.get_tokens()]
+    assert positions == [expected.lines.format(token.pos) for token in expected.get_tokens()]
+
+
+def test_streaming_lexer_reports_line_and_column(tmp_path, monkeypatch):
+    path = _write(tmp_path, 'broken.pseudo', "int x;\r\nmain() {\r\n  x = 1 $ 2;\r\n}\r\n")
+    monkeypatch.setattr(StreamingLexer, 'BLOCK_SIZE', 5)
+    with StreamingLexer(path) as lexer, pytest.raises(Exception, match="line 3, column 9"):
+        list(lexer.tokens())
@@ -0,0 +1,103 @@
+"""
+Testes do ponto de entrada: código de saída do processo, separação entre erros
+do programa (mensagem "An error occurred", sem traceback) e erros internos do
+interpretador (com traceback), e relatório JSON de --stats.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from engines import ENGINES
+from interpreter import Interpreter
+from main import run_simulation
+
+MAIN = os.path.join(ROOT, 'src', 'main.py')
+EXAMPLE = os.path.join(ROOT, 'src', 'exemples', 'exemple4_funcoes_tipos.pseudo')
+
+TYPE_ERROR_SOURCE = """
+int x;
+main() {
+    x = 1;
+    print('A' + x);
+}
+"""
+
+
+def _main(*args):
+    return subprocess.run([sys.executable, MAIN, *args, '--no-cache'],
+                          capture_output=True, text=True, encoding='utf-8')
+
+
+def test_successful_run_exits_with_zero():
+    result = _main(EXAMPLE, '--static')
+    assert result.returncode == 0
+    assert "OUTPUT: 7.25" in result.stdout
+
+
+@pytest.mark.parametrize('engine', sorted(ENGINES))
+def test_operand_type_failure_is_a_program_error(tmp_path, engine):
+    path = tmp_path / 'type_error.pseudo'
+    path.write_text(TYPE_ERROR_SOURCE)
+    result = _main(str(path), '--dynamic', '--engine', engine)
+    assert result.returncode == 1
+    assert ("An error occurred: Runtime error: unsupported operand types for '+': "
+            "char and int") in result.stdout
+    assert "Traceback" not in result.stdout + result.stderr
+
+
+def test_internal_error_keeps_its_traceback(monkeypatch, capsys):
+    def broken(self, node):
+        raise TypeError("internal failure")
+
+    monkeypatch.setattr(Interpreter, 'visit_PrintNode', broken)
+    assert not run_simulation(EXAMPLE, 'static')
+    captured = capsys.readouterr()
+    assert "An error occurred: internal failure" in captured.out
+    assert "Traceback" in captured.err
+    assert "TypeError: internal failure" in captured.err
+
+
+@pytest.mark.parametrize('engine', ['tree', 'vm'])
+def test_stats_report(tmp_path, engine):
+    stats_file = tmp_path / 'stats.json'
+    assert run_simulation(EXAMPLE, 'static', engine=engine, stats_file=str(stats_file))
+    report = json.loads(stats_file.read_text())
+    assert report['status'] == 'ok' and report['error'] is None
+    assert report['engine'] == engine
+    for phase in ('reading', 'lexing', 'parsing', 'analysis', 'optimization', 'interpretation'):
+        assert report['phases'][phase]['calls'] == 1
+        assert report['phases'][phase]['wall'] >= 0
+    counters = report['counters']
+    assert counters['frames_pushed'] == 3
+    assert counters['max_stack_depth'] == 2
+    if engine == 'tree':
+        assert counters['node_visits']['CallNode'] == 2
+        assert counters['lookups']['writes'] == 4
+    else:
+        assert counters['node_visits'] is None and counters['lookups'] is None
+
+
+def test_stats_report_of_a_failed_run(tmp_path):
+    path = tmp_path / 'type_error.pseudo'
+    path.write_text(TYPE_ERROR_SOURCE)
+    stats_file = tmp_path / 'stats.json'
+    result = _main(str(path), '--static', '--stats', str(stats_file))
+    assert result.returncode == 1
+    report = json.loads(stats_file.read_text())
+    assert report['status'] == 'error'
+    assert report['error'].startswith("Runtime error: unsupported operand types")
+
+
+def test_quickening_reports_no_partial_counters(tmp_path):
+    stats_file = tmp_path / 'stats.json'
+    assert run_simulation(EXAMPLE, 'static', engine='quickening', stats_file=str(stats_file))
+    counters = json.loads(stats_file.read_text())['counters']
+    assert counters['frames_pushed'] == 3
+    assert counters['node_visits'] is None and counters['lookups'] is None
@@ -0,0 +1,117 @@
+"""
+Testes do pipeline de otimizações: cada nível (-O0, -O1, -O2) aplica os seus
+passes, e as funções só alcançáveis a partir de funções inalcançáveis também
+são removidas; o constant folding substitui só as subárvores formadas por
+literais numéricos, com o tipo e o valor calculados pelo interpretador; e a
+eliminação de atribuições mortas remove as atribuições sobrescritas antes de
+serem lidas e, no escopo dinâmico, preserva os valores visíveis às funções
+chamadas.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from ast_nodes import AssignNode, FloatNode, IntegerNode, PrintNode
+from frontend import analyze
+from interpreter import Interpreter
+from lexer import Lexer
+from observers import RecordingObserver
+from optimizer import ConstantFolder, OptimizationPipeline
+from parser import Parser
+
+FOLDING_SOURCE = """
+float f;
+main() {
+    f = 1 + 2 + 0.5;
+    f = f + 1 + 2;
+    print(10 - 4);
+    print(f);
+}
+"""
+
+UNREACHABLE_SOURCE = """
+def helper() {
+    print(1);
+}
+def unused() {
+    helper();
+}
+def used() {
+    print(2 + 3);
+}
+main() {
+    used();
+}
+"""
+
+DEAD_STORE_SOURCE = """
+int x;
+def show() {
+    print(x);
+}
+main() {
+    int x;
+    x = 1;
+    show();
+    x = 2;
+    show();
+    x = 3;
+    x = 4;
+    print(x);
+}
+"""
+
+
+def _analyze(source, scope_mode):
+    lexer = Lexer(source)
+    return analyze(Parser(lexer.get_tokens(), lexer.lines).parse_program(), scope_mode)
+
+
+def _outputs(ast, scope_mode):
+    observer = RecordingObserver(record_actions=False)
+    Interpreter(ast, scope_mode, observer=observer).interpret()
+    return observer.outputs
+
+
+def test_constant_folding_keeps_types_and_evaluation_order():
+    ast = _analyze(FOLDING_SOURCE, 'static')
+    assert ConstantFolder().run(ast, 'static') == 3
+    folded, unfolded, printed, _ = ast.declarations[-1].body.statements
+    assert isinstance(folded, AssignNode) and type(folded.expression) is FloatNode
+    assert folded.expression.value == 3.5
+    assert not isinstance(unfolded.expression, (IntegerNode, FloatNode))
+    assert isinstance(printed, PrintNode) and type(printed.expression) is IntegerNode
+    assert printed.expression.value == 6
+    assert _outputs(ast, 'static') == [6, 6.5]
+
+
+@pytest.mark.parametrize('level, fold, expected', [
+    (0, True, {}),
+    (1, True, {'constant-folding': 1, 'unreachable-functions': 2}),
+    (1, False, {'unreachable-functions': 2}),
+    (2, True, {'constant-folding': 1, 'unreachable-functions': 2, 'dead-stores': 0}),
+])
+def test_pipeline_levels(level, fold, expected):
+    ast = _analyze(UNREACHABLE_SOURCE, 'static')
+    counts = dict((optimization.name, count) for optimization, count in
+                  OptimizationPipeline.for_level(level, fold=fold).run(ast, 'static'))
+    assert counts == expected
+    names = [declaration.name for declaration in ast.declarations]
+    assert names == (['helper', 'unused', 'used', 'main'] if level == 0 else ['used', 'main'])
+    assert _outputs(ast, 'static') == [5]
+
+
+@pytest.mark.parametrize('scope_mode, removed, outputs', [
+    ('static', 3, [None, None, 4]),
+    ('dynamic', 1, [1, 2, 4]),
+])
+def test_dead_store_elimination_respects_scope(scope_mode, removed, outputs):
+    ast = _analyze(DEAD_STORE_SOURCE, scope_mode)
+    counts = dict((optimization.name, count) for optimization, count in
+                  OptimizationPipeline.for_level(2).run(ast, scope_mode))
+    assert counts['dead-stores'] == removed
+    assert _outputs(ast, scope_mode) == outputs
@@ -0,0 +1,94 @@
+"""
+Testes do PseudoProfiler com um relógio falso que avança uma unidade a cada
+leitura: o tempo próprio e o acumulado de cada função, as pilhas colapsadas e
+as chamadas de cauda são os mesmos em todos os motores, e o profiler não ativa
+a descrição das etapas da execução.
+"""
+
+import itertools
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from engines import ENGINES, TAIL_CALL_ENGINES
+from frontend import load_program
+from observers import CompositeObserver, StdoutObserver
+from profiler import PseudoProfiler
+
+NESTED_CALLS = """
+int x;
+def g() {
+    x = x + 1;
+}
+def f() {
+    g();
+    print(x);
+}
+main() {
+    x = 0;
+    f();
+    g();
+    print(x);
+}
+"""
+
+TAIL_CALL = """
+def g() {
+    print(1);
+}
+def f() {
+    print(0);
+    g();
+}
+main() {
+    f();
+    print(2);
+}
+"""
+
+
+def _profile(tmp_path, source, engine, scope_mode, **options):
+    path = tmp_path / 'program.pseudo'
+    path.write_text(source)
+    ast = load_program(str(path), scope_mode)
+    profiler = PseudoProfiler(clock=itertools.count().__next__)
+    ENGINES[engine](ast, scope_mode, observer=profiler, **options).interpret()
+    return profiler
+
+
+@pytest.mark.parametrize('scope_mode', ['static', 'dynamic'])
+@pytest.mark.parametrize('engine', sorted(ENGINES))
+def test_self_and_cumulative_time(tmp_path, engine, scope_mode):
+    # Leituras do relógio: main 0, f 1, g 2, fim de g 3, fim de f 4, g 5,
+    # fim de g 6, fim de main 7.
+    profiler = _profile(tmp_path, NESTED_CALLS, engine, scope_mode)
+    summary = {profile.name: (profile.calls, profile.self_time,
+                              profile.cumulative_time, profile.statements)
+               for profile in profiler.profiles()}
+    assert summary == {'main': (1, 3, 7, 4), 'f': (1, 2, 3, 2), 'g': (2, 2, 2, 2)}
+    assert profiler.total_time() == 7
+    assert profiler.collapsed_lines() == [
+        "main 3000000", "main;f 2000000", "main;f;g 1000000", "main;g 1000000"]
+
+
+@pytest.mark.parametrize('engine', TAIL_CALL_ENGINES)
+def test_tail_call_ends_the_caller(tmp_path, engine):
+    profiler = _profile(tmp_path, TAIL_CALL, engine, 'static', tail_calls=True)
+    assert profiler.collapsed_lines() == ["main 3000000", "main;f 1000000", "main;g 1000000"]
+
+
+def test_collapsed_file(tmp_path):
+    profiler = _profile(tmp_path, NESTED_CALLS, 'tree', 'static')
+    collapsed = tmp_path / 'profile.folded'
+    profiler.write_collapsed(str(collapsed))
+    assert collapsed.read_text().splitlines() == profiler.collapsed_lines()
+
+
+def test_profiler_observes_calls_without_states():
+    observer = CompositeObserver([PseudoProfiler(), StdoutObserver()])
+    assert observer.observes_calls
+    assert not observer.observes_state
@@ -0,0 +1,63 @@
+"""
+Testes do limite de profundidade de chamadas: os motores de pilha explícita
+(EXPLICIT_STACK_ENGINES) executam recursões muito mais profundas que o limite
+de recursão do Python e param exatamente em max_depth; os motores recursivos
+terminam com o mesmo erro de estouro de pilha da linguagem ao esgotar a pilha
+do Python. A recursão infinita de exemple6_recursao.pseudo imprime três valores
+por chamada.
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from engines import ENGINES, EXPLICIT_STACK_ENGINES
+from frontend import load_program
+from main import build_arg_parser
+from observers import RecordingObserver
+
+RECURSION_EXAMPLE = os.path.join(ROOT, 'src', 'exemples', 'exemple6_recursao.pseudo')
+MAX_DEPTH = 3000
+
+
+def _overflow(engine, scope_mode, max_depth=MAX_DEPTH):
+    ast = load_program(RECURSION_EXAMPLE, scope_mode)
+    observer = RecordingObserver(record_actions=False)
+    with pytest.raises(Exception, match="^Stack overflow: ") as error:
+        ENGINES[engine](ast, scope_mode, observer=observer, max_depth=max_depth).interpret()
+    return str(error.value), observer.outputs
+
+
+@pytest.mark.parametrize('scope_mode', ['static', 'dynamic'])
+@pytest.mark.parametrize('engine', EXPLICIT_STACK_ENGINES)
+def test_explicit_stack_engines_reach_max_depth(engine, scope_mode):
+    message, outputs = _overflow(engine, scope_mode)
+    assert message == (f"Stack overflow: maximum call depth of {MAX_DEPTH} exceeded. "
+                       f"Call chain: main -> f4 (x{MAX_DEPTH})")
+    assert len(outputs) == 3 * (MAX_DEPTH - 1)
+    assert outputs[:3] == [1, 3.14, 'Z']
+
+
+@pytest.mark.parametrize('engine', sorted(set(ENGINES) - set(EXPLICIT_STACK_ENGINES)))
+def test_recursive_engines_report_python_recursion_limit(engine):
+    message, outputs = _overflow(engine, 'static')
+    assert message.startswith("Stack overflow: Python recursion limit reached at call depth ")
+    assert "Call chain: main -> f4 (x" in message
+    assert 0 < len(outputs) < 3 * (MAX_DEPTH - 1)
+
+
+@pytest.mark.parametrize('engine', sorted(ENGINES))
+def test_lower_max_depth_is_enforced_by_every_engine(engine):
+    message, outputs = _overflow(engine, 'static', max_depth=50)
+    assert message == ("Stack overflow: maximum call depth of 50 exceeded. "
+                       "Call chain: main -> f4 (x50)")
+    assert len(outputs) == 3 * 49
+
+
+def test_max_depth_help_names_the_explicit_stack_engines():
+    help_text = " ".join(build_arg_parser().format_help().split())
+    assert "só os motores " + ", ".join(EXPLICIT_STACK_ENGINES) + " alcançam" in help_text
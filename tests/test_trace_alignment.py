@@ -0,0 +1,74 @@
+"""
+Testes do alinhamento de traces: align deve produzir uma maior subsequência
+comum das assinaturas das ações, e summarize deve contar as etapas pareadas e
+exclusivas de cada modo e apontar a primeira divergência entre os traces
+estático e dinâmico de um programa gerado por program_generator.py.
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from frontend import analyze
+from interpreter import Interpreter
+from lexer import Lexer
+from observers import RecordingObserver
+from parser import Parser
+from program_generator import generate_program
+from trace_alignment import action_signatures, align, summarize
+
+
+def _execute(scope_mode, observer, seed=3):
+    source = generate_program(seed, functions=6, call_depth=3, fanout=2)
+    lexer = Lexer(source)
+    ast = analyze(Parser(lexer.get_tokens(), lexer.lines).parse_program(), scope_mode)
+    Interpreter(ast, scope_mode, observer=observer).interpret()
+
+
+def _trace(scope_mode='dynamic'):
+    recorder = RecordingObserver(record_states=True)
+    _execute(scope_mode, recorder)
+    return recorder.trace
+
+
+def _lcs_length(a, b):
+    previous = [0] * (len(b) + 1)
+    for x in a:
+        current = [0]
+        for j, y in enumerate(b):
+            current.append(previous[j] + 1 if x == y else max(previous[j + 1], current[j]))
+        previous = current
+    return previous[-1]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_alignment_is_a_longest_common_subsequence(seed):
+    rng = random.Random(seed)
+    a = [rng.choice('abcd') for _ in range(rng.randint(0, 40))]
+    b = [rng.choice('abcd') for _ in range(rng.randint(0, 40))]
+    alignment = list(align(action_signatures(a), action_signatures(b)))
+    assert [i for i, _ in alignment if i is not None] == list(range(len(a)))
+    assert [j for _, j in alignment if j is not None] == list(range(len(b)))
+    matched = [(i, j) for i, j in alignment if i is not None and j is not None]
+    assert all(a[i] == b[j] for i, j in matched)
+    assert len(matched) == _lcs_length(a, b)
+
+
+def test_alignment_summary_of_static_and_dynamic_traces():
+    static = [entry['action'] for entry in _trace('static')]
+    dynamic = [entry['action'] for entry in _trace('dynamic')]
+    summary = summarize(align(action_signatures(static), action_signatures(dynamic)))
+    assert summary['matched'] + summary['only_static'] == len(static)
+    assert summary['matched'] + summary['only_dynamic'] == len(dynamic)
+    divergence = summary['first_divergence']
+    assert divergence is not None
+    assert static[:divergence['row']] == dynamic[:divergence['row']]
+    assert static[divergence['row']] != dynamic[divergence['row']]
+
+    same = summarize(align(action_signatures(static), action_signatures(static)))
+    assert same == {'matched': len(static), 'only_static': 0, 'only_dynamic': 0,
+                    'first_divergence': None}
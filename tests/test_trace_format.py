@@ -0,0 +1,64 @@
+"""
+Testes do formato de trace com deltas: os registros gravados por DeltaEncoder,
+depois de passarem por JSON, devem ser decodificados exatamente nas entradas
+originais, com um quadro-chave a cada keyframe_interval etapas, e state_at deve
+reconstruir qualquer etapa. Os traces são os de execuções reais de programas
+gerados por program_generator.py, registrados por RecordingObserver.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from frontend import analyze
+from interpreter import Interpreter
+from lexer import Lexer
+from observers import RecordingObserver
+from parser import Parser
+from program_generator import generate_program
+from trace_format import DeltaEncoder, decode_records, state_at
+
+
+def _execute(scope_mode, observer, seed=3):
+    source = generate_program(seed, functions=6, call_depth=3, fanout=2)
+    lexer = Lexer(source)
+    ast = analyze(Parser(lexer.get_tokens(), lexer.lines).parse_program(), scope_mode)
+    Interpreter(ast, scope_mode, observer=observer).interpret()
+
+
+def _trace(scope_mode='dynamic'):
+    recorder = RecordingObserver(record_states=True)
+    _execute(scope_mode, recorder)
+    return recorder.trace
+
+
+def _delta_records(trace, keyframe_interval):
+    encoder = DeltaEncoder(keyframe_interval)
+    records = []
+    for entry in trace:
+        records.extend(encoder.encode(entry))
+    # Os registros passam por JSON, como no arquivo gravado.
+    return [json.loads(json.dumps(record)) for record in records]
+
+
+@pytest.mark.parametrize('keyframe_interval', [1, 3, 100])
+def test_delta_round_trip(keyframe_interval):
+    trace = _trace()
+    records = _delta_records(trace, keyframe_interval)
+    assert [record['step'] for record in records if record.get('keyframe')] == \
+        list(range(0, len(trace), keyframe_interval))
+    assert list(decode_records(records)) == trace
+    for step in range(len(trace)):
+        assert state_at(records, step) == trace[step]
+    with pytest.raises(IndexError):
+        state_at(records, len(trace))
+
+
+def test_delta_without_keyframe_is_rejected():
+    records = _delta_records(_trace(), 100)
+    with pytest.raises(ValueError):
+        list(decode_records([records[0]] + records[2:]))
@@ -0,0 +1,75 @@
+"""
+Testes do gravador de traces em segundo plano: quando o programa falha no meio
+da execução, o trace gravado pela thread gravadora deve conter todas as etapas
+até o erro, em qualquer formato, e a thread deve ter terminado quando
+run_simulation retorna.
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from binary_trace import read_trace
+from frontend import load_program
+from interpreter import Interpreter, PseudoRuntimeError
+from main import run_simulation
+from observers import RecordingObserver
+
+FAILING_SOURCE = """
+int x;
+char c;
+def f0() {
+    x = x + 1;
+    x = x + 2;
+}
+def f1() {
+    f0();
+    f0();
+    f0();
+}
+def f2() {
+    f1();
+    f1();
+    f1();
+}
+main() {
+    x = 0;
+    c = 'A';
+    f2();
+    f2();
+    print(x);
+    print(c + x);
+    print(x);
+}
+"""
+
+
+def _reference_trace(path, scope_mode):
+    recorder = RecordingObserver(record_states=True)
+    interpreter = Interpreter(load_program(path, scope_mode), scope_mode, observer=recorder)
+    with pytest.raises(PseudoRuntimeError):
+        interpreter.interpret()
+    return recorder.trace
+
+
+@pytest.mark.parametrize('trace_format', ['full', 'delta', 'binary'])
+def test_trace_is_complete_up_to_the_error(tmp_path, trace_format):
+    path = tmp_path / 'failing.pseudo'
+    path.write_text(FAILING_SOURCE)
+    trace_path = str(tmp_path / 'trace.log')
+    assert not run_simulation(str(path), 'static', json_log_file=trace_path, opt_level=0,
+                              log_buffer_size=8, trace_format=trace_format, quiet=True)
+    assert not any(thread.name == 'trace-writer' and thread.is_alive()
+                   for thread in threading.enumerate())
+
+    expected = _reference_trace(str(path), 'static')
+    # Muito mais etapas que o buffer de 8 entradas, para que a gravadora fique
+    # atrasada em relação ao interpretador.
+    assert len(expected) > 80
+    assert expected[-1]['action'] == "Print statement: 54"
+    assert list(read_trace(trace_path)) == expected
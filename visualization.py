@@ -3,49 +3,64 @@ Este módulo implementa a visualização lado a lado de execuções com escopo e
 e dinâmico. Carrega logs JSON gerados pelo interpretador e os reproduz de forma 
 sincronizada, mostrando o estado da pilha de chamadas e variáveis globais em 
 cada etapa da execução. Permite análise detalhada das diferenças entre os dois 
-modos de escopo através de uma interface visual colorida no terminal.
+modos de escopo através de uma interface visual colorida no terminal. Aceita
+logs completos, logs com deltas (--trace-format delta), cujo estado em cada
+etapa é reconstruído a partir do quadro-chave mais próximo, e logs binários
+(--trace-format binary), dos quais só são descomprimidos os blocos necessários.
+Os logs são lidos sob demanda e reproduzidos em uma região rich.Live, com taxa
+de quadros limitada; os painéis de cada registro de ativação e das globais só
+são reconstruídos quando seu conteúdo muda. Durante a reprodução é possível
+pausar, avançar etapa a etapa ou saltar até a próxima chamada, retorno ou saída.
+As duas execuções são alinhadas pelos eventos (ver trace_alignment.py): etapas
+presentes em apenas um dos lados aparecem ao lado de um espaço vazio, e a
+primeira divergência é destacada.
 """
 
-import json
+import os
+import sys
 from rich.console import Console, Group
 from rich.panel import Panel
 from rich.columns import Columns
+from rich.live import Live
 from rich.table import Table
 from rich import box
 import time
 
+try:
+    import select
+    import termios
+    import tty
+except ImportError:
+    termios = None
 
-def load_log(logfile):
-    with open(logfile, 'r') as f:
-        return [json.loads(line) for line in f if line.strip()]
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+from binary_trace import read_trace
+from trace_alignment import align, signatures
 
 
-def render_state(entry, color):
-    action = entry['action']
-    stack = entry['call_stack']
-    global_scope = entry['global_scope']
-    output = entry.get('output')
-    stack_panels = []
-    for ar in reversed(stack):
-        locals_table = Table(
-            box=box.MINIMAL, show_header=True, header_style="bold blue")
-        locals_table.add_column("Local", style="bold yellow")
-        locals_table.add_column("Value", style="white")
-        if ar['locals']:
-            for k, v in ar['locals'].items():
-                locals_table.add_row(k, repr(v))
-        else:
-            locals_table.add_row("(empty)", "-")
-        panel = Panel(
-            locals_table, title=f"[bold magenta]{ar['name']}[/] (type={ar['scope_type']}, lex={ar['lex_parent']}, parent={ar['parent']})", border_style="magenta", padding=(0, 1))
-        stack_panels.append(panel)
-    if stack_panels:
-        stack_render = Group(*stack_panels)
-        stack_panel = Panel(
-            stack_render, title="[bold]Call Stack (Top → Base)", border_style="cyan", padding=(0, 1))
+def iter_log(logfile, start=0):
+    return read_trace(logfile, start)
+
+
+def load_log(logfile, start=0):
+    return list(iter_log(logfile, start))
+
+
+def _frame_panel(ar):
+    locals_table = Table(
+        box=box.MINIMAL, show_header=True, header_style="bold blue")
+    locals_table.add_column("Local", style="bold yellow")
+    locals_table.add_column("Value", style="white")
+    if ar['locals']:
+        for k, v in ar['locals'].items():
+            locals_table.add_row(k, repr(v))
     else:
-        stack_panel = Panel("(empty)", title="Call Stack",
-                            border_style="cyan", padding=(0, 1))
+        locals_table.add_row("(empty)", "-")
+    return Panel(
+        locals_table, title=f"[bold magenta]{ar['name']}[/] (type={ar['scope_type']}, lex={ar['lex_parent']}, parent={ar['parent']})", border_style="magenta", padding=(0, 1))
+
+
+def _global_panel(global_scope):
     global_table = Table(title="Global Scope",
                          box=box.SIMPLE, show_lines=True, expand=True)
     global_table.add_column("Name", style="bold yellow")
@@ -55,9 +70,20 @@ def render_state(entry, color):
             global_table.add_row(k, repr(v))
     else:
         global_table.add_row("(empty)", "-")
-    global_panel = Panel(
+    return Panel(
         global_table, title="🌎 [bold blue]Global Scope[/]", border_style="blue", padding=(0, 1))
-    group_items = [f"[b]{action}[/b]"]
+
+
+def _state_panel(entry, color, stack_panels, global_panel):
+    output = entry.get('output')
+    if stack_panels:
+        stack_render = Group(*stack_panels)
+        stack_panel = Panel(
+            stack_render, title="[bold]Call Stack (Top → Base)", border_style="cyan", padding=(0, 1))
+    else:
+        stack_panel = Panel("(empty)", title="Call Stack",
+                            border_style="cyan", padding=(0, 1))
+    group_items = [f"[b]{entry['action']}[/b]"]
     if output is not None:
         group_items.append(f"[bold green]OUTPUT:[/] [white]{output}[/]")
     group_items.extend([stack_panel, global_panel])
@@ -67,6 +93,165 @@ def render_state(entry, color):
     )
 
 
+def render_state(entry, color):
+    stack_panels = [_frame_panel(ar) for ar in reversed(entry['call_stack'])]
+    return _state_panel(entry, color, stack_panels, _global_panel(entry['global_scope']))
+
+
+def _frame_key(ar):
+    return (ar['name'], ar['scope_type'], ar['lex_parent'], ar['parent'],
+            tuple((k, type(v), v) for k, v in ar['locals'].items()))
+
+
+def _globals_key(global_scope):
+    return tuple((k, type(v), v) for k, v in global_scope.items())
+
+
+class StateRenderer:
+    MAX_CACHED_PANELS = 4096
+
+    def __init__(self, color):
+        self.color = color
+        self.frame_panels = {}
+        self.global_key = None
+        self.global_panel = None
+
+    def render(self, entry):
+        if entry is None:
+            return Panel("[dim](sem etapa correspondente)[/]", border_style="dim",
+                         padding=(0, 1), width=80)
+        stack_panels = []
+        for ar in reversed(entry['call_stack']):
+            key = _frame_key(ar)
+            panel = self.frame_panels.get(key)
+            if panel is None:
+                if len(self.frame_panels) >= self.MAX_CACHED_PANELS:
+                    self.frame_panels.clear()
+                panel = self.frame_panels[key] = _frame_panel(ar)
+            stack_panels.append(panel)
+        global_key = _globals_key(entry['global_scope'])
+        if global_key != self.global_key:
+            self.global_key = global_key
+            self.global_panel = _global_panel(entry['global_scope'])
+        return _state_panel(entry, self.color, stack_panels, self.global_panel)
+
+
+class KeyReader:
+    def __enter__(self):
+        self.enabled = termios is not None and sys.stdin.isatty()
+        if self.enabled:
+            self.fd = sys.stdin.fileno()
+            self.saved_attributes = termios.tcgetattr(self.fd)
+            tty.setcbreak(self.fd)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.enabled:
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self.saved_attributes)
+
+    def read(self, timeout):
+        if not self.enabled:
+            time.sleep(timeout)
+            return None
+        ready, _, _ = select.select([sys.stdin], [], [], timeout)
+        return sys.stdin.read(1) if ready else None
+
+
+EVENT_KEYS = {'c': 'call', 'r': 'return', 'o': 'output'}
+
+
+def is_event(entry, event):
+    if entry is None:
+        return False
+    if event == 'call':
+        return entry['action'].startswith(("Function Call", "Tail Call"))
+    if event == 'return':
+        return entry['action'].startswith("Function Return")
+    return 'output' in entry
+
+
+class TracePlayer:
+    def __init__(self, console, fps=1.0):
+        self.console = console
+        self.fps = fps
+        self.renderers = (StateRenderer('blue'), StateRenderer('magenta'))
+
+    def _frame(self, step, entries, note):
+        panels = [renderer.render(entry)
+                  for renderer, entry in zip(self.renderers, entries)]
+        header = f"[bold yellow]Etapa {step + 1}[/]"
+        if note:
+            header += f"  {note}"
+        return Group(
+            header,
+            "[dim](espaço: pausa, n: próxima, c/r/o: próxima chamada/retorno/saída, "
+            "+/-: velocidade, q: sai)[/]",
+            Columns(panels, expand=True, equal=True))
+
+    def play(self, rows, start=0, until=None):
+        paused = False
+        with KeyReader() as keys, Live(console=self.console, auto_refresh=False, screen=True) as live:
+            for step, (entries, note) in enumerate(rows, start):
+                if until is not None:
+                    if not any(is_event(entry, until) for entry in entries):
+                        continue
+                    until = None
+                live.update(self._frame(step, entries, note), refresh=True)
+                deadline = time.monotonic() + 1.0 / self.fps
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if not paused and remaining <= 0:
+                        break
+                    key = keys.read(0.1 if paused else remaining)
+                    if key == 'q':
+                        return
+                    if key == ' ':
+                        paused = not paused
+                    elif key == 'n':
+                        break
+                    elif key in EVENT_KEYS:
+                        until = EVENT_KEYS[key]
+                        break
+                    elif key == '+':
+                        self.fps *= 2
+                    elif key == '-':
+                        self.fps /= 2
+
+
+def indexed_rows(static_log, dynamic_log, start=0):
+    for entries in zip(iter_log(static_log, start=start), iter_log(dynamic_log, start=start)):
+        yield entries, None
+
+
+def aligned_rows(static_log, dynamic_log, start=0):
+    alignment = align(signatures(iter_log(static_log)),
+                      signatures(iter_log(dynamic_log)))
+    static_entries = dynamic_entries = None
+    static_next = dynamic_next = 0
+    diverged = False
+    for row, (i, j) in enumerate(alignment):
+        first_divergence = not diverged and (i is None or j is None)
+        diverged = diverged or first_divergence
+        if row < start:
+            static_next += i is not None
+            dynamic_next += j is not None
+            continue
+        if static_entries is None:
+            static_entries = iter_log(static_log, start=static_next)
+            dynamic_entries = iter_log(dynamic_log, start=dynamic_next)
+        static_entry = next(static_entries) if i is not None else None
+        dynamic_entry = next(dynamic_entries) if j is not None else None
+        if j is None:
+            note = f"[bold red]somente no estático (etapa {i + 1})[/]"
+        elif i is None:
+            note = f"[bold red]somente no dinâmico (etapa {j + 1})[/]"
+        else:
+            note = f"[dim]estático {i + 1} · dinâmico {j + 1}[/]"
+        if first_divergence:
+            note += "  [bold white on red] primeira divergência [/]"
+        yield (static_entry, dynamic_entry), note
+
+
 def main():
     import argparse
     parser = argparse.ArgumentParser(
@@ -77,27 +262,26 @@ def main():
                         help='Arquivo de log JSONL do modo dynamic')
     parser.add_argument('--delay', type=float, default=1.0,
                         help='Delay entre etapas (segundos)')
+    parser.add_argument('--fps', type=float, default=None,
+                        help='Etapas por segundo (substitui --delay)')
+    parser.add_argument('--start', type=int, default=0,
+                        help='Etapa inicial da reprodução (a partir de 0)')
+    parser.add_argument('--until', choices=sorted(EVENT_KEYS.values()), default=None,
+                        help='Avança sem exibir até a próxima chamada, retorno ou saída')
+    parser.add_argument('--no-align', dest='align', action='store_false',
+                        help='Pareia as etapas pela posição em vez de alinhar os eventos')
     args = parser.parse_args()
 
-    static_entries = load_log(args.static_log)
-    dynamic_entries = load_log(args.dynamic_log)
-    n = min(len(static_entries), len(dynamic_entries))
     console = Console()
     min_width = 170
     if console.size.width < min_width:
         console.print(
             f"[bold red]Aumente a largura do terminal para pelo menos {min_width} colunas para ver lado a lado! (atual: {console.size.width})[/]")
         time.sleep(3)
-    for i in range(n):
-        panels = [
-            render_state(static_entries[i], 'blue'),
-            render_state(dynamic_entries[i], 'magenta')
-        ]
-        console.clear()
-        console.rule(f"[bold yellow]Etapa {i+1}/{n}")
-        console.print(Columns(panels, expand=True, equal=True))
-        console.rule()
-        time.sleep(args.delay)
+    fps = args.fps if args.fps else 1.0 / max(args.delay, 1e-3)
+    make_rows = aligned_rows if args.align else indexed_rows
+    rows = make_rows(args.static_log, args.dynamic_log, start=args.start)
+    TracePlayer(console, fps=fps).play(rows, start=args.start, until=args.until)
 
 
 if __name__ == "__main__":